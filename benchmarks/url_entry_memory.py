@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Memory benchmark for report entries.
+
+Builds the entries of a synthetic report, with five URLs per instance like the
+built-in reports, and prints the memory each entry keeps allocated, including
+its strings, with the previous dataclass based UrlEntry and the current one.
+
+The URLs are unpickled as they would be when a report comes from the cache,
+so the entries don't share strings by accident.
+
+Usage:
+    python benchmarks/url_entry_memory.py
+    python benchmarks/url_entry_memory.py --entries 500000
+"""
+
+import argparse
+import gc
+import os
+import pickle
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "example_project.settings.base")
+
+import django  # noqa: E402
+
+django.setup()
+
+from wagtail_unveil.models import make_entries  # noqa: E402
+
+URL_TYPES = ["edit", "delete", "copy", "history", "usage"]
+
+
+@dataclass
+class DataclassUrlEntry:
+    """The UrlEntry definition before entries were slotted."""
+
+    id: int = field(default_factory=lambda: 0)
+    model_name: str = field(default_factory=lambda: "")
+    url_type: str = field(default_factory=lambda: "")
+    url: str = field(default_factory=lambda: "")
+
+
+def get_urls(count):
+    """Return count (model_name, url_type, url) tuples of unpickled strings."""
+    urls = []
+    for index in range(count):
+        pk = index // len(URL_TYPES)
+        url_type = URL_TYPES[index % len(URL_TYPES)]
+        urls.append(
+            (
+                f"example.ExampleModel (Example instance {pk})",
+                url_type,
+                f"http://localhost:8000/admin/example/examplemodel/{url_type}/{pk}/",
+            )
+        )
+    return pickle.loads(pickle.dumps(urls))
+
+
+def measure(build, count):
+    """Return the bytes kept allocated per entry by build() for count URLs."""
+    gc.collect()
+    tracemalloc.start()
+    urls = get_urls(count)
+    entries = build(urls)
+    del urls
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return allocated / len(entries)
+
+
+def build_dataclass_entries(urls):
+    return [
+        DataclassUrlEntry(counter, *url) for counter, url in enumerate(urls, start=1)
+    ]
+
+
+def build_entries(urls):
+    return list(make_entries(urls))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--entries", type=int, default=100_000)
+    args = parser.parse_args()
+
+    results = [
+        (label, measure(build, args.entries))
+        for label, build in [
+            ("dataclass", build_dataclass_entries),
+            ("slotted", build_entries),
+        ]
+    ]
+
+    print(f"{args.entries} entries")
+    for label, bytes_per_entry in results:
+        print(f"{label:>10}: {bytes_per_entry:7.1f} bytes per entry")
+
+
+if __name__ == "__main__":
+    main()
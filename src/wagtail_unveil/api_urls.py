@@ -1,7 +1,12 @@
-from django.http import JsonResponse
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, JsonResponse
 from django.urls import path
 
+from wagtail_unveil.filters import UrlFilter
+from wagtail_unveil.formats import entry_to_dict
+from wagtail_unveil.providers import get_providers
+from wagtail_unveil.reports import build_reports
 from wagtail_unveil.viewsets.admin_report import UnveilAdminReportViewSet
+from wagtail_unveil.viewsets.base import UnveilReportViewSet, has_api_access
 from wagtail_unveil.viewsets.collection_report import UnveilCollectionReportViewSet
 from wagtail_unveil.viewsets.document_report import UnveilDocumentReportViewSet
 from wagtail_unveil.viewsets.form_report import UnveilFormReportViewSet
@@ -44,29 +49,57 @@ modeladmin_api_viewset = UnveilModelAdminReportViewSet()
 
 def api_index_view(request):
     endpoints = {
-        "collection": request.build_absolute_uri("collection/"),
-        "document": request.build_absolute_uri("document/"),
-        "form": request.build_absolute_uri("form/"),
-        "generic": request.build_absolute_uri("generic/"),
-        "image": request.build_absolute_uri("image/"),
-        "locale": request.build_absolute_uri("locale/"),
-        "modeladmin": request.build_absolute_uri("modeladmin/"),
-        "page": request.build_absolute_uri("page/"),
-        "redirect": request.build_absolute_uri("redirect/"),
-        "search-promotion": request.build_absolute_uri("search-promotion/"),
-        "settings": request.build_absolute_uri("settings/"),
-        "site": request.build_absolute_uri("site/"),
-        "snippet": request.build_absolute_uri("snippet/"),
-        "user": request.build_absolute_uri("user/"),
-        "admin": request.build_absolute_uri("admin/"),
-        "workflow": request.build_absolute_uri("workflow/"),
-        "workflow-task": request.build_absolute_uri("workflow-task/"),
+        slug: request.build_absolute_uri(f"{slug}/") for slug in get_providers()
     }
     return JsonResponse({"endpoints": endpoints})
 
 
+def get_slugs_param(request, name):
+    """Return the comma separated slugs in a query parameter, or None."""
+    value = request.GET.get(name)
+    if value is None:
+        return None
+    return [slug.strip() for slug in value.split(",") if slug.strip()]
+
+
+def api_all_view(request):
+    """
+    Return the results of every report keyed by slug, or of the reports
+    selected with ?reports=page,user and ?exclude=admin, and the time each
+    report took to build in milliseconds. The report filters apply to every
+    report.
+    """
+    if not has_api_access(request):
+        return HttpResponseForbidden("Invalid or missing token.")
+    try:
+        url_filter = UrlFilter.from_params(request.GET)
+    except ValueError:
+        return HttpResponseBadRequest("Invalid filter.")
+    try:
+        reports = build_reports(
+            slugs=get_slugs_param(request, "reports"),
+            exclude=get_slugs_param(request, "exclude") or (),
+            url_filter=url_filter,
+        )
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    results = {
+        slug: [entry_to_dict(entry) for entry in report.entries]
+        for slug, report in reports.items()
+    }
+    timings = {
+        slug: round(report.duration * 1000, 1) for slug, report in reports.items()
+    }
+    response = JsonResponse({"results": results, "timings": timings})
+    response["Server-Timing"] = ", ".join(
+        f"{slug};dur={duration}" for slug, duration in timings.items()
+    )
+    return response
+
+
 urlpatterns = [
     path("", api_index_view),
+    path("all/", api_all_view),
     path("collection/", collection_api_viewset.as_json_view),
     path("document/", document_api_viewset.as_json_view),
     path("form/", form_api_viewset.as_json_view),
@@ -85,3 +118,16 @@ urlpatterns = [
     path("workflow/", workflow_api_viewset.as_json_view),
     path("workflow-task/", workflow_task_api_viewset.as_json_view),
 ]
+
+
+def get_provider_urlpatterns(urlpatterns):
+    """Return JSON endpoints for providers registered by other apps."""
+    api_slugs = {str(pattern.pattern).rstrip("/") for pattern in urlpatterns}
+    return [
+        path(f"{slug}/", UnveilReportViewSet.for_provider(provider).as_json_view)
+        for slug, provider in get_providers().items()
+        if slug not in api_slugs
+    ]
+
+
+urlpatterns += get_provider_urlpatterns(urlpatterns)
@@ -0,0 +1,37 @@
+from django.apps import AppConfig
+
+
+class WagtailUnveilAppConfig(AppConfig):
+    name = "wagtail_unveil"
+    label = "wagtail_unveil"
+    verbose_name = "Wagtail Unveil"
+    default_auto_field = "django.db.models.BigAutoField"
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from wagtail.signals import page_published, page_unpublished, post_page_move
+
+        from wagtail_unveil.cache import invalidate_dependent_reports
+        from wagtail_unveil.inventory import (
+            update_inventory,
+            update_moved_page_inventory,
+        )
+
+        for signal in [post_save, post_delete, page_published, page_unpublished]:
+            signal.connect(
+                invalidate_dependent_reports,
+                dispatch_uid=f"wagtail_unveil_invalidate_{id(signal)}",
+            )
+            signal.connect(
+                update_inventory,
+                dispatch_uid=f"wagtail_unveil_update_inventory_{id(signal)}",
+            )
+        # Moving a page changes its URL and the URLs of its descendants
+        post_page_move.connect(
+            invalidate_dependent_reports,
+            dispatch_uid="wagtail_unveil_invalidate_moved_page",
+        )
+        post_page_move.connect(
+            update_moved_page_inventory,
+            dispatch_uid="wagtail_unveil_update_moved_page_inventory",
+        )
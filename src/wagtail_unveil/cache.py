@@ -0,0 +1,139 @@
+"""
+Cached report results for Wagtail Unveil.
+
+When ``WAGTAIL_UNVEIL_CACHE`` is enabled, the URLs of each report are stored
+with Django's cache framework, keyed by the report slug, base URL and maximum
+number of instances. Each report has a version stored in the cache too, which
+is part of its keys. Saving or deleting an instance of a model a report
+depends on (see ``UnveilProvider.get_dependencies``) replaces the version, so
+every cached result of that report is invalidated at once and other reports
+are left alone.
+
+The version is also part of the JSON API's ETag, so it's replaced even when
+caching is disabled. Changes the ETag's aggregates can't see, e.g. a renamed
+or unpublished page, then change the ETag too. Other processes only see the
+new version through a shared cache, so ETags are only sent when the cache
+isn't the per-process local memory or dummy cache (see ``is_cache_shared``).
+
+``WAGTAIL_UNVEIL_RESPONSE_CACHE`` separately enables a short-lived cache of the
+JSON API's response bodies, with a gzip compressed copy, keyed by the report's
+version and ETag, so it's only used with a shared cache too. Saving, deleting, publishing, unpublishing or moving an
+instance the report depends on replaces the version, and adding or removing
+one changes the ETag, so cached bodies aren't served after either. Changes
+that send no signals and keep the ETag's aggregates as they are, e.g. a
+queryset ``update()``, are served from the cache until the timeout.
+"""
+
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from wagtail_unveil.providers import get_dependent_slugs
+
+# Cache statuses returned by get_report_urls()
+CACHE_HIT = "HIT"
+CACHE_MISS = "MISS"
+
+
+def is_cache_enabled():
+    return getattr(settings, "WAGTAIL_UNVEIL_CACHE", False)
+
+
+def get_cache():
+    return caches[getattr(settings, "WAGTAIL_UNVEIL_CACHE_ALIAS", "default")]
+
+
+def is_cache_shared():
+    """
+    Return whether every process serving the site sees the same cache, which
+    isn't the case for the local memory and dummy caches.
+    """
+    return not isinstance(get_cache(), (LocMemCache, DummyCache))
+
+
+def get_cache_timeout():
+    return getattr(settings, "WAGTAIL_UNVEIL_CACHE_TIMEOUT", 3600)
+
+
+def is_response_cache_enabled():
+    return getattr(settings, "WAGTAIL_UNVEIL_RESPONSE_CACHE", False)
+
+
+def get_response_cache_timeout():
+    return getattr(settings, "WAGTAIL_UNVEIL_RESPONSE_CACHE_TIMEOUT", 60)
+
+
+def get_response_cache_key(slug, version, etag):
+    etag_hash = hashlib.md5(etag.encode(), usedforsecurity=False).hexdigest()
+    return f"wagtail_unveil:response:{slug}:{version}:{etag_hash}"
+
+
+def get_version_key(slug):
+    return f"wagtail_unveil:version:{slug}"
+
+
+def get_cache_key(slug, version, base_url, max_instances):
+    base_url_hash = hashlib.md5(base_url.encode(), usedforsecurity=False).hexdigest()
+    return f"wagtail_unveil:urls:{slug}:{version}:{base_url_hash}:{max_instances}"
+
+
+def get_report_version(slug):
+    """
+    Return the version of a report, which changes whenever an instance of a
+    model it depends on is saved, deleted, published, unpublished or moved.
+    """
+    cache = get_cache()
+    version_key = get_version_key(slug)
+    version = cache.get(version_key)
+    if version is None:
+        version = uuid.uuid4().hex
+        # Another process may have set it first
+        if not cache.add(version_key, version, None):
+            version = cache.get(version_key, version)
+    return version
+
+
+def get_report_urls(provider, base_url, max_instances):
+    """
+    Return the list of (model_name, url_type, url) tuples of a provider and
+    whether they came from the cache, as a CACHE_HIT or CACHE_MISS status, or
+    None when caching is disabled. Filtered reports aren't cached.
+    """
+    if not is_cache_enabled() or provider.url_filter:
+        return provider.get_urls(base_url, max_instances), None
+    cache = get_cache()
+    version = get_report_version(provider.slug)
+    key = get_cache_key(provider.slug, version, base_url, max_instances)
+    urls = cache.get(key)
+    if urls is not None:
+        return urls, CACHE_HIT
+    urls = provider.get_urls(base_url, max_instances)
+    cache.set(key, urls, get_cache_timeout())
+    return urls, CACHE_MISS
+
+
+def invalidate_reports(slugs):
+    """Invalidate every cached result of the reports with the given slugs."""
+    cache = get_cache()
+    cache.delete_many([get_version_key(slug) for slug in slugs])
+
+
+def invalidate_dependent_reports(sender, **kwargs):
+    """
+    Signal receiver invalidating the reports that depend on the sender model,
+    once the current transaction is committed.
+
+    Their versions are replaced even when caching is disabled, since they also
+    validate the JSON API's ETags.
+    """
+    if kwargs.get("raw"):
+        return
+    # Most saved models, e.g. sessions and log entries, aren't in any report
+    slugs = get_dependent_slugs(sender)
+    if slugs:
+        transaction.on_commit(lambda: invalidate_reports(slugs))
@@ -0,0 +1,401 @@
+"""
+Check that a report's URLs respond.
+
+``check_urls()`` requests URLs from a pool of worker threads and yields a
+``CheckResult`` for each URL as soon as it's checked::
+
+    from wagtail_unveil.checks import check_urls
+    from wagtail_unveil.reports import get_all_reports
+
+    entries = get_all_reports(slugs=["page"])["page"]
+    for result in check_urls(entry.url for entry in entries):
+        if not result.ok:
+            print(result.status or result.error, result.url)
+
+Each worker keeps a pooled ``requests`` session, each request has a timeout,
+and requests that time out, fail to connect or get a 429 or 5xx response are
+retried with an exponential backoff. Only a few URLs more than there are
+workers are queued at a time, so URLs can be checked as they're generated.
+The ``unveil_check`` management command uses the same engine, and so does the
+reports' Run Checks button when ``WAGTAIL_UNVEIL_CHECK_IN_PROCESS`` is disabled.
+
+``check_urls_in_process()`` runs URLs through Django's request handler instead,
+with ``django.test.Client`` logged in as a configured user. There's no network
+hop, so the site doesn't need to be running or reachable at
+``WAGTAIL_UNVEIL_BASE_URL``, and admin views can be checked without a session
+cookie. Requests are sent with the host of each URL, which has to be in
+``ALLOWED_HOSTS``. The Run Checks button uses it by default, with the admin's
+session, so it never waits for the web worker it holds to answer.
+
+Each result records the wall time of the check, the time to the first byte of
+the response and the size of the response, and for in-process checks the
+number of SQL queries the request ran and the time spent running them, so the
+checks double as a map of the slowest URLs.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import ExitStack, contextmanager
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import Client
+
+# Responses worth trying again, the server may be able to answer later
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Bytes read at a time when downloading a response body
+CHUNK_SIZE = 64 * 1024
+
+# The longest the reports' Run Checks button waits for each response, since it
+# holds a web worker while the site answers its requests
+RUN_CHECKS_TIMEOUT = 3
+
+
+class CheckResult(NamedTuple):
+    """
+    The outcome of checking one URL.
+
+    Attributes:
+        url: The URL that was checked.
+        status: The HTTP status of the last response, after redirects, or
+            None if no response was received.
+        error: Why no response was received, "" if there was one.
+        elapsed: The wall time the last attempt took, including downloading
+            the body, in seconds.
+        attempts: The number of requests made.
+        size: The size of the response body in bytes, or its Content-Length
+            when the body isn't downloaded, None if it isn't known.
+        ttfb: The time to the first byte of the last response, in seconds,
+            None if no response was received.
+        queries: The number of SQL queries the request ran, None when they
+            can't be counted, i.e. outside of in-process checks.
+        db_time: The time the SQL queries took in total, in seconds, None
+            when they can't be timed.
+    """
+
+    url: str
+    status: int = None
+    error: str = ""
+    elapsed: float = 0.0
+    attempts: int = 1
+    size: int = None
+    ttfb: float = None
+    queries: int = None
+    db_time: float = None
+
+    @property
+    def ok(self):
+        """Whether the URL responded successfully, like the Fetch API's ok."""
+        return self.status is not None and 200 <= self.status < 300
+
+    def to_dict(self):
+        """Return the result as a JSON serializable dict, with times in ms."""
+        return {
+            "url": self.url,
+            "status": self.status,
+            "ok": self.ok,
+            "error": self.error,
+            "elapsed": to_ms(self.elapsed),
+            "attempts": self.attempts,
+            "size": self.size,
+            "ttfb": to_ms(self.ttfb),
+            "queries": self.queries,
+            "db_time": to_ms(self.db_time),
+        }
+
+
+def to_ms(seconds):
+    """Return seconds in milliseconds rounded to 0.1ms, None stays None."""
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+class QueryTimer:
+    """
+    A database execute wrapper counting the queries run through it and the
+    time they take.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+@contextmanager
+def time_queries():
+    """
+    Count and time the queries run on every database connection of this
+    thread inside the block, and yield the QueryTimer.
+    """
+    timer = QueryTimer()
+    # Unlike CaptureQueriesContext, the queries aren't logged or kept
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+        yield timer
+
+
+def get_check_workers():
+    """Return the number of URLs checked concurrently."""
+    return getattr(settings, "WAGTAIL_UNVEIL_CHECK_WORKERS", 8)
+
+
+def get_check_timeout():
+    """Return the number of seconds to wait for each response."""
+    return getattr(settings, "WAGTAIL_UNVEIL_CHECK_TIMEOUT", 10)
+
+
+def get_check_retries():
+    """Return the number of times a failed check is retried."""
+    return getattr(settings, "WAGTAIL_UNVEIL_CHECK_RETRIES", 2)
+
+
+def get_check_in_process():
+    """
+    Return whether the reports' Run Checks button checks URLs in process,
+    rather than sending requests to the site from the web worker it holds.
+    """
+    return getattr(settings, "WAGTAIL_UNVEIL_CHECK_IN_PROCESS", True)
+
+
+def get_check_user(username=None):
+    """
+    Return the user in-process checks are made as, username or the
+    WAGTAIL_UNVEIL_CHECK_USER setting, or None to make them anonymously.
+
+    Raises the user model's DoesNotExist if there's no such user.
+    """
+    username = username or getattr(settings, "WAGTAIL_UNVEIL_CHECK_USER", None)
+    if not username:
+        return None
+    return get_user_model()._default_manager.get_by_natural_key(username)
+
+
+def create_session(pool_size, headers=None):
+    """Return a requests session keeping up to pool_size connections per host."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+@contextmanager
+def thread_sessions(pool_size, headers=None):
+    """
+    Yield a function returning the requests session of the calling thread,
+    created by create_session() on first use since sessions aren't thread
+    safe. Every session is closed on exit.
+    """
+    local = threading.local()
+    sessions = []
+    lock = threading.Lock()
+
+    def get_session():
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = create_session(pool_size, headers)
+            with lock:
+                sessions.append(session)
+        return session
+
+    try:
+        yield get_session
+    finally:
+        for session in sessions:
+            session.close()
+
+
+def send_request(session, method, url, timeout, retries=0, backoff=0.5, **kwargs):
+    """
+    Send a request with session, retrying up to retries times after timeouts,
+    connection errors and RETRY_STATUSES responses with an exponential backoff.
+
+    Return the last response, or None and why there was none, the time the
+    last attempt took to receive the response in seconds and the number of
+    attempts. When the body is streamed, that's the time to the first byte.
+    """
+    attempts = 0
+    while True:
+        attempts += 1
+        start = time.perf_counter()
+        response, error = None, ""
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except requests.RequestException as e:
+            error = str(e) or type(e).__name__
+        elapsed = time.perf_counter() - start
+        if attempts > retries or (
+            response is not None and response.status_code not in RETRY_STATUSES
+        ):
+            return response, error, elapsed, attempts
+        if response is not None:
+            response.close()
+        time.sleep(backoff * 2 ** (attempts - 1))
+
+
+def check_url(session, url, timeout, retries=0, backoff=0.5, method="HEAD"):
+    """
+    Request url with session and return its CheckResult, retrying up to
+    retries times.
+
+    HEAD requests a server doesn't allow are sent again as GET requests. The
+    body of other responses is downloaded to time it and measure its size.
+    """
+    # The response is returned as soon as its headers are received
+    response, error, ttfb, attempts = send_request(
+        session,
+        method,
+        url,
+        timeout,
+        retries,
+        backoff,
+        allow_redirects=True,
+        stream=True,
+    )
+    if response is None:
+        return CheckResult(url, None, error, ttfb, attempts)
+    if response.status_code == 405 and method == "HEAD":
+        response.close()
+        return check_url(session, url, timeout, retries, backoff, "GET")
+    elapsed, size = ttfb, None
+    if method == "HEAD":
+        content_length = response.headers.get("Content-Length", "")
+        size = int(content_length) if content_length.isdigit() else None
+    else:
+        start = time.perf_counter()
+        try:
+            size = sum(len(chunk) for chunk in response.iter_content(CHUNK_SIZE))
+        except requests.RequestException as e:
+            error = str(e) or type(e).__name__
+        elapsed += time.perf_counter() - start
+    response.close()
+    return CheckResult(url, response.status_code, error, elapsed, attempts, size, ttfb)
+
+
+def check_urls(
+    urls,
+    workers=None,
+    timeout=None,
+    retries=None,
+    backoff=0.5,
+    method="HEAD",
+    headers=None,
+):
+    """
+    Check urls with up to workers concurrent requests and yield the
+    CheckResult of each URL, in the order they complete.
+
+    The defaults of workers, timeout and retries are the
+    WAGTAIL_UNVEIL_CHECK_WORKERS, WAGTAIL_UNVEIL_CHECK_TIMEOUT and
+    WAGTAIL_UNVEIL_CHECK_RETRIES settings. headers are sent with every request.
+    """
+    if workers is None:
+        workers = get_check_workers()
+    if timeout is None:
+        timeout = get_check_timeout()
+    if retries is None:
+        retries = get_check_retries()
+    workers = max(workers, 1)
+    urls = iter(urls)
+    pending = set()
+    with thread_sessions(workers, headers) as get_session:
+
+        def check(url):
+            return check_url(get_session(), url, timeout, retries, backoff, method)
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="unveil-check"
+        ) as executor:
+            try:
+                for url in urls:
+                    pending.add(executor.submit(check, url))
+                    if len(pending) >= workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            finally:
+                # Don't run the queued checks when the caller stops early
+                for future in pending:
+                    future.cancel()
+
+
+def check_url_in_process(client, url, method="GET"):
+    """
+    Run url through Django's request handler with client, following
+    redirects, and return its CheckResult with the queries the request ran.
+
+    The time to the first byte is the time the handler took to return the
+    response, streamed content is consumed after that.
+    """
+    parts = urlsplit(url)
+    path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    status, error, size, ttfb = None, "", None, None
+    with time_queries() as timer:
+        start = time.perf_counter()
+        try:
+            response = getattr(client, method.lower())(
+                path or "/",
+                follow=True,
+                secure=parts.scheme == "https",
+                HTTP_HOST=parts.netloc,
+            )
+            ttfb = time.perf_counter() - start
+            status = response.status_code
+            if response.streaming:
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.content)
+            response.close()
+        except Exception as e:
+            # Exceptions raised by views are 500 responses, this is e.g. a
+            # redirect loop
+            error = str(e) or type(e).__name__
+        elapsed = time.perf_counter() - start
+    return CheckResult(
+        url, status, error, elapsed, 1, size, ttfb, timer.count, timer.duration
+    )
+
+
+def check_urls_in_process(urls, user=None, method="GET", cookies=None):
+    """
+    Check urls one after the other in this process, logged in as user if
+    given, and yield the CheckResult of each URL.
+
+    Pass the cookies of a request as cookies to make the checks with its
+    session instead of logging in, which creates a session and updates the
+    user's last login. A session created for user is deleted afterwards.
+    """
+    client = Client(raise_request_exception=False)
+    if cookies:
+        client.cookies.load(cookies)
+        user = None
+    if user is not None:
+        client.force_login(user)
+    try:
+        for url in urls:
+            yield check_url_in_process(client, url, method)
+    finally:
+        if user is not None:
+            client.logout()
@@ -0,0 +1,95 @@
+"""
+Conditional GET support for the JSON API.
+
+Before building any URLs, the API computes a validator for a report: one
+aggregate query per model the report depends on (count, highest primary key
+and latest modification time), the URLconf fingerprint, the report's
+parameters and the report's version. Clients sending the resulting ETag back
+in ``If-None-Match`` get a ``304 Not Modified`` response while none of these
+change.
+
+The aggregates catch instances added or removed, and edits recorded by a
+modification time. The version (see ``wagtail_unveil.cache``) is replaced by
+signal receivers whenever an instance of a dependency is saved, deleted,
+published, unpublished or moved, which catches the edits the aggregates can't
+see, e.g. a renamed image or an unpublished or moved page.
+
+When the URL inventory is enabled, the report's records are aggregated
+instead of its dependencies, since the inventory only changes on refresh.
+
+``Last-Modified`` is also sent when every dependency records modification
+times, but only the ETag is used to answer conditional requests, since
+deleting an instance doesn't change the latest modification time.
+"""
+
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+from django.utils.http import http_date, quote_etag
+
+from wagtail_unveil.cache import get_report_version
+from wagtail_unveil.inventory import get_inventory_state, is_inventory_enabled
+from wagtail_unveil.routes import get_urlconf_fingerprint
+
+# Query parameters that don't change the response
+IGNORED_PARAMETERS = {"token"}
+
+
+def get_model_state(provider, model):
+    """
+    Return the count, highest primary key and latest modification time of a
+    model's instances, in a single aggregate query.
+    """
+    last_modified_fields = provider.get_last_modified_fields(model)
+    aggregates = {"count": Count("pk"), "max_pk": Max("pk")}
+    for index, field_name in enumerate(last_modified_fields):
+        aggregates[f"last_modified_{index}"] = Max(field_name)
+    state = model._default_manager.aggregate(**aggregates)
+    modified = [
+        state[f"last_modified_{index}"] for index in range(len(last_modified_fields))
+    ]
+    modified = [value for value in modified if value is not None]
+    state["last_modified"] = max(modified) if modified else None
+    # Without modification times, the model can't give a Last-Modified date
+    state["has_last_modified"] = bool(last_modified_fields)
+    return state
+
+
+def get_report_validators(provider, base_url, max_instances, params=()):
+    """
+    Return the ETag and Last-Modified header values for a report, or None for
+    Last-Modified if it can't be determined.
+    """
+    if is_inventory_enabled():
+        state = get_inventory_state(provider.slug)
+        state["has_last_modified"] = True
+        states = [("inventory", state)]
+    else:
+        states = [
+            (model._meta.label, get_model_state(provider, model))
+            for model in provider.get_dependencies()
+        ]
+    data = {
+        "provider": f"{type(provider).__module__}.{type(provider).__qualname__}",
+        "models": [model._meta.label for model in provider.get_models()],
+        "extra_urls": list(provider.get_extra_urls(base_url)),
+        "base_url": base_url,
+        "max_instances": max_instances,
+        "params": sorted(
+            (key, value) for key, value in params if key not in IGNORED_PARAMETERS
+        ),
+        "urlconf": get_urlconf_fingerprint(),
+        "states": states,
+        "version": get_report_version(provider.slug),
+    }
+    encoded = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    etag = quote_etag(hashlib.sha1(encoded.encode(), usedforsecurity=False).hexdigest())
+
+    last_modified = None
+    if states and all(state["has_last_modified"] for _label, state in states):
+        modified = [state["last_modified"] for _label, state in states]
+        if None not in modified:
+            last_modified = http_date(max(modified).timestamp())
+    return etag, last_modified
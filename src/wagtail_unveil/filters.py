@@ -0,0 +1,201 @@
+"""
+Filters narrowing a report.
+
+The JSON API and the admin reports accept ``?model=``, ``?url_type=``,
+``?app_label=`` and ``?pk_range=`` parameters. They're parsed into a
+``UrlFilter``, which providers apply while building their URLs (see
+``UnveilProvider.with_filter``): models that don't match are skipped before
+any of their instances are fetched, actions of other URL types aren't
+reversed, and primary key ranges are applied in SQL.
+"""
+
+from dataclasses import dataclass
+
+import django_filters
+from django.core.exceptions import ValidationError
+from django.db.models import BigIntegerField, Case, Q, When
+from django.db.models.functions import Cast
+from wagtail.admin.filters import WagtailFilterSet
+
+
+def get_values(params, name):
+    """Return the comma separated values of a query parameter as a frozenset."""
+    if hasattr(params, "getlist"):
+        values = params.getlist(name)
+    else:
+        values = [params[name]] if params.get(name) else []
+    return frozenset(
+        item.strip() for value in values for item in value.split(",") if item.strip()
+    )
+
+
+def parse_pk_range(value):
+    """
+    Return the (min, max) pair of a "min-max" range, where either bound can
+    be left out, or of a single primary key.
+
+    Raises ValueError if the range is malformed.
+    """
+    if not value:
+        return None
+    low, separator, high = value.partition("-")
+    if not separator:
+        # A single primary key
+        high = low
+    low = int(low) if low.strip() else None
+    high = int(high) if high.strip() else None
+    if low is None and high is None:
+        raise ValueError("Invalid pk_range.")
+    if low is not None and high is not None and low > high:
+        raise ValueError("Invalid pk_range.")
+    return (low, high)
+
+
+@dataclass(frozen=True)
+class UrlFilter:
+    """
+    The URLs to include in a report.
+
+    Attributes:
+        models: Lowercase "app_label.modelname" labels of the models to include.
+        url_types: The URL types to include.
+        app_labels: Lowercase app labels of the models to include.
+        pk_range: The (min, max) primary keys of the instances to include,
+            either bound can be None. Model level URLs are left out.
+    """
+
+    models: frozenset = frozenset()
+    url_types: frozenset = frozenset()
+    app_labels: frozenset = frozenset()
+    pk_range: tuple = None
+
+    @classmethod
+    def from_params(cls, params):
+        """
+        Return the UrlFilter for query parameters, or None if they don't
+        filter anything.
+
+        Raises ValueError if a parameter is invalid.
+        """
+        url_filter = cls(
+            models=frozenset(label.lower() for label in get_values(params, "model")),
+            url_types=get_values(params, "url_type"),
+            app_labels=frozenset(
+                label.lower() for label in get_values(params, "app_label")
+            ),
+            pk_range=parse_pk_range(params.get("pk_range")),
+        )
+        return url_filter if url_filter.is_active() else None
+
+    def is_active(self):
+        return bool(self.models or self.url_types or self.app_labels or self.pk_range)
+
+    def matches_model(self, model):
+        meta = model._meta
+        return (not self.models or meta.label_lower in self.models) and (
+            not self.app_labels or meta.app_label in self.app_labels
+        )
+
+    def matches_url_type(self, url_type):
+        return not self.url_types or url_type in self.url_types
+
+    def includes_model_urls(self):
+        """Return whether URLs that don't belong to an instance are included."""
+        return self.pk_range is None
+
+    def includes_extra_urls(self):
+        """Return whether URLs that don't belong to a model are included."""
+        return not (self.models or self.app_labels or self.pk_range)
+
+    def filter_actions(self, actions):
+        return [action for action in actions if self.matches_url_type(action[0])]
+
+    def filter_queryset(self, queryset, field_name="pk"):
+        """Apply the primary key range to a queryset."""
+        if self.pk_range is None:
+            return queryset
+        low, high = self.pk_range
+        if low is not None:
+            queryset = queryset.filter(**{f"{field_name}__gte": low})
+        if high is not None:
+            queryset = queryset.filter(**{f"{field_name}__lte": high})
+        return queryset
+
+    def filter_records(self, records):
+        """Apply the filter to a queryset of UnveilUrlRecord objects."""
+        if self.models:
+            query = Q()
+            for label in self.models:
+                query |= Q(model_label__iexact=label)
+            records = records.filter(query)
+        if self.app_labels:
+            query = Q()
+            for app_label in self.app_labels:
+                query |= Q(model_label__istartswith=f"{app_label}.")
+            records = records.filter(query)
+        if self.url_types:
+            records = records.filter(url_type__in=self.url_types)
+        if self.pk_range is not None:
+            # Primary keys are stored as text, only compare the numeric ones
+            records = records.annotate(
+                numeric_pk=Case(
+                    When(
+                        object_pk__regex=r"^[0-9]{1,18}$",
+                        then=Cast("object_pk", BigIntegerField()),
+                    ),
+                    default=None,
+                    output_field=BigIntegerField(),
+                )
+            )
+            records = self.filter_queryset(records, "numeric_pk")
+        return records
+
+
+def validate_pk_range(value):
+    try:
+        parse_pk_range(value)
+    except ValueError as e:
+        raise ValidationError('Enter a range like "1-100", "100-" or "-100".') from e
+
+
+def filter_nothing(queryset, name, value):
+    # The report is filtered by its provider, see UnveilReportView.get_provider
+    return queryset
+
+
+class UnveilReportFilterSet(WagtailFilterSet):
+    """The admin report filters, backed by the same parameters as the API."""
+
+    model = django_filters.ChoiceFilter(
+        label="App.Model", method=filter_nothing, empty_label="All"
+    )
+    url_type = django_filters.ChoiceFilter(
+        label="View Type", method=filter_nothing, empty_label="All"
+    )
+    app_label = django_filters.ChoiceFilter(
+        label="App", method=filter_nothing, empty_label="All"
+    )
+    pk_range = django_filters.CharFilter(
+        label="Primary key range",
+        method=filter_nothing,
+        help_text='e.g. "1-100", "100-" or "-100"',
+        validators=[validate_pk_range],
+    )
+
+    def __init__(self, *args, provider=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        models = provider.get_models() if provider else []
+        url_types = provider.get_url_types() if provider else []
+        self.filters["model"].extra["choices"] = [
+            (model._meta.label_lower, model._meta.label) for model in models
+        ]
+        self.filters["url_type"].extra["choices"] = [
+            (url_type, url_type) for url_type in url_types
+        ]
+        app_labels = sorted({model._meta.app_label for model in models})
+        self.filters["app_label"].extra["choices"] = [
+            (app_label, app_label) for app_label in app_labels
+        ]
+
+    class Meta:
+        fields = []
@@ -0,0 +1,71 @@
+"""
+Serializers for the report data returned by the JSON API.
+
+Each serializer takes an iterable of ``UrlEntry`` objects and yields chunks of
+text, so the API can stream large reports without holding every entry, or the
+whole response body, in memory.
+"""
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+encoder = DjangoJSONEncoder()
+
+
+def entry_to_dict(entry):
+    """Return the JSON representation of a URL entry."""
+    return {
+        "id": entry.id,
+        "model_name": entry.model_name,
+        "url_type": entry.url_type,
+        "url": entry.url,
+    }
+
+
+def iter_json(entries):
+    """
+    Yield the ``{"results": [...]}`` document one entry at a time.
+
+    The output is identical to ``JsonResponse({"results": [...]})``.
+    """
+    yield '{"results": ['
+    separator = ""
+    for entry in entries:
+        yield separator + encoder.encode(entry_to_dict(entry))
+        separator = ", "
+    yield "]}"
+
+
+def iter_ndjson(entries):
+    """Yield one JSON document per line for each entry."""
+    for entry in entries:
+        yield encoder.encode(entry_to_dict(entry)) + "\n"
+
+
+def entries_to_columns(entries, base_url):
+    """
+    Return the columnar representation of URL entries.
+
+    The entries are returned as parallel arrays in ``columns``. Model names and
+    URL types are indexes in the ``model_names`` and ``url_types`` tables, and
+    URLs starting with ``base_url`` are stored without it, other URLs (e.g.
+    frontend URLs of other sites) are kept absolute.
+    """
+    model_names = {}
+    url_types = {}
+    columns = {"id": [], "model_name": [], "url_type": [], "url": []}
+    for entry in entries:
+        url = entry.url
+        if url.startswith(base_url):
+            url = url[len(base_url) :]
+        columns["id"].append(entry.id)
+        columns["model_name"].append(
+            model_names.setdefault(entry.model_name, len(model_names))
+        )
+        columns["url_type"].append(url_types.setdefault(entry.url_type, len(url_types)))
+        columns["url"].append(url)
+    return {
+        "base_url": base_url,
+        "model_names": list(model_names),
+        "url_types": list(url_types),
+        "columns": columns,
+    }
@@ -0,0 +1,356 @@
+"""
+The persisted URL inventory.
+
+``refresh_report()`` stores a provider's URLs as ``UnveilUrlRecord`` rows with
+bulk upserts keyed by the report slug and a hash of each URL. Rows a refresh
+doesn't see any more are deleted. When ``WAGTAIL_UNVEIL_INVENTORY`` is
+enabled, the reports and the JSON API read these rows with indexed queries
+instead of running their providers, so the ``unveil_refresh`` management
+command needs to run whenever the inventory should be brought up to date.
+
+With ``WAGTAIL_UNVEIL_INVENTORY_SIGNALS`` also enabled, signal receivers keep
+the inventory current between refreshes: saving, deleting, publishing,
+unpublishing or moving an object rebuilds the URLs of that object only (and of
+its descendants when a page is moved), and upserts them once the transaction
+is committed. URLs of new objects are added at the end of their report until
+the next refresh puts them in order.
+
+The receivers reuse the base URL and maximum number of instances of the last
+refresh, stored as an ``UnveilInventoryRefresh`` row, and leave reports that
+were never refreshed alone. When the refresh was limited, only the instances a
+refresh would sample keep URLs: objects leaving the sample are removed and
+objects entering it added, so the inventory holds the URLs a refresh would.
+"""
+
+import hashlib
+import time
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from wagtail_unveil.models import UnveilInventoryRefresh, UnveilUrlRecord
+from wagtail_unveil.pagination import decode_cursor, encode_cursor
+from wagtail_unveil.providers import (
+    UrlPosition,
+    get_dependent_slugs,
+    get_providers,
+)
+
+# Number of records written per bulk upsert
+REFRESH_BATCH_SIZE = 1000
+
+
+def is_inventory_enabled():
+    return getattr(settings, "WAGTAIL_UNVEIL_INVENTORY", False)
+
+
+def are_inventory_signals_enabled():
+    return getattr(settings, "WAGTAIL_UNVEIL_INVENTORY_SIGNALS", False)
+
+
+def get_content_hash(model_name, url_type, url):
+    """Return the hash identifying a URL within a report."""
+    content = f"{model_name}\0{url_type}\0{url}"
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def get_inventory_records(slug, url_filter=None):
+    """
+    Return the inventory records of a report, in report order, only keeping
+    the records url_filter matches if given.
+    """
+    records = UnveilUrlRecord.objects.filter(provider=slug).order_by("position")
+    if url_filter:
+        records = url_filter.filter_records(records)
+    return records
+
+
+def iter_inventory_entries(slug, url_filter=None):
+    """Yield the UrlEntry objects of a report from the inventory."""
+    records = get_inventory_records(slug, url_filter).only(
+        "position", "model_name", "url_type", "url"
+    )
+    for record in records.iterator(chunk_size=REFRESH_BATCH_SIZE):
+        yield record.to_entry()
+
+
+def get_inventory_state(slug):
+    """
+    Return the count, highest position and latest update time of a report's
+    records, in a single aggregate query.
+    """
+    return UnveilUrlRecord.objects.filter(provider=slug).aggregate(
+        count=Count("pk"), max_position=Max("position"), last_modified=Max("updated_at")
+    )
+
+
+def paginate_inventory(slug, limit, cursor=None, url_filter=None):
+    """
+    Return up to limit UrlEntry objects of a report from the inventory and the
+    cursor of the next page, or None if this is the last page.
+    """
+    next_id = 1
+    if cursor:
+        _position, next_id = decode_cursor(slug, cursor)
+    records = get_inventory_records(slug, url_filter).filter(position__gte=next_id)
+    entries = [record.to_entry() for record in records[: limit + 1]]
+    if len(entries) > limit:
+        return entries[:limit], encode_cursor(slug, UrlPosition(), entries[limit].id)
+    return entries, None
+
+
+class InventoryEntryList(Sequence):
+    """
+    A lazily evaluated sequence of a report's URL entries in the inventory,
+    which Django's Paginator can paginate with a count and a sliced query.
+    """
+
+    def __init__(self, slug, url_filter=None):
+        self.records = get_inventory_records(slug, url_filter)
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self.records.count()
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        for record in self.records:
+            yield record.to_entry()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [record.to_entry() for record in self.records[index]]
+        if index < 0:
+            index += self.count()
+        return self.records[index].to_entry()
+
+
+def iter_records(provider, base_url, max_instances, refreshed_at):
+    """Yield unsaved UnveilUrlRecord objects for a provider's URLs."""
+    models = provider.get_models()
+    seen = set()
+    urls = provider.iter_positioned_urls(base_url, max_instances)
+    for position, (model_name, url_type, url) in urls:
+        content_hash = get_content_hash(model_name, url_type, url)
+        # A report listing the same URL twice only stores it once
+        if content_hash in seen:
+            continue
+        seen.add(content_hash)
+        model = models[position.model_index] if position.model_index >= 0 else None
+        yield UnveilUrlRecord(
+            provider=provider.slug,
+            position=len(seen),
+            model_name=model_name,
+            model_label=model._meta.label if model else "",
+            object_pk="" if position.pk is None else str(position.pk),
+            url_type=url_type,
+            url=url,
+            content_hash=content_hash,
+            created_at=refreshed_at,
+            updated_at=refreshed_at,
+        )
+
+
+def save_records(records):
+    """Insert records, or update the stored records with the same URL."""
+    # MySQL and MariaDB upsert on any unique constraint and reject a target
+    features = connections[UnveilUrlRecord.objects.db].features
+    unique_fields = None
+    if features.supports_update_conflicts_with_target:
+        unique_fields = ["provider", "content_hash"]
+    UnveilUrlRecord.objects.bulk_create(
+        records,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=[
+            "position",
+            "model_name",
+            "model_label",
+            "object_pk",
+            "url_type",
+            "url",
+            "updated_at",
+        ],
+    )
+
+
+def refresh_report(provider, base_url, max_instances, batch_size=REFRESH_BATCH_SIZE):
+    """
+    Rebuild the inventory of a provider, and return the number of URLs stored,
+    the number of stale URLs removed and the time it took in seconds.
+    """
+    start = time.perf_counter()
+    refreshed_at = timezone.now()
+    count = 0
+    with transaction.atomic():
+        batch = []
+        for record in iter_records(provider, base_url, max_instances, refreshed_at):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                save_records(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            save_records(batch)
+            count += len(batch)
+        removed, _ = UnveilUrlRecord.objects.filter(
+            provider=provider.slug, updated_at__lt=refreshed_at
+        ).delete()
+        UnveilInventoryRefresh.objects.update_or_create(
+            provider=provider.slug,
+            defaults={
+                "base_url": base_url,
+                "max_instances": max_instances,
+                "refreshed_at": refreshed_at,
+            },
+        )
+    return count, removed, time.perf_counter() - start
+
+
+def index_objects(provider, base_url, model, pks, max_instances=0):
+    """
+    Rebuild the inventory records of the instances of a model with the given
+    primary keys, and return the number of URLs stored and removed.
+
+    Records keep their positions, URLs the instances didn't have before are
+    added at the end of the report. When max_instances limits the report,
+    instances outside its sample lose their records and the sampled instances
+    without records are added.
+    """
+    model_label = model._meta.label
+    object_pks = {str(pk) for pk in pks}
+    refreshed_at = timezone.now()
+    with transaction.atomic():
+        if max_instances and provider.limit_instances:
+            sample = {
+                str(pk): pk
+                for pk in provider.get_sample_pks(base_url, model, max_instances)
+            }
+            stored = set(
+                UnveilUrlRecord.objects.filter(
+                    provider=provider.slug, model_label=model_label
+                )
+                .exclude(object_pk="")
+                .values_list("object_pk", flat=True)
+                .distinct()
+            )
+            pks = [
+                pk
+                for key, pk in sample.items()
+                if key in object_pks or key not in stored
+            ]
+            object_pks |= stored - sample.keys()
+            object_pks |= {str(pk) for pk in pks}
+        records = UnveilUrlRecord.objects.filter(
+            provider=provider.slug, model_label=model_label, object_pk__in=object_pks
+        )
+        positions = sorted(records.values_list("position", flat=True))
+        next_position = None
+        new_records = {}
+        for pk, (model_name, url_type, url) in provider.iter_object_urls(
+            base_url, model, pks
+        ):
+            content_hash = get_content_hash(model_name, url_type, url)
+            if content_hash in new_records:
+                continue
+            if positions:
+                position = positions.pop(0)
+            else:
+                if next_position is None:
+                    last_position = get_inventory_state(provider.slug)["max_position"]
+                    next_position = (last_position or 0) + 1
+                position = next_position
+                next_position += 1
+            new_records[content_hash] = UnveilUrlRecord(
+                provider=provider.slug,
+                position=position,
+                model_name=model_name,
+                model_label=model_label,
+                object_pk=str(pk),
+                url_type=url_type,
+                url=url,
+                content_hash=content_hash,
+                created_at=refreshed_at,
+                updated_at=refreshed_at,
+            )
+        if new_records:
+            save_records(list(new_records.values()))
+        removed, _ = records.exclude(content_hash__in=list(new_records)).delete()
+    return len(new_records), removed
+
+
+def index_changed_objects(objects):
+    """
+    Rebuild the inventory records of objects, a dict of provider slug to
+    dicts of model to sets of primary keys, with the options of the last
+    refresh of each report. Reports that were never refreshed are skipped.
+    """
+    providers = get_providers()
+    refreshes = UnveilInventoryRefresh.objects.filter(provider__in=list(objects))
+    for refresh in refreshes:
+        for model, pks in objects[refresh.provider].items():
+            index_objects(
+                providers[refresh.provider],
+                refresh.base_url,
+                model,
+                pks,
+                refresh.max_instances,
+            )
+
+
+def get_changed_objects(instances):
+    """
+    Return the objects whose URLs change with instances, as a dict of provider
+    slug to dicts of model to sets of primary keys.
+    """
+    objects = {}
+    providers = None
+    for instance in instances:
+        # Only the providers depending on the instance's model can index it
+        slugs = get_dependent_slugs(type(instance))
+        if not slugs:
+            continue
+        if providers is None:
+            providers = get_providers()
+        for slug in slugs:
+            for model, pk in providers[slug].get_indexed_objects(instance):
+                if pk is not None:
+                    objects.setdefault(slug, {}).setdefault(model, set()).add(pk)
+    return objects
+
+
+def update_inventory(sender, instance, **kwargs):
+    """
+    Signal receiver rebuilding the inventory records of the objects whose
+    URLs change with instance, once the current transaction is committed.
+    """
+    if (
+        not are_inventory_signals_enabled()
+        or kwargs.get("raw")
+        or sender in (UnveilUrlRecord, UnveilInventoryRefresh)
+        or not get_dependent_slugs(sender)
+    ):
+        return
+    objects = get_changed_objects([instance])
+    if objects:
+        transaction.on_commit(lambda: index_changed_objects(objects))
+
+
+def update_moved_page_inventory(sender, instance, **kwargs):
+    """
+    Signal receiver for post_page_move, rebuilding the inventory records of the
+    moved page and its descendants, whose URLs all change.
+    """
+    if not are_inventory_signals_enabled():
+        return
+    pages = instance.get_descendants(inclusive=True).only("pk", "content_type_id")
+    objects = get_changed_objects(pages)
+    if objects:
+        transaction.on_commit(lambda: index_changed_objects(objects))
@@ -0,0 +1,183 @@
+import json
+import time
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail_unveil.checks import check_urls, check_urls_in_process, get_check_user
+from wagtail_unveil.reports import build_reports
+
+
+class Command(BaseCommand):
+    help = (
+        "Checks that the URLs of every registered Unveil report respond, with "
+        "concurrent requests, and how long they take, and fails if any of "
+        "them don't respond."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reports",
+            type=str,
+            help="Comma separated slugs of the reports to check, defaults to all.",
+        )
+        parser.add_argument(
+            "--exclude",
+            type=str,
+            help="Comma separated slugs of reports to leave out.",
+        )
+        parser.add_argument(
+            "--base-url",
+            type=str,
+            help="Base URL of the checked URLs, defaults to WAGTAIL_UNVEIL_BASE_URL.",
+        )
+        parser.add_argument(
+            "--max-instances",
+            type=int,
+            help=(
+                "Maximum number of instances per model, defaults to "
+                "WAGTAIL_UNVEIL_MAX_INSTANCES."
+            ),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help=(
+                "Number of URLs checked concurrently, defaults to "
+                "WAGTAIL_UNVEIL_CHECK_WORKERS."
+            ),
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            help=(
+                "Seconds to wait for each response, defaults to "
+                "WAGTAIL_UNVEIL_CHECK_TIMEOUT."
+            ),
+        )
+        parser.add_argument(
+            "--retries",
+            type=int,
+            help=(
+                "Number of times a failed check is retried, defaults to "
+                "WAGTAIL_UNVEIL_CHECK_RETRIES."
+            ),
+        )
+        parser.add_argument(
+            "--method",
+            choices=["HEAD", "GET"],
+            help="HTTP method of the requests, HEAD by default or GET in process.",
+        )
+        parser.add_argument(
+            "--in-process",
+            action="store_true",
+            help=(
+                "Run the URLs through Django's request handler in this process "
+                "instead of requesting them over the network."
+            ),
+        )
+        parser.add_argument(
+            "--user",
+            type=str,
+            help=(
+                "Username of the user in-process checks are made as, defaults "
+                "to WAGTAIL_UNVEIL_CHECK_USER."
+            ),
+        )
+        parser.add_argument(
+            "--header",
+            action="append",
+            default=[],
+            help='Header sent with every request, e.g. "Cookie: sessionid=...".',
+        )
+        parser.add_argument(
+            "--format",
+            choices=["text", "ndjson"],
+            default="text",
+            help="Output one line of text or one JSON object per URL.",
+        )
+        parser.add_argument(
+            "--sort",
+            choices=["completed", "slowest"],
+            default="completed",
+            help=(
+                "Output the results as they complete, or the slowest first "
+                "once every URL is checked."
+            ),
+        )
+
+    def get_headers(self, options):
+        headers = {}
+        for header in options["header"]:
+            name, separator, value = header.partition(":")
+            if not separator or not name.strip():
+                raise CommandError(f"Invalid header: {header}")
+            headers[name.strip()] = value.strip()
+        return headers
+
+    def handle(self, *args, **options):
+        slugs = options["reports"].split(",") if options["reports"] else None
+        exclude = options["exclude"].split(",") if options["exclude"] else ()
+        headers = self.get_headers(options)
+        try:
+            reports = build_reports(
+                slugs, exclude, options["base_url"], options["max_instances"]
+            )
+        except ValueError as e:
+            raise CommandError(e)
+        # Reports can share URLs, each one is only checked once
+        urls = list(
+            dict.fromkeys(
+                entry.url for report in reports.values() for entry in report.entries
+            )
+        )
+
+        if options["in_process"]:
+            try:
+                user = get_check_user(options["user"])
+            except ObjectDoesNotExist:
+                raise CommandError("The check user doesn't exist.")
+            results = check_urls_in_process(urls, user, options["method"] or "GET")
+        else:
+            results = check_urls(
+                urls,
+                workers=options["workers"],
+                timeout=options["timeout"],
+                retries=options["retries"],
+                method=options["method"] or "HEAD",
+                headers=headers,
+            )
+
+        start = time.perf_counter()
+        if options["sort"] == "slowest":
+            results = sorted(results, key=lambda result: result.elapsed, reverse=True)
+        failed = 0
+        for result in results:
+            if not result.ok:
+                failed += 1
+            self.stdout.write(self.format_result(result, options["format"]))
+        duration = time.perf_counter() - start
+
+        summary = (
+            f"Checked {len(urls)} URLs in {duration:.2f}s: "
+            f"{len(urls) - failed} OK, {failed} failed"
+        )
+        if options["format"] == "text":
+            self.stdout.write(summary)
+        if failed:
+            raise CommandError(summary)
+
+    def format_result(self, result, output_format):
+        if output_format == "ndjson":
+            return json.dumps(result.to_dict())
+        status = result.status or "ERR"
+        line = f"{status} {result.url} {result.elapsed * 1000:.0f}ms"
+        if result.ttfb is not None:
+            line += f" ttfb {result.ttfb * 1000:.0f}ms"
+        if result.size is not None:
+            line += f" {result.size}B"
+        if result.queries is not None:
+            line += f" {result.queries} queries {result.db_time * 1000:.0f}ms"
+        if result.error:
+            line += f" {result.error}"
+        return line
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail_unveil.inventory import REFRESH_BATCH_SIZE, refresh_report
+from wagtail_unveil.providers import get_base_url, get_max_instances
+from wagtail_unveil.reports import get_report_providers
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the persisted URL inventory of every registered Unveil "
+        "provider, which the reports read when WAGTAIL_UNVEIL_INVENTORY is set."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reports",
+            type=str,
+            help="Comma separated slugs of the reports to refresh, defaults to all.",
+        )
+        parser.add_argument(
+            "--exclude",
+            type=str,
+            help="Comma separated slugs of reports to leave out.",
+        )
+        parser.add_argument(
+            "--base-url",
+            type=str,
+            help="Base URL of the stored URLs, defaults to WAGTAIL_UNVEIL_BASE_URL.",
+        )
+        parser.add_argument(
+            "--max-instances",
+            type=int,
+            help=(
+                "Maximum number of instances per model, defaults to "
+                "WAGTAIL_UNVEIL_MAX_INSTANCES."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=REFRESH_BATCH_SIZE,
+            help="Number of URLs written per query.",
+        )
+
+    def handle(self, *args, **options):
+        slugs = options["reports"].split(",") if options["reports"] else None
+        exclude = options["exclude"].split(",") if options["exclude"] else ()
+        try:
+            providers = get_report_providers(slugs, exclude)
+        except ValueError as e:
+            raise CommandError(e)
+        base_url = options["base_url"] or get_base_url()
+        max_instances = options["max_instances"]
+        if max_instances is None:
+            max_instances = get_max_instances()
+
+        for slug, provider in providers.items():
+            count, removed, duration = refresh_report(
+                provider, base_url, max_instances, options["batch_size"]
+            )
+            self.stdout.write(
+                f"{slug}: {count} URLs stored, {removed} removed in {duration:.2f}s"
+            )
@@ -1,11 +1,19 @@
-from django.core.management.base import BaseCommand
-import requests
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail_unveil.checks import send_request, thread_sessions
+from wagtail_unveil.formats import iter_json
+from wagtail_unveil.providers import get_base_url, get_max_instances
+from wagtail_unveil.reports import get_report_providers, iter_report_entries
 
 
 class Command(BaseCommand):
     help = (
-        "Fetches all API endpoints from the index and outputs their results as a dict."
+        "Fetches the results of every registered Unveil provider from the API, "
+        "several endpoints at a time, or builds them in process with "
+        "--in-process, and outputs them as a dict."
     )
 
     def add_arguments(self, parser):
@@ -18,29 +26,148 @@ class Command(BaseCommand):
         parser.add_argument(
             "--token",
             type=str,
-            required=True,
-            help="Bearer token for API authentication.",
+            help="Bearer token for API authentication, unless --in-process is given.",
+        )
+        parser.add_argument(
+            "--reports",
+            type=str,
+            help="Comma separated slugs of the reports to fetch, defaults to all.",
+        )
+        parser.add_argument(
+            "--exclude",
+            type=str,
+            help="Comma separated slugs of reports to leave out.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of endpoints fetched concurrently.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=60,
+            help="Seconds to wait for each endpoint to respond.",
+        )
+        parser.add_argument(
+            "--retries",
+            type=int,
+            default=2,
+            help="Number of times a request that failed or got a 5xx is retried.",
+        )
+        parser.add_argument(
+            "--output",
+            type=str,
+            help="File to write the results to, defaults to stdout.",
+        )
+        parser.add_argument(
+            "--in-process",
+            action="store_true",
+            help=(
+                "Build the reports with the providers in this process instead "
+                "of fetching them from the API."
+            ),
+        )
+        parser.add_argument(
+            "--base-url",
+            type=str,
+            help=(
+                "Base URL of the URLs built in process, defaults to "
+                "WAGTAIL_UNVEIL_BASE_URL."
+            ),
+        )
+        parser.add_argument(
+            "--max-instances",
+            type=int,
+            help=(
+                "Maximum number of instances per model built in process, "
+                "defaults to WAGTAIL_UNVEIL_MAX_INSTANCES."
+            ),
         )
 
-    def handle(self, *args, **options):
+    def fetch(self, session, url, options):
+        """Return the JSON body of an endpoint, or an error document."""
+        response, error, _elapsed, _attempts = send_request(
+            session, "GET", url, options["timeout"], options["retries"]
+        )
+        if response is None:
+            return json.dumps({"error": error})
+        if response.status_code != 200:
+            return json.dumps({"error": f"HTTP {response.status_code}"})
+        # The body is already {"results": [...]}, it's written out as is
+        return response.text
+
+    def iter_fetched_reports(self, providers, options):
+        """Yield the slug and body of each endpoint, in the order they arrive."""
         api_root = options["api_root"]
-        token = options["token"]
-        headers = {"Authorization": f"Bearer {token}"}
+        if not api_root.endswith("/"):
+            api_root += "/"
+        workers = max(options["workers"], 1)
+        headers = {"Authorization": f"Bearer {options['token']}"}
+        with thread_sessions(workers, headers) as get_session:
+
+            def fetch(url):
+                return self.fetch(get_session(), url, options)
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(fetch, f"{api_root}{slug}/"): slug
+                    for slug in providers
+                }
+                for future in as_completed(futures):
+                    yield futures[future], [future.result()]
+
+    def iter_built_reports(self, providers, options):
+        """
+        Yield the slug and the chunks of the same body as each endpoint, built
+        by the providers one entry at a time.
+        """
+        base_url = options["base_url"] or get_base_url()
+        max_instances = options["max_instances"]
+        if max_instances is None:
+            max_instances = get_max_instances()
+        for slug, provider in providers.items():
+            yield (
+                slug,
+                iter_json(iter_report_entries(provider, base_url, max_instances)),
+            )
+
+    def handle(self, *args, **options):
+        if not options["in_process"] and not options["token"]:
+            raise CommandError("--token is required unless --in-process is given.")
+        slugs = options["reports"].split(",") if options["reports"] else None
+        exclude = options["exclude"].split(",") if options["exclude"] else ()
         try:
-            index_response = requests.get(api_root, headers=headers)
-            index_response.raise_for_status()
-            endpoints = index_response.json().get("endpoints", {})
-        except Exception as e:
-            self.stderr.write(self.style.ERROR(f"Failed to fetch API index: {e}"))
-            return
-
-        results = {}
-        for name, url in endpoints.items():
-            try:
-                resp = requests.get(url, headers=headers)
-                resp.raise_for_status()
-                results[name] = resp.json()
-            except Exception as e:
-                results[name] = {"error": str(e)}
-
-        self.stdout.write(json.dumps(results, indent=2))
+            providers = get_report_providers(slugs, exclude)
+        except ValueError as e:
+            raise CommandError(e)
+        if options["in_process"]:
+            reports = self.iter_built_reports(providers, options)
+        else:
+            reports = self.iter_fetched_reports(providers, options)
+
+        output = (
+            open(options["output"], "w", encoding="utf-8")
+            if options["output"]
+            else None
+        )
+        try:
+            # Each report is written out as soon as it's ready, the output is
+            # a dict of slug to results like the /all/ endpoint
+            separator = "{\n"
+            for slug, chunks in reports:
+                self.write(output, [f"{separator}{json.dumps(slug)}: ", *chunks])
+                separator = ",\n"
+            self.write(output, ["{}\n" if separator == "{\n" else "\n}\n"])
+        finally:
+            if output:
+                output.close()
+
+    def write(self, output, chunks):
+        if output is None:
+            self.stdout.write("".join(chunks), ending="")
+            self.stdout.flush()
+        else:
+            output.writelines(chunks)
+            output.flush()
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnveilUrlRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(max_length=100)),
+                ('position', models.PositiveIntegerField()),
+                ('model_name', models.TextField()),
+                ('model_label', models.CharField(blank=True, max_length=255)),
+                ('object_pk', models.CharField(blank=True, max_length=255)),
+                ('url_type', models.CharField(max_length=100)),
+                ('url', models.TextField()),
+                ('content_hash', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['provider', 'position'], name='wagtail_unv_provide_95008c_idx'), models.Index(fields=['provider', 'url_type'], name='wagtail_unv_provide_1d7b22_idx'), models.Index(fields=['model_label', 'object_pk'], name='wagtail_unv_model_l_7ca833_idx')],
+                'constraints': [models.UniqueConstraint(fields=('provider', 'content_hash'), name='unique_unveil_url_record')],
+            },
+        ),
+    ]
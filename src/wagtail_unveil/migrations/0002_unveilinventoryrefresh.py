@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:23
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtail_unveil', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnveilInventoryRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('provider', models.CharField(max_length=100, unique=True)),
+                ('base_url', models.TextField()),
+                ('max_instances', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
@@ -1,10 +1,44 @@
-from dataclasses import dataclass, field
+import sys
+import threading
+
+from django.db import models
+from django.utils import timezone
+
+# The scheme and host of every entry URL, stored once and referred to by index
+BASE_URLS = []
+_base_url_indexes = {}
+_base_urls_lock = threading.Lock()
+
+
+def split_url(url):
+    """
+    Return the (base index, path) pair of a URL, where the base is its scheme
+    and host, stored in BASE_URLS.
+    """
+    scheme_end = url.find("://")
+    path_start = url.find("/", scheme_end + 3) if scheme_end >= 0 else 0
+    if path_start < 0:
+        path_start = len(url)
+    base = url[:path_start]
+    index = _base_url_indexes.get(base)
+    if index is None:
+        with _base_urls_lock:
+            index = _base_url_indexes.get(base)
+            if index is None:
+                index = len(BASE_URLS)
+                BASE_URLS.append(base)
+                _base_url_indexes[base] = index
+    return index, url[path_start:]
 
 
-@dataclass
 class UrlEntry:
     """
-    Base class for URL entries.
+    A URL in a report.
+
+    Entries are slotted, and store their URL as an index in BASE_URLS and a
+    path, since reports can hold hundreds of thousands of them. URL types are
+    interned, use ``make_entries()`` to share the model names of consecutive
+    entries too.
 
     Attributes:
         id: The ID of the URL entry.
@@ -13,10 +47,126 @@ class UrlEntry:
         url: The URL.
     """
 
-    id: int = field(default_factory=lambda: 0)
-    model_name: str = field(default_factory=lambda: "")
-    url_type: str = field(default_factory=lambda: "")
-    url: str = field(default_factory=lambda: "")
+    __slots__ = ("base_index", "id", "model_name", "path", "url_type")
+
+    def __init__(self, id=0, model_name="", url_type="", url=""):
+        self.id = id
+        self.model_name = model_name
+        self.url_type = sys.intern(url_type)
+        self.base_index, self.path = split_url(url)
+
+    @property
+    def url(self):
+        return BASE_URLS[self.base_index] + self.path
+
+    @url.setter
+    def url(self, url):
+        self.base_index, self.path = split_url(url)
+
+    def as_tuple(self):
+        return (self.id, self.model_name, self.url_type, self.url)
+
+    def __eq__(self, other):
+        if not isinstance(other, UrlEntry):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (
+            f"UrlEntry(id={self.id!r}, model_name={self.model_name!r}, "
+            f"url_type={self.url_type!r}, url={self.url!r})"
+        )
+
+    def __reduce__(self):
+        # Base indexes are only meaningful in this process
+        return (UrlEntry, self.as_tuple())
+
+
+def make_entries(urls, start=1):
+    """
+    Yield UrlEntry objects numbered from start for (model_name, url_type, url)
+    tuples. Consecutive entries of the same model or instance share a single
+    model name string.
+    """
+    previous = None
+    for counter, (model_name, url_type, url) in enumerate(urls, start=start):
+        if model_name == previous:
+            model_name = previous
+        previous = model_name
+        yield UrlEntry(counter, model_name, url_type, url)
+
+
+class UnveilUrlRecord(models.Model):
+    """
+    A URL stored in the persisted URL inventory.
+
+    The inventory is rebuilt by the ``unveil_refresh`` management command, and
+    read by the reports instead of their providers when
+    ``WAGTAIL_UNVEIL_INVENTORY`` is enabled.
+
+    Attributes:
+        provider: The slug of the report the URL belongs to.
+        position: The position of the URL in the report, starting at 1.
+        model_name: The name of the model, or the instance, shown in reports.
+        model_label: The "app_label.ModelName" label of the model, if any.
+        object_pk: The primary key of the instance, for instance URLs.
+        url_type: The type of URL.
+        url: The URL.
+        content_hash: A hash of the model name, URL type and URL.
+        created_at: When the URL was first stored.
+        updated_at: When the URL was last seen by a refresh.
+    """
+
+    provider = models.CharField(max_length=100)
+    position = models.PositiveIntegerField()
+    model_name = models.TextField()
+    model_label = models.CharField(max_length=255, blank=True)
+    object_pk = models.CharField(max_length=255, blank=True)
+    url_type = models.CharField(max_length=100)
+    url = models.TextField()
+    content_hash = models.CharField(max_length=64)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
-        abstract = True
+        constraints = [
+            models.UniqueConstraint(
+                fields=["provider", "content_hash"],
+                name="unique_unveil_url_record",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["provider", "position"]),
+            models.Index(fields=["provider", "url_type"]),
+            models.Index(fields=["model_label", "object_pk"]),
+        ]
+
+    def __str__(self):
+        return self.url
+
+    def to_entry(self):
+        """Return the UrlEntry for this record."""
+        return UrlEntry(self.position, self.model_name, self.url_type, self.url)
+
+
+class UnveilInventoryRefresh(models.Model):
+    """
+    The options of the last refresh of a report's URL inventory, which the
+    inventory signal receivers reuse so they store the URLs a refresh would.
+
+    Attributes:
+        provider: The slug of the report.
+        base_url: The base URL the report was refreshed with.
+        max_instances: The maximum number of instances per model, 0 for all.
+        refreshed_at: When the report was last refreshed.
+    """
+
+    provider = models.CharField(max_length=100, unique=True)
+    base_url = models.TextField()
+    max_instances = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.provider
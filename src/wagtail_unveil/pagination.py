@@ -0,0 +1,146 @@
+"""
+Pagination for the JSON API and the admin reports.
+
+A page of JSON results ends with an opaque cursor recording the position of
+the next URL in the provider's output (see ``UrlPosition``) and the id the next
+entry gets. Fetching the next page resumes the provider from that position,
+so instances are filtered in SQL by the key they're ordered by (the primary
+key, or the path of pages) instead of rebuilding the whole report and slicing
+it.
+
+The admin reports are paginated by page number, so they use a lazy sequence of
+entries instead, which resumes from the nearest recorded position.
+"""
+
+import base64
+import json
+from collections.abc import Sequence
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from wagtail_unveil.models import UrlEntry, make_entries
+from wagtail_unveil.providers import UrlPosition
+
+
+def encode_cursor(slug, position, next_id):
+    """Return the cursor for the URL at position in the provider's output."""
+    data = [slug, next_id, *position]
+    encoded = json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(encoded.encode()).decode().rstrip("=")
+
+
+def decode_cursor(slug, cursor):
+    """
+    Return the (position, next_id) pair encoded in cursor.
+
+    Raises ValueError if the cursor is malformed or belongs to another provider.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        cursor_slug, next_id, *position = data
+        position = UrlPosition(*position)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor.") from e
+    if (
+        cursor_slug != slug
+        or not isinstance(next_id, int)
+        or not isinstance(position.model_index, int)
+        or not isinstance(position.offset, int)
+        or not isinstance(position.index, int)
+    ):
+        raise ValueError("Invalid cursor.")
+    return position, next_id
+
+
+def paginate_urls(provider, base_url, max_instances, limit, cursor=None):
+    """
+    Return up to limit UrlEntry objects for a provider and the cursor of the
+    next page, or None if this is the last page.
+    """
+    position, next_id = None, 1
+    if cursor:
+        position, next_id = decode_cursor(provider.slug, cursor)
+    entries = []
+    urls = provider.iter_positioned_urls(base_url, max_instances, position)
+    for position, (model_name, url_type, url) in urls:
+        if len(entries) == limit:
+            return entries, encode_cursor(provider.slug, position, next_id)
+        entries.append(UrlEntry(next_id, model_name, url_type, url))
+        next_id += 1
+    return entries, None
+
+
+class UrlEntryList(Sequence):
+    """
+    A lazily evaluated sequence of a provider's URL entries, which Django's
+    Paginator can paginate.
+
+    Counting walks the provider's URLs once without building any entries, and
+    records the position of every ``checkpoint_interval``-th URL. Slicing then
+    resumes the provider from the nearest recorded position and only builds
+    entries for the URLs in the slice.
+
+    Pass urls to wrap a list of (model_name, url_type, url) tuples that was
+    already built, e.g. a cached report, instead of walking the provider.
+    """
+
+    checkpoint_interval = 100
+
+    def __init__(self, provider, base_url, max_instances, urls=None):
+        self.provider = provider
+        self.base_url = base_url
+        self.max_instances = max_instances
+        self.urls = urls
+        self._count = None if urls is None else len(urls)
+        self._checkpoints = []
+
+    def iter_urls(self, start=None):
+        return self.provider.iter_positioned_urls(
+            self.base_url, self.max_instances, start
+        )
+
+    def count(self):
+        if self._count is None:
+            count = 0
+            for count, (position, _url) in enumerate(self.iter_urls(), start=1):
+                if (count - 1) % self.checkpoint_interval == 0:
+                    self._checkpoints.append(position)
+            self._count = count
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        if self.urls is not None:
+            yield from make_entries(self.urls)
+            return
+        yield from make_entries(url for _position, url in self.iter_urls())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.count())
+            if step != 1:
+                return list(self)[index]
+            return self.get_entries(start, stop)
+        if index < 0:
+            index += self.count()
+        entries = self.get_entries(index, index + 1)
+        if not entries:
+            raise IndexError("URL entry index out of range")
+        return entries[0]
+
+    def get_entries(self, start, stop):
+        """Return the entries from index start up to index stop."""
+        if self.urls is not None:
+            return list(make_entries(self.urls[start:stop], start=start + 1))
+        self.count()
+        if start >= stop or not self._checkpoints:
+            return []
+        checkpoint = min(start // self.checkpoint_interval, len(self._checkpoints) - 1)
+        first = checkpoint * self.checkpoint_interval
+        urls = self.iter_urls(self._checkpoints[checkpoint])
+        urls = islice(urls, start - first, stop - first)
+        return list(make_entries((url for _position, url in urls), start=start + 1))
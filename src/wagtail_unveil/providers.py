@@ -0,0 +1,501 @@
+"""
+URL providers for Wagtail Unveil.
+
+A provider describes the URLs exposed by one report: the models it covers, the
+URL names to reverse for each model and each instance, and the arguments those
+URL names take. The report views, the JSON API and the ``unveil_urls``
+management command are all driven by the providers registered with the
+``register_unveil_provider`` hook.
+
+Third-party apps can add their own reports by registering a provider::
+
+    from wagtail import hooks
+    from wagtail_unveil.providers import UnveilProvider
+
+
+    class EventProvider(UnveilProvider):
+        slug = "event"
+        label = "Event"
+        model = Event
+        list_actions = [
+            ("index", "events:index"),
+            ("add", "events:add"),
+        ]
+        instance_actions = [
+            ("edit", "events:edit"),
+            ("delete", "events:delete"),
+        ]
+
+
+    @hooks.register("register_unveil_provider")
+    def register_event_provider():
+        return EventProvider
+"""
+
+import copy
+from itertools import chain
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from wagtail import hooks
+
+from wagtail_unveil.routes import reverse_url
+
+# Number of instances fetched at a time by get_instances()
+INSTANCE_CHUNK_SIZE = 2000
+
+# The registered providers, rebuilt when the register_unveil_provider hooks
+# change, and the slugs of the providers depending on each model
+_registry = {"hooks": None, "providers": {}, "dependencies": [], "dependents": {}}
+
+
+def get_base_url():
+    """Return the base URL used to build absolute URLs in reports."""
+    return getattr(settings, "WAGTAIL_UNVEIL_BASE_URL", "http://localhost:8000")
+
+
+def get_max_instances():
+    """Return the maximum number of instances to include per model."""
+    return getattr(settings, "WAGTAIL_UNVEIL_MAX_INSTANCES", 1)
+
+
+class UrlPosition(NamedTuple):
+    """
+    Where a URL comes from in a provider's output.
+
+    Attributes:
+        model_index: The index of the model in get_models(), -1 for extra URLs.
+        after: The cursor of the previous instance of the model, see
+            UnveilProvider.get_instance_cursor().
+        offset: The number of instances of the model before this one.
+        pk: The primary key of the instance, None for model level URLs.
+        index: The index of the URL among the URLs of the model or instance.
+    """
+
+    model_index: int = -1
+    after: Any = None
+    offset: int = 0
+    pk: Any = None
+    index: int = 0
+
+
+class UnveilProvider:
+    """
+    Base class for URL providers.
+
+    Subclasses declare the URLs they expose with two lists of actions:
+
+    - ``list_actions`` are reversed once per model (index, add, ...).
+    - ``instance_actions`` are reversed once per instance (edit, delete, ...).
+
+    Each action is a ``(url_type, url_name)`` or ``(url_type, url_name, args)``
+    tuple. URL names may use the ``{app_label}`` and ``{model_name}``
+    placeholders (plus anything else returned by ``get_url_context``), and
+    ``args`` names the context keys passed as positional arguments. When
+    ``args`` is omitted, list actions take no arguments and instance actions
+    take the instance's primary key.
+
+    URLs are built from cached route templates (see ``wagtail_unveil.routes``)
+    rather than by calling ``reverse()`` for every instance.
+    """
+
+    # Used as the JSON API slug and the registry key
+    slug = None
+    # Used for the admin menu item of providers registered by other apps
+    label = None
+    icon = "link"
+
+    # The model this provider covers, override get_models() for several models
+    model = None
+    # Overrides the "app_label.ClassName" name shown in reports
+    model_label = None
+
+    list_actions = ()
+    instance_actions = ()
+
+    # Whether WAGTAIL_UNVEIL_MAX_INSTANCES applies to this provider
+    limit_instances = True
+
+    # The UrlFilter narrowing the report, see with_filter()
+    url_filter = None
+
+    def with_filter(self, url_filter):
+        """Return a copy of this provider that only builds the URLs url_filter matches."""
+        provider = copy.copy(self)
+        provider.url_filter = url_filter
+        return provider
+
+    def get_models(self):
+        """Return the models covered by this provider."""
+        return [self.model] if self.model else []
+
+    def get_filtered_models(self):
+        """Return the models covered by this provider that url_filter matches."""
+        if self.url_filter is None:
+            return self.get_models()
+        return [
+            model for model in self.get_models() if self.url_filter.matches_model(model)
+        ]
+
+    def get_url_types(self):
+        """Return the URL types of this provider's URLs, used to filter them."""
+        url_types = []
+        for model in self.get_models():
+            for action in [
+                *self.get_list_actions(model),
+                *self.get_instance_actions(model),
+            ]:
+                if action[0] not in url_types:
+                    url_types.append(action[0])
+        return url_types
+
+    def get_dependencies(self):
+        """
+        Return the models whose changes invalidate this provider's cached URLs.
+        """
+        return self.get_models()
+
+    def get_last_modified_fields(self, model):
+        """
+        Return the names of the fields of a dependency recording when its
+        instances were last changed, used to validate the JSON API responses.
+        """
+        return [
+            field.name
+            for field in model._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+        ]
+
+    def get_model_name(self, model):
+        """Return the name shown in reports for model level URLs."""
+        if self.model_label:
+            return self.model_label
+        return f"{model._meta.app_label}.{model.__name__}"
+
+    def get_instance_label(self, instance):
+        """Return a short human readable label for an instance."""
+        return getattr(instance, "title", getattr(instance, "name", str(instance)))
+
+    def get_instance_name(self, model, instance):
+        """Return the name shown in reports for instance level URLs."""
+        return f"{self.get_model_name(model)} ({self.get_instance_label(instance)})"
+
+    def get_context(self, base_url, max_instances):
+        """
+        Return the context shared by every model of this provider.
+
+        Providers can also use it to fetch data for all their models at once.
+        """
+        return {}
+
+    def get_url_context(self, model, context):
+        """
+        Return the URL context for a model.
+
+        Returning None skips the model entirely.
+        """
+        return {
+            **context,
+            "app_label": model._meta.app_label,
+            "model_name": model._meta.model_name,
+        }
+
+    def get_instance_url_context(self, model, instance, context):
+        """Return the URL context for an instance."""
+        return {**context, "pk": instance.pk}
+
+    def get_list_actions(self, model):
+        return self.list_actions
+
+    def get_instance_actions(self, model):
+        return self.instance_actions
+
+    def get_queryset(self, model):
+        """Return the queryset of instances to report on for a model."""
+        return model._default_manager.all()
+
+    def get_instances(self, model, max_instances, context, after=None, offset=0):
+        """
+        Return the instances to report on for a model, in primary key order.
+
+        When resuming a report, after is the get_instance_cursor() of the last
+        instance already reported and offset the number of instances before it.
+        """
+        instances = self.get_queryset(model).order_by("pk")
+        if self.url_filter:
+            instances = self.url_filter.filter_queryset(instances)
+        if after is not None:
+            instances = instances.filter(pk__gt=after)
+        if max_instances and self.limit_instances:
+            instances = instances[: max(max_instances - offset, 0)]
+        # Don't cache every instance when the report is unlimited
+        return instances.iterator(chunk_size=INSTANCE_CHUNK_SIZE)
+
+    def get_instance_cursor(self, instance):
+        """
+        Return the value get_instances() resumes after, the primary key unless
+        the instances are reported in another order.
+        """
+        return instance.pk
+
+    def get_extra_urls(self, base_url):
+        """Return (model_name, url_type, url) tuples that aren't reversed."""
+        return ()
+
+    def get_extra_instance_urls(
+        self, base_url, model, instance, instance_name, context
+    ):
+        """Return extra (model_name, url_type, url) tuples for an instance."""
+        return ()
+
+    def resolve_actions(self, actions, context, default_args):
+        """
+        Return (url_type, url_name, arg_names) tuples with the placeholders in
+        each URL name filled in from the model's URL context.
+        """
+        resolved = []
+        for action in actions:
+            url_type, url_name = action[:2]
+            arg_names = action[2] if len(action) > 2 else default_args
+            resolved.append((url_type, url_name.format(**context), arg_names))
+        return resolved
+
+    def iter_action_urls(self, base_url, name, actions, context):
+        for url_type, url_name, arg_names in actions:
+            args = [context.get(arg_name) for arg_name in arg_names]
+            if None in args:
+                continue
+            url = reverse_url(url_name, args)
+            if url:
+                yield (name, url_type, f"{base_url}{url}")
+
+    def iter_instance_urls(self, base_url, model, instance, actions, context):
+        """Yield the (model_name, url_type, url) tuples of an instance."""
+        instance_name = self.get_instance_name(model, instance)
+        extra_urls = self.get_extra_instance_urls(
+            base_url, model, instance, instance_name, context
+        )
+        if self.url_filter:
+            extra_urls = [
+                url for url in extra_urls if self.url_filter.matches_url_type(url[1])
+            ]
+        return chain(
+            self.iter_action_urls(
+                base_url,
+                instance_name,
+                actions,
+                self.get_instance_url_context(model, instance, context),
+            ),
+            extra_urls,
+        )
+
+    def iter_positioned_urls(self, base_url, max_instances, start=None):
+        """
+        Yield (position, url) pairs for this provider, where url is a
+        (model_name, url_type, url) tuple and position is its UrlPosition.
+
+        Pass the position of a URL as start to resume from that URL without
+        building the URLs before it.
+
+        Models, URL types and instances url_filter doesn't match are skipped
+        before any of their URLs are built.
+        """
+        url_filter = self.url_filter
+        start = start or UrlPosition()
+        if start.model_index < 0 and (
+            url_filter is None or url_filter.includes_extra_urls()
+        ):
+            for index, url in enumerate(self.get_extra_urls(base_url)):
+                if index >= start.index and (
+                    url_filter is None or url_filter.matches_url_type(url[1])
+                ):
+                    yield UrlPosition(index=index), url
+        context = self.get_context(base_url, max_instances)
+        for model_index, model in enumerate(self.get_models()):
+            if model_index < start.model_index:
+                continue
+            if url_filter and not url_filter.matches_model(model):
+                continue
+            resuming = model_index == start.model_index
+            model_context = self.get_url_context(model, context)
+            if model_context is None:
+                continue
+            after, offset = None, 0
+            list_actions = self.get_list_actions(model)
+            instance_actions = self.get_instance_actions(model)
+            if url_filter:
+                list_actions = url_filter.filter_actions(list_actions)
+                if not url_filter.includes_model_urls():
+                    list_actions = []
+                instance_actions = url_filter.filter_actions(instance_actions)
+            if resuming and start.pk is not None:
+                # Resume among the instances, after the model level URLs
+                after, offset = start.after, start.offset
+            else:
+                list_urls = self.iter_action_urls(
+                    base_url,
+                    self.get_model_name(model),
+                    self.resolve_actions(list_actions, model_context, ()),
+                    model_context,
+                )
+                for index, url in enumerate(list_urls):
+                    if not resuming or index >= start.index:
+                        yield UrlPosition(model_index, index=index), url
+            instance_actions = self.resolve_actions(
+                instance_actions, model_context, ("pk",)
+            )
+            try:
+                instances = self.get_instances(
+                    model, max_instances, model_context, after, offset
+                )
+            except (AttributeError, ValueError, TypeError):
+                continue
+            for instance in instances:
+                skip = 0
+                if resuming and str(instance.pk) == str(start.pk):
+                    skip = start.index
+                instance_urls = self.iter_instance_urls(
+                    base_url, model, instance, instance_actions, model_context
+                )
+                for index, url in enumerate(instance_urls):
+                    if index >= skip:
+                        position = UrlPosition(
+                            model_index, after, offset, instance.pk, index
+                        )
+                        yield position, url
+                after, offset = self.get_instance_cursor(instance), offset + 1
+
+    def get_indexed_objects(self, instance):
+        """
+        Return the (model, pk) pairs of the instances whose URLs change when
+        instance is saved or deleted, used to keep the URL inventory current.
+        It's only called for instances of the models in get_dependencies().
+        """
+        model = type(instance)
+        if model in self.get_models():
+            return [(model, instance.pk)]
+        return []
+
+    def get_index_context(self, base_url, model, pks):
+        """
+        Return the context used to rebuild the URLs of some instances of a
+        model, instead of get_context() which covers the whole report.
+        """
+        return {}
+
+    def get_index_instances(self, model, pks, context):
+        """
+        Return the instances of a model with the given primary keys that
+        belong in the report, the others have no URLs.
+        """
+        return self.get_queryset(model).filter(pk__in=pks)
+
+    def get_sample_pks(self, base_url, model, max_instances):
+        """
+        Return the primary keys of the instances of a model this provider
+        reports on when limited to max_instances, which are the only instances
+        the URL inventory stores.
+        """
+        model_context = self.get_url_context(
+            model, self.get_context(base_url, max_instances)
+        )
+        if model_context is None:
+            return []
+        try:
+            instances = self.get_instances(model, max_instances, model_context)
+        except (AttributeError, ValueError, TypeError):
+            return []
+        return [instance.pk for instance in instances]
+
+    def iter_object_urls(self, base_url, model, pks):
+        """
+        Yield (pk, url) pairs for the URLs of the instances of a model with the
+        given primary keys, where url is a (model_name, url_type, url) tuple.
+        """
+        context = self.get_index_context(base_url, model, pks)
+        model_context = self.get_url_context(model, context)
+        if model_context is None:
+            return
+        instance_actions = self.resolve_actions(
+            self.get_instance_actions(model), model_context, ("pk",)
+        )
+        for instance in self.get_index_instances(model, pks, model_context):
+            urls = self.iter_instance_urls(
+                base_url, model, instance, instance_actions, model_context
+            )
+            for url in urls:
+                yield instance.pk, url
+
+    def iter_urls(self, base_url, max_instances):
+        """Yield (model_name, url_type, url) tuples for this provider."""
+        for _position, url in self.iter_positioned_urls(base_url, max_instances):
+            yield url
+
+    def get_urls(self, base_url=None, max_instances=None):
+        """Return a list of (model_name, url_type, url) tuples."""
+        if base_url is None:
+            base_url = get_base_url()
+        if max_instances is None:
+            max_instances = get_max_instances()
+        return list(self.iter_urls(base_url, max_instances))
+
+
+def get_registry():
+    """
+    Return the registry of providers, building it when the
+    ``register_unveil_provider`` hooks have changed.
+    """
+    fns = tuple(hooks.get_hooks("register_unveil_provider"))
+    if _registry["hooks"] == fns:
+        return _registry
+    providers = {}
+    for fn in fns:
+        result = fn()
+        if not isinstance(result, (list, tuple)):
+            result = [result]
+        for provider in result:
+            if isinstance(provider, type):
+                provider = provider()
+            providers[provider.slug] = provider
+    _registry.update(
+        hooks=fns,
+        providers=providers,
+        dependencies=[
+            (slug, tuple(provider.get_dependencies()))
+            for slug, provider in providers.items()
+        ],
+        dependents={},
+    )
+    return _registry
+
+
+def get_providers():
+    """
+    Return a dict of all registered providers keyed by slug.
+
+    ``register_unveil_provider`` hooks may return a provider class or instance,
+    or a list of them. A provider registered later replaces an earlier one with
+    the same slug. The hooks only run again when they change.
+    """
+    return dict(get_registry()["providers"])
+
+
+def get_dependent_slugs(model):
+    """
+    Return the slugs of the providers whose dependencies include model or one
+    of its parents, computed once per model.
+    """
+    registry = get_registry()
+    slugs = registry["dependents"].get(model)
+    if slugs is None:
+        slugs = registry["dependents"][model] = tuple(
+            slug
+            for slug, dependencies in registry["dependencies"]
+            if any(issubclass(model, dependency) for dependency in dependencies)
+        )
+    return slugs
+
+
+def get_provider(slug):
+    """Return the registered provider for a slug, or None."""
+    return get_registry()["providers"].get(slug)
@@ -0,0 +1,173 @@
+"""
+Run several reports at once.
+
+``get_all_reports()`` is the in-process equivalent of the ``/unveil/api/all/``
+endpoint: it builds every registered report, or a selection of them, in one
+go and returns their entries keyed by slug::
+
+    from wagtail_unveil.reports import get_all_reports
+
+    for slug, entries in get_all_reports(slugs=["page", "snippet"]).items():
+        for entry in entries:
+            print(slug, entry.url_type, entry.url)
+
+Reports are independent of each other, so with ``WAGTAIL_UNVEIL_WORKERS`` (or
+the ``workers`` argument) above 1 they're built concurrently in a thread pool,
+and the whole inventory takes about as long as the slowest report.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.db import connections
+from django.urls import get_script_prefix, get_urlconf, set_script_prefix, set_urlconf
+from django.utils import translation
+
+from wagtail_unveil.cache import get_report_urls
+from wagtail_unveil.inventory import is_inventory_enabled, iter_inventory_entries
+from wagtail_unveil.models import make_entries
+from wagtail_unveil.providers import get_base_url, get_max_instances, get_providers
+
+
+@dataclass
+class ReportResult:
+    """
+    The outcome of building one report.
+
+    Attributes:
+        slug: The slug of the report.
+        entries: The UrlEntry objects of the report.
+        duration: The wall time it took to build the report, in seconds.
+        cache_status: CACHE_HIT or CACHE_MISS, or None if caching is disabled.
+    """
+
+    slug: str = ""
+    entries: list = field(default_factory=list)
+    duration: float = 0.0
+    cache_status: str = None
+
+
+def get_workers():
+    """Return the number of reports built concurrently."""
+    return getattr(settings, "WAGTAIL_UNVEIL_WORKERS", 1)
+
+
+def get_report_providers(slugs=None, exclude=()):
+    """
+    Return the registered providers keyed by slug, in registration order,
+    limited to slugs if given and leaving out the slugs in exclude.
+
+    Raises ValueError if any slug isn't registered.
+    """
+    providers = get_providers()
+    unknown = sorted(set(slugs or ()).union(exclude).difference(providers))
+    if unknown:
+        raise ValueError(f"Unknown reports: {', '.join(unknown)}")
+    return {
+        slug: provider
+        for slug, provider in providers.items()
+        if (slugs is None or slug in slugs) and slug not in exclude
+    }
+
+
+def iter_report_entries(provider, base_url, max_instances):
+    """
+    Yield the UrlEntry objects of a report as they're built, or read from the
+    inventory when it's enabled.
+    """
+    if is_inventory_enabled():
+        yield from iter_inventory_entries(provider.slug, provider.url_filter)
+        return
+    yield from make_entries(provider.iter_urls(base_url, max_instances))
+
+
+def build_report(provider, base_url, max_instances):
+    """Build one report and return its ReportResult."""
+    start = time.perf_counter()
+    if is_inventory_enabled():
+        entries = list(iter_inventory_entries(provider.slug, provider.url_filter))
+        return ReportResult(provider.slug, entries, time.perf_counter() - start)
+    urls, cache_status = get_report_urls(provider, base_url, max_instances)
+    entries = list(make_entries(urls))
+    return ReportResult(
+        provider.slug, entries, time.perf_counter() - start, cache_status
+    )
+
+
+def build_report_in_thread(state, provider, base_url, max_instances):
+    """
+    Build a report in a worker thread.
+
+    URLs are reversed with the calling thread's script prefix, URLconf and
+    language, and the database connections the thread opened are closed
+    once the report is built.
+    """
+    script_prefix, urlconf, language = state
+    set_script_prefix(script_prefix)
+    set_urlconf(urlconf)
+    try:
+        with translation.override(language):
+            return build_report(provider, base_url, max_instances)
+    finally:
+        set_urlconf(None)
+        connections.close_all()
+
+
+def build_reports(
+    slugs=None,
+    exclude=(),
+    base_url=None,
+    max_instances=None,
+    workers=None,
+    url_filter=None,
+):
+    """
+    Build every registered report, or the ones selected with slugs and
+    exclude, and return a dict of slug to ReportResult in registration order.
+
+    Up to workers reports are built concurrently, WAGTAIL_UNVEIL_WORKERS by
+    default. Cached reports are used when caching is enabled. Pass url_filter
+    to only build the URLs it matches.
+    """
+    if base_url is None:
+        base_url = get_base_url()
+    if max_instances is None:
+        max_instances = get_max_instances()
+    if workers is None:
+        workers = get_workers()
+    providers = get_report_providers(slugs, exclude)
+    if url_filter:
+        providers = {
+            slug: provider.with_filter(url_filter)
+            for slug, provider in providers.items()
+        }
+    if workers <= 1 or len(providers) <= 1:
+        return {
+            slug: build_report(provider, base_url, max_instances)
+            for slug, provider in providers.items()
+        }
+    state = (get_script_prefix(), get_urlconf(), translation.get_language())
+    with ThreadPoolExecutor(
+        max_workers=min(workers, len(providers)), thread_name_prefix="unveil"
+    ) as executor:
+        futures = {
+            slug: executor.submit(
+                build_report_in_thread, state, provider, base_url, max_instances
+            )
+            for slug, provider in providers.items()
+        }
+        return {slug: future.result() for slug, future in futures.items()}
+
+
+def get_all_reports(
+    slugs=None, exclude=(), base_url=None, max_instances=None, workers=None
+):
+    """
+    Return a dict of report slug to the list of UrlEntry objects of the
+    report, for every registered report or the ones selected with slugs and
+    exclude.
+    """
+    results = build_reports(slugs, exclude, base_url, max_instances, workers)
+    return {slug: result.entries for slug, result in results.items()}
@@ -0,0 +1,290 @@
+"""
+Route templates for Wagtail Unveil.
+
+Reversing a URL name walks the URL resolver each time, and a URL name that
+doesn't exist costs a raised and swallowed ``NoReverseMatch``. Reports reverse
+the same handful of URL names for every instance, so instead each
+(URL name, argument shape) is reversed once with placeholder arguments and
+turned into a format template. Instance URLs are then built by substituting the
+real arguments into the template, and URL names that don't exist are cached as
+missing.
+
+Whether a URL name exists at all is looked up in an index of every named URL
+pattern, built once by walking the resolver, so URL names that don't exist
+never reach ``reverse()``.
+
+The templates and the index are tied to the URL resolver they were built from,
+so they're rebuilt whenever the URLconf changes, e.g. after
+``clear_url_caches()`` or when ``ROOT_URLCONF`` is overridden. The same goes
+for the URLconf fingerprint used to validate cached reports.
+"""
+
+import hashlib
+import threading
+import uuid
+from typing import NamedTuple
+from urllib.parse import quote
+
+from django.urls import (
+    NoReverseMatch,
+    get_resolver,
+    get_script_prefix,
+    get_urlconf,
+    reverse,
+)
+from django.urls.converters import DEFAULT_CONVERTERS, get_converters
+from django.urls.resolvers import RegexPattern, RoutePattern
+from django.utils import translation
+from django.utils.http import RFC3986_SUBDELIMS
+from django.utils.regex_helper import normalize
+
+# The same characters reverse() leaves unquoted
+SAFE_CHARACTERS = RFC3986_SUBDELIMS + "/~:@"
+
+# Cache entries for URL names that don't exist, and URL names whose patterns
+# don't accept placeholder arguments and so have to be reversed every time
+MISSING = object()
+UNCACHEABLE = object()
+
+# Converters whose to_url() is str(), so arguments can be substituted into a
+# template. Other converters can change the value, e.g. pad a number
+BUILTIN_CONVERTERS = frozenset(DEFAULT_CONVERTERS)
+
+_lock = threading.Lock()
+_cache = {"resolver": None, "templates": {}, "fingerprint": None, "routes": None}
+
+
+class Route(NamedTuple):
+    """
+    A named URL pattern.
+
+    Attributes:
+        name: The URL name, prefixed with its namespaces like reverse() takes it.
+        namespace: The namespaces of the URL name, "" if it has none.
+        arg_count: The number of arguments the URL takes.
+        converters: The path converter of each argument, e.g. "int", or None
+            for arguments captured by a regular expression.
+    """
+
+    name: str
+    namespace: str
+    arg_count: int
+    converters: tuple
+
+
+def get_pattern_args(pattern):
+    """
+    Return the possible arguments of a pattern, as tuples of converter names,
+    one for each way the pattern can be reversed.
+    """
+    if isinstance(pattern, RoutePattern):
+        converter_names = {
+            type(converter): name for name, converter in get_converters().items()
+        }
+        return [
+            tuple(
+                converter_names.get(type(converter), type(converter).__name__)
+                for converter in pattern.converters.values()
+            )
+        ]
+    if isinstance(pattern, RegexPattern):
+        return [(None,) * len(params) for _format, params in normalize(pattern._regex)]
+    # i18n_patterns() prefixes don't take arguments
+    return [()]
+
+
+def iter_routes(patterns, namespaces=(), prefix_args=((),)):
+    """
+    Yield a Route for every named URL pattern, including included ones, in
+    URLconf order.
+    """
+    for pattern in patterns:
+        args = [
+            prefix + pattern_args
+            for prefix in prefix_args
+            for pattern_args in get_pattern_args(pattern.pattern)
+        ]
+        if hasattr(pattern, "url_patterns"):
+            included_namespaces = [namespaces]
+            if pattern.namespace:
+                included_namespaces = [(*namespaces, pattern.namespace)]
+                # reverse() also accepts the application namespace
+                if pattern.app_name and pattern.app_name != pattern.namespace:
+                    included_namespaces.append((*namespaces, pattern.app_name))
+            for included in included_namespaces:
+                yield from iter_routes(pattern.url_patterns, included, args)
+        elif pattern.name:
+            namespace = ":".join(namespaces)
+            name = f"{namespace}:{pattern.name}" if namespace else pattern.name
+            for converters in args:
+                yield Route(name, namespace, len(converters), converters)
+
+
+def build_route_index(resolver):
+    """Return a dict of URL name to the Routes with that name, in URLconf order."""
+    index = {}
+    for route in iter_routes(resolver.url_patterns):
+        index.setdefault(route.name, []).append(route)
+    return {name: tuple(routes) for name, routes in index.items()}
+
+
+def get_route_index():
+    """Return the index of the current URLconf's named URL patterns."""
+    resolver = get_resolver(get_urlconf())
+    with _lock:
+        index = _get_cache(resolver)["routes"]
+    if index is None:
+        index = build_route_index(resolver)
+        with _lock:
+            if _cache["resolver"] is resolver:
+                _cache["routes"] = index
+    return index
+
+
+def get_routes(url_name):
+    """Return the Routes named url_name, an empty tuple if there are none."""
+    return get_route_index().get(url_name, ())
+
+
+def route_exists(url_name, arg_count=None):
+    """
+    Return whether url_name exists, and takes arg_count arguments if given,
+    without reversing it.
+    """
+    routes = get_routes(url_name)
+    if arg_count is None:
+        return bool(routes)
+    return any(route.arg_count == arg_count for route in routes)
+
+
+def get_placeholder(arg, index):
+    """
+    Return a placeholder argument of the same type as arg, or None if the type
+    isn't supported.
+    """
+    if isinstance(arg, bool):
+        return None
+    if isinstance(arg, int):
+        return 987654321000 + index
+    if isinstance(arg, str):
+        # Letters only, so slug, str and most regex patterns accept it
+        return f"unveilplaceholder{'abcdefghijklmnopqrstuvwxyz'[index % 26]}"
+    if isinstance(arg, uuid.UUID):
+        return uuid.UUID(int=0x9876543210 + index)
+    return None
+
+
+def build_route_template(url_name, args):
+    """
+    Reverse url_name once with placeholder arguments and return a format
+    template with positional fields in their place, MISSING if the URL name
+    doesn't exist or UNCACHEABLE if a template can't be built, e.g. when the
+    URL takes a custom path converter.
+    """
+    # Arguments with defaults can be left out, so only check the arguments given
+    if not route_exists(url_name, len(args) or None):
+        return MISSING
+    for route in get_routes(url_name):
+        if route.arg_count == len(args) and any(
+            converter is not None and converter not in BUILTIN_CONVERTERS
+            for converter in route.converters
+        ):
+            return UNCACHEABLE
+    placeholders = [get_placeholder(arg, index) for index, arg in enumerate(args)]
+    if None in placeholders:
+        return UNCACHEABLE
+    try:
+        url = reverse(url_name, args=placeholders)
+    except NoReverseMatch:
+        # The pattern may reject the placeholders but accept the real arguments
+        try:
+            reverse(url_name, args=args)
+        except NoReverseMatch:
+            return MISSING
+        return UNCACHEABLE
+    template = url.replace("{", "{{").replace("}", "}}")
+    for index, placeholder in enumerate(placeholders):
+        placeholder = quote(str(placeholder), safe=SAFE_CHARACTERS)
+        if template.count(placeholder) != 1:
+            return UNCACHEABLE
+        template = template.replace(placeholder, f"{{{index}}}")
+    return template
+
+
+def _get_cache(resolver):
+    """Return the cache for resolver, resetting it if the URLconf has changed."""
+    if _cache["resolver"] is not resolver:
+        _cache["resolver"] = resolver
+        _cache["templates"] = {}
+        _cache["fingerprint"] = None
+        _cache["routes"] = None
+    return _cache
+
+
+def get_route_template(url_name, args=()):
+    """Return the cached route template for url_name and the shape of args."""
+    resolver = get_resolver(get_urlconf())
+    key = (
+        url_name,
+        get_script_prefix(),
+        # i18n_patterns() prefix URLs with the active language
+        translation.get_language(),
+        tuple(type(arg) for arg in args),
+    )
+    with _lock:
+        templates = _get_cache(resolver)["templates"]
+        if key in templates:
+            return templates[key]
+    template = build_route_template(url_name, args)
+    with _lock:
+        if _cache["resolver"] is resolver:
+            templates[key] = template
+    return template
+
+
+def clear_route_templates():
+    """Forget every cached route template and the route index."""
+    with _lock:
+        _cache.update(resolver=None, templates={}, fingerprint=None, routes=None)
+
+
+def iter_url_patterns(patterns, prefix=""):
+    """Yield a description of every URL pattern, including included ones."""
+    for pattern in patterns:
+        if hasattr(pattern, "url_patterns"):
+            yield from iter_url_patterns(
+                pattern.url_patterns,
+                f"{prefix}{pattern.pattern}|{pattern.namespace}|",
+            )
+        else:
+            yield f"{prefix}{pattern.pattern}|{pattern.name}"
+
+
+def get_urlconf_fingerprint():
+    """
+    Return a hash of the current URLconf's patterns, which changes whenever a
+    URL is added, removed or renamed.
+    """
+    resolver = get_resolver(get_urlconf())
+    with _lock:
+        fingerprint = _get_cache(resolver)["fingerprint"]
+    if fingerprint is None:
+        patterns = "\n".join(iter_url_patterns(resolver.url_patterns))
+        fingerprint = hashlib.sha1(patterns.encode(), usedforsecurity=False).hexdigest()
+        with _lock:
+            if _cache["resolver"] is resolver:
+                _cache["fingerprint"] = fingerprint
+    return fingerprint
+
+
+def reverse_url(url_name, args=()):
+    """Reverse a URL name using its route template, or None if it doesn't exist."""
+    template = get_route_template(url_name, args)
+    if template is MISSING:
+        return None
+    if template is UNCACHEABLE:
+        try:
+            return reverse(url_name, args=args)
+        except NoReverseMatch:
+            return None
+    return template.format(*[quote(str(arg), safe=SAFE_CHARACTERS) for arg in args])
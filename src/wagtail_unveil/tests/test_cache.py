@@ -0,0 +1,134 @@
+import gzip
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from wagtail.contrib.redirects.models import Redirect
+
+from example_project.core.models import ExamplePageModelBasic
+from example_project.home.models import HomePage
+from wagtail_unveil.cache import CACHE_HIT, CACHE_MISS
+from wagtail_unveil.tests.utils import SHARED_CACHES
+
+
+@override_settings(WAGTAIL_UNVEIL_CACHE=True, CACHES=SHARED_CACHES)
+class ReportCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password123"
+        )
+        self.client.login(username="admin", password="password123")
+
+    def get_cache_status(self, slug):
+        response = self.client.get(f"/unveil/api/{slug}/")
+        self.assertEqual(response.status_code, 200)
+        return response["X-Unveil-Cache"]
+
+    def test_repeat_requests_are_served_from_cache(self):
+        self.assertEqual(self.get_cache_status("redirect"), CACHE_MISS)
+        with self.assertNumQueries(3):
+            # The session and user lookups, and the ETag aggregate query
+            self.assertEqual(self.get_cache_status("redirect"), CACHE_HIT)
+
+    def test_cached_results_match(self):
+        Redirect.objects.create(old_path="/old", redirect_link="/new")
+        response = self.client.get("/unveil/api/redirect/")
+        self.assertEqual(
+            self.client.get("/unveil/api/redirect/").json(), response.json()
+        )
+
+    def test_admin_report_uses_the_cache(self):
+        url = reverse("unveil_redirect_report:index")
+        self.assertEqual(self.client.get(url)["X-Unveil-Cache"], CACHE_MISS)
+        self.assertEqual(self.client.get(url)["X-Unveil-Cache"], CACHE_HIT)
+
+    def test_saving_invalidates_dependent_reports_only(self):
+        self.get_cache_status("redirect")
+        self.get_cache_status("site")
+        with self.captureOnCommitCallbacks(execute=True):
+            redirect = Redirect.objects.create(old_path="/old", redirect_link="/new")
+        self.assertEqual(self.get_cache_status("redirect"), CACHE_MISS)
+        self.assertEqual(self.get_cache_status("site"), CACHE_HIT)
+        self.assertIn("/old", str(self.client.get("/unveil/api/redirect/").json()))
+        with self.captureOnCommitCallbacks(execute=True):
+            redirect.delete()
+        self.assertEqual(self.get_cache_status("redirect"), CACHE_MISS)
+
+    def test_publishing_pages_invalidates_page_reports(self):
+        self.get_cache_status("page")
+        self.get_cache_status("redirect")
+        home = HomePage.objects.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            page = home.add_child(instance=ExamplePageModelBasic(title="Basic"))
+            page.save_revision().publish()
+        self.assertEqual(self.get_cache_status("page"), CACHE_MISS)
+        self.assertEqual(self.get_cache_status("redirect"), CACHE_HIT)
+
+    @override_settings(WAGTAIL_UNVEIL_CACHE=False)
+    def test_cache_disabled(self):
+        response = self.client.get("/unveil/api/redirect/")
+        self.assertNotIn("X-Unveil-Cache", response)
+
+
+@override_settings(WAGTAIL_UNVEIL_RESPONSE_CACHE=True, CACHES=SHARED_CACHES)
+class ResponseCacheTest(TestCase):
+    url = "/unveil/api/redirect/"
+
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password123"
+        )
+        self.client.login(username="admin", password="password123")
+
+    def test_cached_response_matches(self):
+        Redirect.objects.create(old_path="/old", redirect_link="/new")
+        with override_settings(WAGTAIL_UNVEIL_RESPONSE_CACHE=False):
+            expected = self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response["ETag"], expected["ETag"])
+        self.assertEqual(response["Content-Length"], str(len(expected.content)))
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertNotIn("Content-Encoding", response)
+        # The session and user lookups, and the ETag aggregate query
+        with self.assertNumQueries(3):
+            self.assertEqual(self.client.get(self.url).content, expected.content)
+
+    def test_compressed_response(self):
+        expected = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(gzip.decompress(response.content), expected.content)
+        self.assertEqual(response["ETag"], f"W/{expected['ETag']}")
+        response = self.client.get(
+            self.url,
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_changes_are_not_served_from_the_cache(self):
+        self.client.get(self.url)
+        Redirect.objects.create(old_path="/old", redirect_link="/new")
+        self.assertIn(b"/old", self.client.get(self.url).content)
+
+    def test_unpublished_pages_are_not_served_from_the_cache(self):
+        home = HomePage.objects.get()
+        page = home.add_child(instance=ExamplePageModelBasic(title="Basic"))
+        url = "/unveil/api/page/"
+        self.assertIn(b"(Basic)", self.client.get(url).content)
+        # The count and publishing times of pages stay the same
+        with self.captureOnCommitCallbacks(execute=True):
+            page.unpublish()
+        self.assertNotIn(b"(Basic)", self.client.get(url).content)
+
+    def test_formats_are_cached_separately(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url, {"format": "columns"})
+        self.assertIn("columns", response.json())
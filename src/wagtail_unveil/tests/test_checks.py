@@ -0,0 +1,312 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+
+import requests
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from wagtail.contrib.redirects.models import Redirect
+
+from wagtail_unveil.checks import (
+    RUN_CHECKS_TIMEOUT,
+    check_urls,
+    check_urls_in_process,
+    get_check_user,
+    thread_sessions,
+)
+
+
+class ExampleHandler(BaseHTTPRequestHandler):
+    """Responds with the status at the start of the path, e.g. /404/page/."""
+
+    attempts = {}
+    cookies = []
+
+    def respond(self):
+        self.cookies.append(self.headers.get("Cookie"))
+        first = self.path.strip("/").split("/")[0]
+        if first == "slow":
+            time.sleep(0.5)
+        if first == "flaky":
+            # Fails the first time, succeeds the second time
+            count = self.attempts[self.path] = self.attempts.get(self.path, 0) + 1
+            first = "503" if count == 1 else "200"
+        if first == "get-only" and self.command == "HEAD":
+            first = "405"
+        status = int(first) if first.isdigit() else 200
+        body = b"x" * 1000 if first == "body" else b""
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command == "GET":
+            self.wfile.write(body)
+
+    do_GET = do_HEAD = respond
+
+    def log_message(self, *args):
+        pass
+
+
+class ServerMixin:
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ExampleHandler)
+        cls.server_url = f"http://127.0.0.1:{cls.server.server_port}"
+        thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        ExampleHandler.attempts.clear()
+        ExampleHandler.cookies.clear()
+
+
+class CheckUrlsTest(ServerMixin, SimpleTestCase):
+    def check(self, paths, **kwargs):
+        kwargs.setdefault("backoff", 0)
+        results = check_urls([f"{self.server_url}{path}" for path in paths], **kwargs)
+        return {result.url[len(self.server_url) :]: result for result in results}
+
+    def test_statuses(self):
+        results = self.check(["/200/", "/404/"], retries=0)
+        self.assertEqual(results["/200/"].status, 200)
+        self.assertTrue(results["/200/"].ok)
+        self.assertEqual(results["/404/"].status, 404)
+        self.assertFalse(results["/404/"].ok)
+        self.assertEqual(results["/404/"].attempts, 1)
+
+    def test_retries(self):
+        results = self.check(["/flaky/", "/500/"], retries=2)
+        self.assertEqual(results["/flaky/"].status, 200)
+        self.assertEqual(results["/flaky/"].attempts, 2)
+        self.assertEqual(results["/500/"].status, 500)
+        self.assertEqual(results["/500/"].attempts, 3)
+
+    def test_timeout(self):
+        results = self.check(["/slow/"], timeout=0.1, retries=1)
+        self.assertIsNone(results["/slow/"].status)
+        self.assertTrue(results["/slow/"].error)
+        self.assertEqual(results["/slow/"].attempts, 2)
+
+    def test_connection_error(self):
+        result = next(check_urls(["http://127.0.0.1:9/"], retries=0))
+        self.assertIsNone(result.status)
+        self.assertFalse(result.ok)
+
+    def test_metrics(self):
+        results = self.check(["/body/"], method="GET")
+        self.assertEqual(results["/body/"].size, 1000)
+        self.assertIsNotNone(results["/body/"].ttfb)
+        self.assertLessEqual(results["/body/"].ttfb, results["/body/"].elapsed)
+        # Queries are only counted in process
+        self.assertIsNone(results["/body/"].queries)
+        self.assertIsNone(results["/body/"].to_dict()["db_time"])
+
+    def test_head_size(self):
+        results = self.check(["/body/"])
+        self.assertEqual(results["/body/"].size, 1000)
+
+    def test_head_not_allowed(self):
+        results = self.check(["/get-only/"])
+        self.assertEqual(results["/get-only/"].status, 200)
+
+    def test_concurrency(self):
+        paths = [f"/slow/{i}/" for i in range(8)]
+        start = time.perf_counter()
+        results = self.check(paths, workers=8)
+        self.assertEqual(len(results), 8)
+        # The requests ran at the same time rather than one after the other
+        self.assertLess(time.perf_counter() - start, 2)
+
+    def test_headers(self):
+        self.check(["/200/"], headers={"Cookie": "sessionid=abc"})
+        self.assertEqual(ExampleHandler.cookies, ["sessionid=abc"])
+
+    def test_thread_sessions(self):
+        with mock.patch.object(requests.Session, "close") as close:
+            with thread_sessions(2) as get_session:
+                session = get_session()
+                self.assertIs(get_session(), session)
+                # Each thread has its own session
+                other = []
+                thread = threading.Thread(target=lambda: other.append(get_session()))
+                thread.start()
+                thread.join()
+                self.assertIsNot(other[0], session)
+                close.assert_not_called()
+            self.assertEqual(close.call_count, 2)
+
+
+class CheckCommandTest(ServerMixin, TestCase):
+    def test_output(self):
+        stdout = StringIO()
+        call_command(
+            "unveil_check", reports="site", base_url=self.server_url, stdout=stdout
+        )
+        self.assertIn(f"200 {self.server_url}/admin/sites/", stdout.getvalue())
+        self.assertIn("0 failed", stdout.getvalue())
+
+    def test_failures(self):
+        stdout = StringIO()
+        with self.assertRaisesMessage(CommandError, "0 OK"):
+            call_command(
+                "unveil_check",
+                reports="site",
+                base_url=f"{self.server_url}/404",
+                retries=0,
+                format="ndjson",
+                stdout=stdout,
+            )
+        self.assertIn('"status": 404', stdout.getvalue())
+
+    def test_invalid_header(self):
+        with self.assertRaisesMessage(CommandError, "Invalid header"):
+            call_command("unveil_check", reports="site", header=["nope"])
+
+
+class RunChecksViewTest(ServerMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        User = get_user_model()
+        self.user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password123"
+        )
+        self.client.login(username="admin", password="password123")
+        self.user.refresh_from_db()
+        Redirect.objects.create(old_path="/old", redirect_link="/new")
+
+    @override_settings(WAGTAIL_UNVEIL_CHECK_IN_PROCESS=False)
+    def test_checks_the_page(self):
+        with override_settings(WAGTAIL_UNVEIL_BASE_URL=self.server_url):
+            response = self.client.post("/admin/unveil/redirect-report/")
+            entries = self.client.get("/unveil/api/redirect/").json()["results"]
+        results = response.json()["results"]
+        self.assertEqual(
+            sorted(result["url"] for result in results),
+            sorted(entry["url"] for entry in entries),
+        )
+        self.assertTrue(all(result["ok"] for result in results))
+        self.assertTrue(all(result["ttfb"] is not None for result in results))
+        # The session isn't sent to other hosts
+        self.assertEqual(set(ExampleHandler.cookies), {None})
+
+    @override_settings(
+        WAGTAIL_UNVEIL_CHECK_IN_PROCESS=False,
+        WAGTAIL_UNVEIL_CHECK_TIMEOUT=10,
+        WAGTAIL_UNVEIL_CHECK_RETRIES=2,
+    )
+    def test_short_timeout_without_retries(self):
+        with mock.patch(
+            "wagtail_unveil.viewsets.base.check_urls", wraps=check_urls
+        ) as check:
+            self.client.post("/admin/unveil/redirect-report/")
+        self.assertTrue(check.call_args_list)
+        for call in check.call_args_list:
+            self.assertEqual(call.kwargs["timeout"], RUN_CHECKS_TIMEOUT)
+            self.assertEqual(call.kwargs["retries"], 0)
+
+    def test_in_process_by_default(self):
+        last_login = self.user.last_login
+        response = self.client.post("/admin/unveil/redirect-report/")
+        results = response.json()["results"]
+        self.assertTrue(results)
+        self.assertTrue(all(result["ok"] for result in results))
+        self.assertTrue(all(result["queries"] > 0 for result in results))
+        self.assertEqual(ExampleHandler.cookies, [])
+        # The checks reuse the admin's session instead of logging in again
+        self.assertEqual(Session.objects.count(), 1)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_login, last_login)
+
+    @override_settings(ALLOWED_HOSTS=["*"], WAGTAIL_UNVEIL_CHECK_IN_PROCESS=False)
+    def test_session_is_sent_to_this_site(self):
+        with override_settings(WAGTAIL_UNVEIL_BASE_URL=self.server_url):
+            self.client.post(
+                "/admin/unveil/redirect-report/",
+                HTTP_HOST=self.server_url.split("//")[1],
+            )
+        self.assertTrue(ExampleHandler.cookies)
+        self.assertTrue(
+            all("sessionid=" in cookie for cookie in ExampleHandler.cookies)
+        )
+
+
+class InProcessCheckTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password123"
+        )
+        self.redirect = Redirect.objects.create(old_path="/old", redirect_link="/new")
+
+    def test_admin_urls(self):
+        urls = [
+            "http://localhost:8000/admin/redirects/",
+            f"http://localhost:8000/admin/redirects/{self.redirect.pk}/",
+            "http://localhost:8000/admin/redirects/0/",
+        ]
+        results = list(check_urls_in_process(urls, self.user))
+        self.assertEqual([result.status for result in results], [200, 200, 404])
+        self.assertGreater(results[0].size, 0)
+        self.assertGreater(results[0].elapsed, 0)
+        self.assertLessEqual(results[0].ttfb, results[0].elapsed)
+        self.assertGreater(results[0].queries, 0)
+        self.assertGreater(results[0].db_time, 0)
+        # The session the checks logged in with is deleted
+        self.assertFalse(Session.objects.exists())
+
+    def test_anonymous(self):
+        # Admin views redirect to the login page
+        result = next(check_urls_in_process(["http://localhost:8000/admin/redirects/"]))
+        self.assertEqual(result.status, 200)
+
+    def test_check_user(self):
+        self.assertIsNone(get_check_user())
+        with override_settings(WAGTAIL_UNVEIL_CHECK_USER="admin"):
+            self.assertEqual(get_check_user(), self.user)
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command(
+            "unveil_check",
+            reports="redirect",
+            in_process=True,
+            user="admin",
+            stdout=stdout,
+        )
+        self.assertIn("200 http://localhost:8000/admin/redirects/ ", stdout.getvalue())
+        self.assertIn("0 failed", stdout.getvalue())
+
+    def test_unknown_user(self):
+        with self.assertRaisesMessage(CommandError, "The check user doesn't exist."):
+            call_command(
+                "unveil_check", reports="redirect", in_process=True, user="nobody"
+            )
+
+    def test_sort_slowest(self):
+        stdout = StringIO()
+        call_command(
+            "unveil_check",
+            reports="redirect",
+            in_process=True,
+            user="admin",
+            format="ndjson",
+            sort="slowest",
+            stdout=stdout,
+        )
+        results = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertGreater(len(results), 1)
+        elapsed = [result["elapsed"] for result in results]
+        self.assertEqual(elapsed, sorted(elapsed, reverse=True))
+        self.assertTrue(all(result["queries"] is not None for result in results))
@@ -0,0 +1,134 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import path
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.models import Site
+
+from example_project.core.models import ExamplePageModelBasic
+from example_project.home.models import HomePage
+from example_project.urls import urlpatterns as example_urlpatterns
+from wagtail_unveil.conditional import get_report_validators
+from wagtail_unveil.providers import UnveilProvider
+from wagtail_unveil.routes import get_urlconf_fingerprint
+from wagtail_unveil.tests.utils import SHARED_CACHES
+
+
+def example_view(request):
+    pass
+
+
+urlpatterns = [*example_urlpatterns, path("example/", example_view, name="example")]
+
+
+class ExampleUserProvider(UnveilProvider):
+    slug = "example-user"
+    model = get_user_model()
+
+    def get_last_modified_fields(self, model):
+        return ["date_joined"]
+
+
+class ExampleSiteProvider(UnveilProvider):
+    slug = "example-site"
+    model = Site
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class ConditionalGetTest(TestCase):
+    url = "/unveil/api/redirect/"
+
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password123"
+        )
+        self.client.login(username="admin", password="password123")
+
+    def test_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        # The session and user lookups, then the redirect aggregates
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_no_etags_without_a_shared_cache(self):
+        # Other processes wouldn't see the report versions replaced here
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+    def test_changes_modify_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        redirect = Redirect.objects.create(old_path="/old", redirect_link="/new")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        etag = response["ETag"]
+        redirect.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def assertModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        return response["ETag"]
+
+    def test_unpublishing_and_moving_pages_modify_the_etag(self):
+        home = HomePage.objects.get()
+        page = home.add_child(instance=ExamplePageModelBasic(title="Basic"))
+        other_page = home.add_child(instance=ExamplePageModelBasic(title="Other"))
+        url = "/unveil/api/page/"
+        etag = self.client.get(url)["ETag"]
+        # Neither changes the count, highest primary key or publishing times
+        with self.captureOnCommitCallbacks(execute=True):
+            page.unpublish()
+        etag = self.assertModified(url, etag)
+        with self.captureOnCommitCallbacks(execute=True):
+            other_page.move(page, pos="last-child")
+        self.assertModified(url, etag)
+
+    def test_renaming_modifies_the_etag(self):
+        # Sites have no modification times, but their name is in the report
+        url = "/unveil/api/site/"
+        etag = self.client.get(url)["ETag"]
+        site = Site.objects.get()
+        site.site_name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            site.save()
+        self.assertModified(url, etag)
+
+    def test_parameters_modify_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.assertNotEqual(
+            self.client.get(self.url, {"format": "ndjson"})["ETag"], etag
+        )
+        self.assertEqual(self.client.get(self.url, {"token": "abc"})["ETag"], etag)
+
+    def test_other_reports_have_other_etags(self):
+        self.assertNotEqual(
+            self.client.get(self.url)["ETag"],
+            self.client.get("/unveil/api/site/")["ETag"],
+        )
+
+    def test_urlconf_changes_modify_the_etag(self):
+        fingerprint = get_urlconf_fingerprint()
+        self.assertEqual(get_urlconf_fingerprint(), fingerprint)
+        with override_settings(ROOT_URLCONF=__name__):
+            self.assertNotEqual(get_urlconf_fingerprint(), fingerprint)
+
+    def test_last_modified(self):
+        provider = ExampleUserProvider()
+        _etag, last_modified = get_report_validators(provider, "http://testserver", 1)
+        self.assertIsNotNone(last_modified)
+        # Sites have no modification times
+        _etag, last_modified = get_report_validators(
+            ExampleSiteProvider(), "http://testserver", 1
+        )
+        self.assertIsNone(last_modified)
@@ -0,0 +1,181 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from wagtail.contrib.redirects.models import Redirect
+
+from example_project.core.models import ExamplePageModelBasic
+from example_project.home.models import HomePage
+from wagtail_unveil.filters import UrlFilter, parse_pk_range
+from wagtail_unveil.providers import get_providers
+
+
+class UrlFilterTest(TestCase):
+    def test_from_params(self):
+        url_filter = UrlFilter.from_params(
+            QueryDict("model=home.HomePage,core.ExamplePageModelBasic&url_type=view")
+        )
+        self.assertEqual(
+            url_filter.models, {"home.homepage", "core.examplepagemodelbasic"}
+        )
+        self.assertEqual(url_filter.url_types, {"view"})
+        self.assertIsNone(UrlFilter.from_params(QueryDict("format=json")))
+
+    def test_parse_pk_range(self):
+        self.assertEqual(parse_pk_range("1-100"), (1, 100))
+        self.assertEqual(parse_pk_range("100-"), (100, None))
+        self.assertEqual(parse_pk_range("-100"), (None, 100))
+        self.assertEqual(parse_pk_range("7"), (7, 7))
+        for value in ["-", "a-b", "10-1"]:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_pk_range(value)
+
+
+@override_settings(
+    WAGTAIL_UNVEIL_JSON_TOKEN="test_token_123", WAGTAIL_UNVEIL_MAX_INSTANCES=10
+)
+class FilteredReportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.home = HomePage.objects.get()
+        cls.pages = [
+            cls.home.add_child(instance=ExamplePageModelBasic(title=f"Basic {i}"))
+            for i in range(3)
+        ]
+        cls.redirects = [
+            Redirect.objects.create(old_path=f"/old-{i}", redirect_link="/new")
+            for i in range(3)
+        ]
+
+    def get_results(self, slug, **params):
+        response = self.client.get(
+            f"/unveil/api/{slug}/", {"token": "test_token_123", **params}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def get_urls(self, slug, **params):
+        return [
+            (item["model_name"], item["url_type"], item["url"])
+            for item in self.get_results(slug, **params)
+        ]
+
+    def test_url_type(self):
+        results = self.get_results("redirect", url_type="edit")
+        self.assertEqual({item["url_type"] for item in results}, {"edit"})
+        self.assertEqual(len(results), 3)
+
+    def test_page_views_dont_reverse_admin_urls(self):
+        with mock.patch(
+            "wagtail_unveil.providers.reverse_url", side_effect=AssertionError
+        ) as reverse_url:
+            results = self.get_results("page", url_type="view")
+        reverse_url.assert_not_called()
+        self.assertEqual({item["url_type"] for item in results}, {"view"})
+        self.assertIn("http://localhost:8000/basic-0/", [r["url"] for r in results])
+
+    def test_model(self):
+        results = self.get_results("page", model="home.HomePage")
+        self.assertTrue(results)
+        self.assertTrue(
+            all(item["model_name"].startswith("home.HomePage") for item in results),
+            results,
+        )
+
+    def test_model_only_samples_its_pages(self):
+        provider = get_providers()["page"].with_filter(
+            UrlFilter(models=frozenset(["home.homepage"]))
+        )
+        context = provider.get_context("http://testserver", 10)
+        self.assertEqual(context["pages"].models, [HomePage])
+
+    def test_app_label(self):
+        results = self.get_results("page", app_label="core", url_type="edit")
+        self.assertEqual(len(results), 3)
+
+    def test_pk_range(self):
+        pks = [redirect.pk for redirect in self.redirects]
+        results = self.get_results("redirect", pk_range=f"{pks[1]}-")
+        # Only the instance URLs of the redirects in the range
+        self.assertEqual(len(results), 4)
+        self.assertNotIn("/old-0", str(results))
+
+    def test_all_reports(self):
+        response = self.client.get(
+            "/unveil/api/all/",
+            {"token": "test_token_123", "reports": "page,redirect", "url_type": "edit"},
+        )
+        for results in response.json()["results"].values():
+            self.assertEqual({item["url_type"] for item in results}, {"edit"})
+
+    def test_invalid_filter(self):
+        response = self.client.get(
+            "/unveil/api/redirect/", {"token": "test_token_123", "pk_range": "x"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_paginated(self):
+        results = self.get_results("redirect", url_type="edit,delete")
+        response = self.client.get(
+            "/unveil/api/redirect/",
+            {"token": "test_token_123", "url_type": "edit,delete", "limit": 4},
+        )
+        paged = response.json()["results"]
+        while response.json()["next"]:
+            response = self.client.get(response.json()["next"])
+            paged += response.json()["results"]
+        self.assertEqual(paged, results)
+
+    @override_settings(WAGTAIL_UNVEIL_INVENTORY=True)
+    def test_inventory(self):
+        call_command("unveil_refresh", reports="page,redirect", stdout=StringIO())
+        pks = [redirect.pk for redirect in self.redirects]
+        for params in [
+            {"url_type": "edit"},
+            {"model": "wagtailredirects.redirect"},
+            {"pk_range": f"{pks[1]}-"},
+        ]:
+            with (
+                self.subTest(params=params),
+                override_settings(WAGTAIL_UNVEIL_INVENTORY=False),
+            ):
+                expected = self.get_urls("redirect", **params)
+            # Inventory entries are numbered by their position in the report
+            with self.subTest(params=params):
+                self.assertEqual(self.get_urls("redirect", **params), expected)
+        self.assertEqual(
+            len(self.get_results("page", app_label="core", url_type="view")), 3
+        )
+
+
+class FilteredAdminReportTest(TestCase):
+    url = "/admin/unveil/redirect-report/"
+
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password123"
+        )
+        self.client.login(username="admin", password="password123")
+        Redirect.objects.create(old_path="/old", redirect_link="/new")
+
+    def test_filter_form(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, 'name="url_type"')
+        self.assertContains(response, 'value="wagtailredirects.redirect"')
+        self.assertContains(response, 'name="pk_range"')
+
+    def test_filtered_report(self):
+        response = self.client.get(self.url, {"url_type": "delete"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {entry.url_type for entry in response.context["object_list"]}, {"delete"}
+        )
+
+    def test_invalid_pk_range(self):
+        response = self.client.get(self.url, {"pk_range": "x"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Enter a range like")
@@ -0,0 +1,98 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from wagtail.contrib.forms.models import FormSubmission
+
+from example_project.for_forms.models import ExampleFormPage
+from example_project.home.models import HomePage
+from wagtail_unveil.pagination import decode_cursor, paginate_urls
+from wagtail_unveil.viewsets.form_report import (
+    UnveilFormProvider,
+    get_form_pages_queryset,
+)
+
+
+class FormReportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.home = HomePage.objects.get()
+        cls.form_pages = []
+        for i in range(3):
+            form_page = cls.home.add_child(instance=ExampleFormPage(title=f"Form {i}"))
+            for j in range(i + 1):
+                FormSubmission.objects.create(page=form_page, form_data={"j": j})
+            cls.form_pages.append(form_page)
+        # Form pages without submissions aren't reported
+        cls.home.add_child(instance=ExampleFormPage(title="Empty form"))
+
+    def test_form_pages_with_submissions(self):
+        pages = get_form_pages_queryset()
+        self.assertEqual(
+            [(page.pk, page.title, page.submission_count) for page in pages],
+            [
+                (form_page.pk, form_page.title, i + 1)
+                for i, form_page in enumerate(self.form_pages)
+            ],
+        )
+
+    def test_max_instances(self):
+        with self.assertNumQueries(1):
+            pages = list(get_form_pages_queryset(2))
+        self.assertEqual(
+            [page.pk for page in pages], [p.pk for p in self.form_pages[:2]]
+        )
+
+    def test_form_urls(self):
+        form_page = self.form_pages[0]
+        urls = UnveilFormProvider().get_urls("http://testserver", 1)
+        self.assertEqual(
+            urls,
+            [
+                (
+                    "wagtailforms.FormSubmission",
+                    "forms_index",
+                    "http://testserver/admin/forms/",
+                ),
+                (
+                    "wagtailforms.FormSubmission (Form 0)",
+                    "list_submissions",
+                    f"http://testserver/admin/forms/submissions/{form_page.pk}/",
+                ),
+                (
+                    "wagtailforms.FormSubmission (Form 0)",
+                    "delete_submissions",
+                    f"http://testserver/admin/forms/submissions/{form_page.pk}/delete/",
+                ),
+                (
+                    "wagtailforms.FormSubmission (Form 0)",
+                    "frontend_form",
+                    f"http://testserver{form_page.url}",
+                ),
+            ],
+        )
+
+    def test_query_count_doesnt_grow_with_form_pages(self):
+        provider = UnveilFormProvider()
+        # Warm the cached site root paths used for frontend URLs
+        provider.get_urls("http://testserver", 0)
+        with CaptureQueriesContext(connection) as queries:
+            urls = provider.get_urls("http://testserver", 1)
+        self.assertEqual(len(queries), 1)
+        with self.assertNumQueries(1):
+            all_urls = provider.get_urls("http://testserver", 0)
+        self.assertEqual(len(all_urls), len(urls) + 3 * (len(self.form_pages) - 1))
+
+    def test_resume_filters_by_primary_key(self):
+        provider = UnveilFormProvider()
+        urls = provider.get_urls("http://testserver", 0)
+        # The index URL and the URLs of the first form page
+        entries, cursor = paginate_urls(provider, "http://testserver", 0, 4)
+        position, _next_id = decode_cursor("form", cursor)
+        self.assertEqual(position.after, self.form_pages[0].pk)
+        with self.assertNumQueries(1):
+            rest, cursor = paginate_urls(provider, "http://testserver", 0, 100, cursor)
+        self.assertIsNone(cursor)
+        self.assertEqual(
+            [(entry.model_name, entry.url_type, entry.url) for entry in entries + rest],
+            urls,
+        )
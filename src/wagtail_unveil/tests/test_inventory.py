@@ -0,0 +1,319 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import JsonResponse
+from django.test import TestCase, override_settings
+from wagtail.contrib.redirects.models import Redirect
+
+from example_project.core.models import ExamplePageModelBasic
+from example_project.home.models import HomePage
+from wagtail_unveil.inventory import refresh_report
+from wagtail_unveil.models import UnveilInventoryRefresh, UnveilUrlRecord
+from wagtail_unveil.providers import get_providers
+from wagtail_unveil.reports import get_all_reports
+from wagtail_unveil.tests.utils import SHARED_CACHES
+
+
+def response_content(data):
+    return JsonResponse(data).content
+
+
+class RefreshTest(TestCase):
+    def setUp(self):
+        self.provider = get_providers()["redirect"]
+        self.redirect = Redirect.objects.create(old_path="/old", redirect_link="/new")
+
+    def get_urls(self):
+        return [
+            (record.model_name, record.url_type, record.url)
+            for record in UnveilUrlRecord.objects.filter(provider="redirect")
+        ]
+
+    def test_refresh_stores_the_report(self):
+        count, removed, _duration = refresh_report(
+            self.provider, "http://testserver", 1
+        )
+        urls = self.provider.get_urls("http://testserver", 1)
+        self.assertEqual(count, len(urls))
+        self.assertEqual(removed, 0)
+        self.assertEqual(sorted(self.get_urls()), sorted(urls))
+        record = UnveilUrlRecord.objects.get(provider="redirect", url_type="edit")
+        self.assertEqual(record.model_label, "wagtailredirects.Redirect")
+        self.assertEqual(record.object_pk, str(self.redirect.pk))
+
+    def test_refresh_updates_existing_records(self):
+        refresh_report(self.provider, "http://testserver", 1, batch_size=2)
+        records = {
+            record.content_hash: record
+            for record in UnveilUrlRecord.objects.filter(provider="redirect")
+        }
+        count, removed, _duration = refresh_report(
+            self.provider, "http://testserver", 1, batch_size=2
+        )
+        self.assertEqual(count, len(records))
+        self.assertEqual(removed, 0)
+        for record in UnveilUrlRecord.objects.filter(provider="redirect"):
+            self.assertEqual(record.created_at, records[record.content_hash].created_at)
+            self.assertGreater(
+                record.updated_at, records[record.content_hash].updated_at
+            )
+
+    def test_upsert_without_conflict_target(self):
+        refresh_report(self.provider, "http://testserver", 1)
+        with (
+            mock.patch.object(
+                UnveilUrlRecord.objects, "bulk_create"
+            ) as bulk_create_mock,
+            mock.patch.object(
+                type(connection.features),
+                "supports_update_conflicts_with_target",
+                False,
+            ),
+        ):
+            refresh_report(self.provider, "http://testserver", 1)
+        self.assertIsNone(bulk_create_mock.call_args.kwargs["unique_fields"])
+
+    def test_refresh_removes_stale_records(self):
+        refresh_report(self.provider, "http://testserver", 1)
+        self.redirect.delete()
+        _count, removed, _duration = refresh_report(
+            self.provider, "http://testserver", 1
+        )
+        self.assertEqual(removed, 2)
+        self.assertNotIn("edit", [url_type for _m, url_type, _u in self.get_urls()])
+
+    def test_other_reports_are_left_alone(self):
+        refresh_report(get_providers()["site"], "http://testserver", 1)
+        refresh_report(self.provider, "http://testserver", 1)
+        self.assertTrue(UnveilUrlRecord.objects.filter(provider="site").exists())
+
+
+@override_settings(
+    WAGTAIL_UNVEIL_INVENTORY=True,
+    WAGTAIL_UNVEIL_JSON_TOKEN="test_token_123",
+    CACHES=SHARED_CACHES,
+)
+class InventoryViewsTest(TestCase):
+    url = "/unveil/api/redirect/"
+
+    def setUp(self):
+        Redirect.objects.create(old_path="/old", redirect_link="/new")
+        call_command("unveil_refresh", stdout=StringIO())
+
+    def test_api_reads_the_inventory(self):
+        expected = self.client.get(self.url, {"token": "test_token_123"}).json()
+        self.assertEqual(
+            [(item["model_name"], item["url_type"]) for item in expected["results"]][
+                -2:
+            ],
+            [
+                ("wagtail.Redirect (/old)", "edit"),
+                ("wagtail.Redirect (/old)", "delete"),
+            ],
+        )
+        # New redirects only appear after the next refresh
+        Redirect.objects.create(old_path="/other", redirect_link="/new")
+        response = self.client.get(self.url, {"token": "test_token_123"})
+        self.assertEqual(response.json(), expected)
+        # The inventory aggregate for the ETag, then the records
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                self.url, {"token": "test_token_123", "stream": "1"}
+            )
+            content = b"".join(response.streaming_content)
+        self.assertEqual(content, response_content(expected))
+
+    def test_etag_changes_on_refresh(self):
+        etag = self.client.get(self.url, {"token": "test_token_123"})["ETag"]
+        response = self.client.get(
+            self.url, {"token": "test_token_123"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+        Redirect.objects.create(old_path="/other", redirect_link="/new")
+        call_command("unveil_refresh", reports="redirect", stdout=StringIO())
+        response = self.client.get(
+            self.url, {"token": "test_token_123"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_api_pagination(self):
+        results = self.client.get(self.url, {"token": "test_token_123"}).json()[
+            "results"
+        ]
+        response = self.client.get(self.url, {"token": "test_token_123", "limit": 2})
+        paged = response.json()["results"]
+        while response.json()["next"]:
+            response = self.client.get(response.json()["next"])
+            paged += response.json()["results"]
+        self.assertEqual(paged, results)
+
+    def test_admin_report_reads_the_inventory(self):
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password123"
+        )
+        self.client.login(username="admin", password="password123")
+        response = self.client.get("/admin/unveil/redirect-report/")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "http://localhost:8000/admin/redirects/")
+
+    def test_all_reports(self):
+        reports = get_all_reports(slugs=["redirect"])
+        self.assertEqual(
+            [entry.url for entry in reports["redirect"]],
+            list(
+                UnveilUrlRecord.objects.filter(provider="redirect")
+                .order_by("position")
+                .values_list("url", flat=True)
+            ),
+        )
+
+
+@override_settings(WAGTAIL_UNVEIL_INVENTORY_SIGNALS=True)
+class InventorySignalsTest(TestCase):
+    def setUp(self):
+        self.home = HomePage.objects.get()
+        self.section = self.home.add_child(
+            instance=ExamplePageModelBasic(title="Section", slug="section")
+        )
+        self.child = self.section.add_child(
+            instance=ExamplePageModelBasic(title="Child", slug="child")
+        )
+        self.other = self.home.add_child(
+            instance=ExamplePageModelBasic(title="Other", slug="other")
+        )
+        call_command("unveil_refresh", max_instances=0, stdout=StringIO())
+
+    def get_records(self, provider, instance):
+        return UnveilUrlRecord.objects.filter(
+            provider=provider,
+            model_label=instance._meta.label,
+            object_pk=str(instance.pk),
+        ).order_by("position")
+
+    def test_new_objects_are_added(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            redirect = Redirect.objects.create(old_path="/old", redirect_link="/new")
+        records = self.get_records("redirect", redirect)
+        self.assertEqual([record.url_type for record in records], ["edit", "delete"])
+        self.assertEqual(
+            records.first().position,
+            UnveilUrlRecord.objects.filter(provider="redirect").count() - 1,
+        )
+
+    def test_changed_objects_are_updated(self):
+        records = self.get_records("page", self.other)
+        positions = [record.position for record in records]
+        self.other.title = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.save_revision().publish()
+        records = self.get_records("page", self.other)
+        self.assertEqual([record.position for record in records], positions)
+        self.assertTrue(
+            all("(Renamed)" in record.model_name for record in records), records
+        )
+
+    def test_unpublished_and_deleted_objects_are_removed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.unpublish()
+        self.assertFalse(self.get_records("page", self.other).exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.section.delete()
+        self.assertFalse(self.get_records("page", self.section).exists())
+        self.assertFalse(self.get_records("page", self.child).exists())
+
+    def test_moved_pages_and_descendants_are_updated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.section.move(self.other, pos="last-child")
+        view_urls = UnveilUrlRecord.objects.filter(
+            provider="page", url_type="view"
+        ).values_list("url", flat=True)
+        self.assertIn("http://localhost:8000/other/section/", view_urls)
+        self.assertIn("http://localhost:8000/other/section/child/", view_urls)
+        self.assertNotIn("http://localhost:8000/section/child/", view_urls)
+
+    def test_only_the_changed_object_is_rebuilt(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            Redirect.objects.create(old_path="/old", redirect_link="/new")
+        # The refresh options, then in a savepoint: the existing positions, the
+        # redirect, the last position, the upsert and the stale records
+        with self.assertNumQueries(8):
+            for callback in callbacks:
+                callback()
+
+    def get_urls(self, provider):
+        return set(
+            UnveilUrlRecord.objects.filter(provider=provider).values_list(
+                "model_name", "url_type", "url"
+            )
+        )
+
+    def test_limited_inventory_matches_a_refresh(self):
+        call_command("unveil_refresh", max_instances=1, stdout=StringIO())
+        with self.captureOnCommitCallbacks(execute=True):
+            for slug in ["new-1", "new-2", "new-3"]:
+                self.home.add_child(
+                    instance=ExamplePageModelBasic(title=slug, slug=slug)
+                )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.title = "Renamed"
+            self.other.save_revision().publish()
+        urls = self.get_urls("page")
+        call_command("unveil_refresh", max_instances=1, stdout=StringIO())
+        self.assertEqual(urls, self.get_urls("page"))
+
+        # The next page in path order enters the sample
+        with self.captureOnCommitCallbacks(execute=True):
+            self.section.delete()
+        urls = self.get_urls("page")
+        self.assertIn("http://localhost:8000/other/", {url for *_, url in urls})
+        call_command("unveil_refresh", max_instances=1, stdout=StringIO())
+        self.assertEqual(urls, self.get_urls("page"))
+
+    def test_refresh_base_url_is_reused(self):
+        call_command(
+            "unveil_refresh",
+            max_instances=0,
+            base_url="https://example.com",
+            stdout=StringIO(),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            redirect = Redirect.objects.create(old_path="/old", redirect_link="/new")
+        self.assertTrue(
+            all(
+                record.url.startswith("https://example.com/")
+                for record in self.get_records("redirect", redirect)
+            )
+        )
+
+    def test_reports_never_refreshed_are_skipped(self):
+        UnveilInventoryRefresh.objects.filter(provider="redirect").delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            redirect = Redirect.objects.create(old_path="/old", redirect_link="/new")
+        self.assertFalse(self.get_records("redirect", redirect).exists())
+
+    @override_settings(WAGTAIL_UNVEIL_INVENTORY_SIGNALS=False)
+    def test_disabled(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            redirect = Redirect.objects.create(old_path="/old", redirect_link="/new")
+        self.assertFalse(self.get_records("redirect", redirect).exists())
+
+
+class RefreshCommandTest(TestCase):
+    def test_output(self):
+        stdout = StringIO()
+        call_command("unveil_refresh", reports="site,user", stdout=stdout)
+        self.assertIn("site: ", stdout.getvalue())
+        self.assertIn("user: ", stdout.getvalue())
+        self.assertNotIn("page: ", stdout.getvalue())
+        self.assertEqual(
+            set(UnveilUrlRecord.objects.values_list("provider", flat=True)),
+            {"site", "user"},
+        )
+
+    def test_unknown_reports(self):
+        with self.assertRaisesMessage(CommandError, "Unknown reports: nope"):
+            call_command("unveil_refresh", reports="nope", stdout=StringIO())
@@ -0,0 +1,60 @@
+import pickle
+
+from django.test import SimpleTestCase
+
+from wagtail_unveil.models import BASE_URLS, UrlEntry, make_entries
+
+
+class UrlEntryTest(SimpleTestCase):
+    def test_url(self):
+        entry = UrlEntry(1, "wagtail.Site", "edit", "http://localhost:8000/admin/")
+        self.assertEqual(entry.url, "http://localhost:8000/admin/")
+        self.assertEqual(BASE_URLS[entry.base_index], "http://localhost:8000")
+        self.assertEqual(entry.path, "/admin/")
+        for url in ["", "/admin/", "http://localhost:8000", "https://example.com/"]:
+            with self.subTest(url=url):
+                self.assertEqual(UrlEntry(url=url).url, url)
+        entry.url = "https://example.com/"
+        self.assertEqual(entry.url, "https://example.com/")
+
+    def test_base_urls_are_shared(self):
+        first = UrlEntry(1, "wagtail.Site", "index", "http://localhost:8000/a/")
+        second = UrlEntry(2, "wagtail.Site", "add", "http://localhost:8000/b/")
+        self.assertEqual(first.base_index, second.base_index)
+
+    def test_entries_are_slotted(self):
+        entry = UrlEntry(1, "wagtail.Site", "edit", "http://localhost:8000/admin/")
+        self.assertFalse(hasattr(entry, "__dict__"))
+
+    def test_equality(self):
+        entry = UrlEntry(1, "wagtail.Site", "edit", "http://localhost:8000/admin/")
+        self.assertEqual(
+            entry, UrlEntry(1, "wagtail.Site", "edit", "http://localhost:8000/admin/")
+        )
+        self.assertNotEqual(
+            entry, UrlEntry(2, "wagtail.Site", "edit", "http://localhost:8000/admin/")
+        )
+        self.assertEqual(
+            repr(entry),
+            "UrlEntry(id=1, model_name='wagtail.Site', url_type='edit', "
+            "url='http://localhost:8000/admin/')",
+        )
+
+    def test_pickling(self):
+        entry = UrlEntry(1, "wagtail.Site", "edit", "http://localhost:8000/admin/")
+        self.assertEqual(pickle.loads(pickle.dumps(entry)), entry)
+
+    def test_make_entries_shares_strings(self):
+        # Separate but equal strings, as they would come from the cache
+        urls = [
+            (f"wagtail.Site ({name})", url_type, f"http://localhost:8000/{index}/")
+            for index, (name, url_type) in enumerate(
+                [("localhost", "edit"), ("localhost", "delete"), ("other", "edit")]
+            )
+        ]
+        self.assertIsNot(urls[0][0], urls[1][0])
+        entries = list(make_entries(urls, start=5))
+        self.assertEqual([entry.id for entry in entries], [5, 6, 7])
+        self.assertIs(entries[0].model_name, entries[1].model_name)
+        self.assertIs(entries[0].url_type, entries[2].url_type)
+        self.assertEqual(entries[2].model_name, "wagtail.Site (other)")
@@ -0,0 +1,172 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from wagtail.models import Page, Site
+
+from example_project.core.models import ExamplePageModelBasic, ExamplePageModelStandard
+from example_project.home.models import HomePage
+from wagtail_unveil.pagination import decode_cursor, paginate_urls
+from wagtail_unveil.viewsets.page_report import (
+    UnveilPageProvider,
+    get_frontend_urls,
+    get_page_sample_queryset,
+)
+
+
+class PageSampleTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.home = HomePage.objects.get()
+        cls.basic_pages = [
+            cls.home.add_child(instance=ExamplePageModelBasic(title=f"Basic {i}"))
+            for i in range(3)
+        ]
+        cls.standard_page = cls.home.add_child(
+            instance=ExamplePageModelStandard(title="Standard")
+        )
+        draft = ExamplePageModelStandard(title="Draft", live=False)
+        cls.home.add_child(instance=draft)
+
+    def get_sample_ids(self, max_instances):
+        models = [HomePage, ExamplePageModelBasic, ExamplePageModelStandard]
+        sample = {model: [] for model in models}
+        for page in get_page_sample_queryset(models, max_instances):
+            sample[models[page.model_index]].append(page.pk)
+        return sample
+
+    def test_sample_per_page_type(self):
+        self.assertEqual(
+            self.get_sample_ids(2),
+            {
+                HomePage: [self.home.pk],
+                ExamplePageModelBasic: [page.pk for page in self.basic_pages[:2]],
+                ExamplePageModelStandard: [self.standard_page.pk],
+            },
+        )
+
+    def test_unlimited_sample(self):
+        sample = self.get_sample_ids(0)
+        self.assertEqual(
+            sample[ExamplePageModelBasic], [page.pk for page in self.basic_pages]
+        )
+        self.assertEqual(sample[ExamplePageModelStandard], [self.standard_page.pk])
+
+    def test_sample_without_window_functions(self):
+        expected = self.get_sample_ids(2)
+        with mock.patch.object(
+            type(connection.features), "supports_over_clause", False
+        ):
+            self.assertEqual(self.get_sample_ids(2), expected)
+
+    def test_sample_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            self.get_sample_ids(2)
+
+    def test_sample_pages_only_load_needed_fields(self):
+        pages = list(get_page_sample_queryset([ExamplePageModelBasic], 1))
+        self.assertIs(type(pages[0]), Page)
+        self.assertIn("search_description", pages[0].get_deferred_fields())
+
+    def test_resume_filters_by_path(self):
+        provider = UnveilPageProvider()
+        urls = provider.get_urls("http://testserver", 0)
+        # Stop at the first URL of the second basic page
+        limit = next(
+            index
+            for index, url in enumerate(urls)
+            if url[0] == "core.ExamplePageModelBasic (Basic 1)"
+        )
+        _entries, cursor = paginate_urls(provider, "http://testserver", 0, limit)
+        position, _next_id = decode_cursor("page", cursor)
+        self.assertEqual(position.after, self.basic_pages[0].path)
+        with mock.patch(
+            "wagtail_unveil.viewsets.page_report.get_frontend_urls",
+            wraps=get_frontend_urls,
+        ) as get_frontend_urls_mock:
+            entries, cursor = paginate_urls(provider, "http://testserver", 0, 1, cursor)
+        self.assertEqual(entries[0].model_name, "core.ExamplePageModelBasic (Basic 1)")
+        # The pages before the cursor aren't fetched or resolved again
+        resolved = [
+            page.pk
+            for call in get_frontend_urls_mock.call_args_list
+            for page in call.args[0]
+        ]
+        self.assertIn(self.basic_pages[1].pk, resolved)
+        self.assertNotIn(self.basic_pages[0].pk, resolved)
+        self.assertNotIn(self.home.pk, resolved)
+
+    def test_page_queries_dont_grow_with_page_types(self):
+        provider = UnveilPageProvider()
+        # Warm the cached site root paths used for frontend URLs
+        provider.get_urls("http://testserver", 1)
+        with CaptureQueriesContext(connection) as queries:
+            urls = provider.get_urls("http://testserver", 1)
+        # One query for the root page and one for the sample of every type
+        self.assertEqual(len(queries), 2)
+        self.assertIn(
+            (
+                "core.ExamplePageModelBasic (Basic 0)",
+                "edit",
+                f"http://testserver/admin/pages/{self.basic_pages[0].pk}/edit/",
+            ),
+            urls,
+        )
+
+
+class FrontendUrlsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.home = HomePage.objects.get()
+        cls.page = cls.home.add_child(instance=ExamplePageModelBasic(title="Basic"))
+        # A page outside of every site isn't routable
+        cls.orphan = Page.get_first_root_node().add_child(
+            instance=ExamplePageModelBasic(title="Orphan")
+        )
+
+    def setUp(self):
+        # The cached root paths outlive the sites created by other tests
+        Site.clear_site_root_paths_cache()
+
+    def test_matches_page_url(self):
+        pages = Page.objects.filter(pk__in=[self.home.pk, self.page.pk])
+        self.assertEqual(
+            get_frontend_urls(pages, "http://testserver/"),
+            {
+                self.home.pk: f"http://testserver{self.home.url}",
+                self.page.pk: f"http://testserver{self.page.url}",
+            },
+        )
+
+    def test_unicode_slugs_are_quoted(self):
+        page = self.home.add_child(
+            instance=ExamplePageModelBasic(title="Été", slug="été")
+        )
+        self.assertEqual(
+            get_frontend_urls([page], "http://testserver"),
+            {page.pk: f"http://testserver{page.url}"},
+        )
+        self.assertIn("/%C3%A9t%C3%A9/", page.url)
+
+    def test_unroutable_pages_are_skipped(self):
+        self.assertEqual(get_frontend_urls([self.orphan], "http://testserver"), {})
+
+    def test_multiple_sites_use_their_root_url(self):
+        Site.objects.create(
+            hostname="other.example.com", port=80, root_page=self.orphan
+        )
+        pages = Page.objects.filter(pk__in=[self.page.pk, self.orphan.pk])
+        self.assertEqual(
+            get_frontend_urls(pages, "http://testserver"),
+            {
+                self.page.pk: self.page.get_url(),
+                self.orphan.pk: "http://other.example.com/",
+            },
+        )
+
+    def test_site_root_paths_are_loaded_once(self):
+        pages = list(Page.objects.filter(depth__gt=1))
+        Site.get_site_root_paths()
+        with self.assertNumQueries(0):
+            get_frontend_urls(pages, "http://testserver")
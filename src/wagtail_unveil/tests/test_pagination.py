@@ -0,0 +1,203 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from example_project.core.models import ExamplePageModelBasic
+from example_project.home.models import HomePage
+from wagtail_unveil.pagination import (
+    UrlEntryList,
+    decode_cursor,
+    encode_cursor,
+    paginate_urls,
+)
+from wagtail_unveil.providers import UrlPosition
+from wagtail_unveil.viewsets.page_report import UnveilPageProvider
+from wagtail_unveil.viewsets.user_report import UnveilUserProvider
+
+
+class CursorTest(TestCase):
+    def test_round_trip(self):
+        position = UrlPosition(2, 10, 3, 11, 4)
+        cursor = encode_cursor("user", position, 42)
+        self.assertEqual(decode_cursor("user", cursor), (position, 42))
+
+    def test_invalid_cursors(self):
+        cursor = encode_cursor("user", UrlPosition(), 1)
+        for slug, cursor in [
+            ("page", cursor),
+            ("user", "not-a-cursor"),
+            ("user", cursor[:-2]),
+            ("user", encode_cursor("user", UrlPosition("x"), 1)),
+        ]:
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                decode_cursor(slug, cursor)
+
+
+class PaginateUrlsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.users = [
+            User.objects.create_user(username=f"user{i}", password="password123")
+            for i in range(5)
+        ]
+        home = HomePage.objects.get()
+        for i in range(4):
+            home.add_child(instance=ExamplePageModelBasic(title=f"Basic {i}"))
+
+    def get_all_pages(self, provider, limit, max_instances=0):
+        entries, cursor = paginate_urls(
+            provider, "http://testserver", max_instances, limit
+        )
+        pages = [entries]
+        while cursor:
+            entries, cursor = paginate_urls(
+                provider, "http://testserver", max_instances, limit, cursor
+            )
+            pages.append(entries)
+        return pages
+
+    def test_pages_match_the_full_report(self):
+        for provider in [UnveilUserProvider(), UnveilPageProvider()]:
+            for max_instances in [0, 3]:
+                urls = provider.get_urls("http://testserver", max_instances)
+                for limit in [1, 2, 7, len(urls), len(urls) + 1]:
+                    with self.subTest(
+                        provider=provider.slug,
+                        max_instances=max_instances,
+                        limit=limit,
+                    ):
+                        pages = self.get_all_pages(provider, limit, max_instances)
+                        self.assertTrue(all(len(page) <= limit for page in pages))
+                        entries = [entry for page in pages for entry in page]
+                        self.assertEqual(
+                            [
+                                (entry.model_name, entry.url_type, entry.url)
+                                for entry in entries
+                            ],
+                            urls,
+                        )
+                        self.assertEqual(
+                            [entry.id for entry in entries],
+                            list(range(1, len(urls) + 1)),
+                        )
+
+    def test_resume_filters_by_primary_key(self):
+        provider = UnveilUserProvider()
+        # The add and index URLs, then the edit and delete URLs of two users
+        entries, cursor = paginate_urls(provider, "http://testserver", 0, 6)
+        position, next_id = decode_cursor("user", cursor)
+        self.assertEqual(
+            (position.after, position.pk, next_id),
+            (self.users[1].pk, self.users[2].pk, 7),
+        )
+        # Instances deleted since the last page are skipped
+        self.users[2].delete()
+        with self.assertNumQueries(1):
+            entries, cursor = paginate_urls(provider, "http://testserver", 0, 2, cursor)
+        self.assertEqual(
+            [(entry.id, entry.url_type, entry.url) for entry in entries],
+            [
+                (7, "edit", f"http://testserver/admin/users/edit/{self.users[3].pk}/"),
+                (
+                    8,
+                    "delete",
+                    f"http://testserver/admin/users/delete/{self.users[3].pk}/",
+                ),
+            ],
+        )
+
+
+class UrlEntryListTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        for i in range(8):
+            User.objects.create_user(username=f"user{i}", password="password123")
+
+    def test_slices_match_the_full_report(self):
+        provider = UnveilUserProvider()
+        urls = provider.get_urls("http://testserver", 0)
+        entries = UrlEntryList(provider, "http://testserver", 0)
+        entries.checkpoint_interval = 3
+        self.assertEqual(len(entries), len(urls))
+        for index in [slice(0, 5), slice(4, 9), slice(9, 100), slice(3, 3), 7, -1]:
+            with self.subTest(index=index):
+                expected = list(enumerate(urls, start=1))[index]
+                if isinstance(index, int):
+                    expected = [expected]
+                    actual = [entries[index]]
+                else:
+                    actual = entries[index]
+                self.assertEqual(
+                    [
+                        (entry.id, (entry.model_name, entry.url_type, entry.url))
+                        for entry in actual
+                    ],
+                    expected,
+                )
+
+    def test_empty(self):
+        entries = UrlEntryList(UnveilUserProvider(), "http://testserver", 0)
+        get_user_model().objects.all().delete()
+        Group.objects.all().delete()
+        # Only the add and index URLs of users and groups are left
+        self.assertEqual(len(entries), 4)
+        self.assertEqual(entries[10:20], [])
+        with self.assertRaises(IndexError):
+            entries[4]
+
+
+class AdminReportPaginationTest(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.superuser = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password123"
+        )
+        self.client.login(username="admin", password="password123")
+
+    @override_settings(WAGTAIL_UNVEIL_PAGE_SIZE=2)
+    def test_page_size_setting(self):
+        url = reverse("unveil_admin_report:index")
+        response = self.client.get(url, {"p": 2})
+        self.assertEqual(response.status_code, 200)
+        page = response.context["page_obj"]
+        self.assertEqual(page.paginator.per_page, 2)
+        self.assertEqual([entry.id for entry in page.object_list], [3, 4])
+
+    @override_settings(WAGTAIL_UNVEIL_PAGE_SIZE=0)
+    def test_pagination_can_be_disabled(self):
+        url = reverse("unveil_admin_report:index")
+        response = self.client.get(url)
+        self.assertIsNone(response.context["page_obj"])
+        self.assertGreater(len(response.context["object_list"]), 2)
+
+
+@override_settings(WAGTAIL_UNVEIL_JSON_TOKEN="test_token_123")
+class PaginatedJSONAPITest(TestCase):
+    url = "/unveil/api/admin/"
+
+    def get(self, **params):
+        return self.client.get(self.url, {"token": "test_token_123", **params})
+
+    def test_next_links(self):
+        results = self.get().json()["results"]
+        data = self.get(limit=2).json()
+        paged_results = data["results"]
+        while data["next"]:
+            self.assertIn("limit=2", data["next"])
+            self.assertIn("token=test_token_123", data["next"])
+            data = self.client.get(data["next"]).json()
+            paged_results += data["results"]
+        self.assertEqual(paged_results, results)
+
+    def test_invalid_limit(self):
+        for limit in ["", "0", "-1", "many"]:
+            with self.subTest(limit=limit):
+                self.assertEqual(self.get(limit=limit).status_code, 400)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.get(limit=2, cursor="not-a-cursor").status_code, 400)
+        cursor = encode_cursor("page", UrlPosition(), 1)
+        self.assertEqual(self.get(limit=2, cursor=cursor).status_code, 400)
@@ -0,0 +1,142 @@
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.test import RequestFactory, TestCase
+from wagtail import hooks
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.models import Site
+
+from example_project.core.models import ExamplePageModelBasic
+from wagtail_unveil.providers import (
+    UnveilProvider,
+    get_dependent_slugs,
+    get_provider,
+    get_providers,
+)
+from wagtail_unveil.viewsets.base import UnveilReportViewSet
+
+
+class ExampleSiteProvider(UnveilProvider):
+    slug = "example-site"
+    label = "Example Site"
+    model = Site
+    list_actions = [
+        ("index", "wagtailsites:index"),
+        ("missing", "this_url_name_does_not_exist"),
+    ]
+    instance_actions = [
+        ("edit", "wagtailsites:edit"),
+        ("missing", "wagtailsites:missing"),
+    ]
+
+    def get_instance_label(self, instance):
+        return instance.hostname
+
+
+class ExampleAdminProvider(UnveilProvider):
+    slug = "admin"
+
+    def get_extra_urls(self, base_url):
+        return [("example.Admin", "index", f"{base_url}/example/")]
+
+
+class UnveilProviderRegistryTest(TestCase):
+    def test_builtin_providers_are_registered(self):
+        self.assertEqual(
+            list(get_providers()),
+            [
+                "collection",
+                "document",
+                "form",
+                "generic",
+                "image",
+                "locale",
+                "modeladmin",
+                "page",
+                "redirect",
+                "search-promotion",
+                "settings",
+                "site",
+                "snippet",
+                "user",
+                "admin",
+                "workflow",
+                "workflow-task",
+            ],
+        )
+
+    def test_register_provider_class(self):
+        with hooks.register_temporarily(
+            "register_unveil_provider", lambda: ExampleSiteProvider
+        ):
+            provider = get_provider("example-site")
+        self.assertIsInstance(provider, ExampleSiteProvider)
+
+    def test_provider_urls(self):
+        site = Site.objects.get()
+        urls = ExampleSiteProvider().get_urls("http://testserver", 1)
+        self.assertEqual(
+            urls,
+            [
+                ("wagtailcore.Site", "index", "http://testserver/admin/sites/"),
+                (
+                    f"wagtailcore.Site ({site.hostname})",
+                    "edit",
+                    f"http://testserver/admin/sites/edit/{site.pk}/",
+                ),
+            ],
+        )
+
+    def test_later_provider_replaces_builtin(self):
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password123"
+        )
+        self.client.login(username="admin", password="password123")
+        with hooks.register_temporarily(
+            "register_unveil_provider", lambda: ExampleAdminProvider, order=1
+        ):
+            response = self.client.get("/unveil/api/admin/")
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {
+                    "id": 1,
+                    "model_name": "example.Admin",
+                    "url_type": "index",
+                    "url": "http://localhost:8000/example/",
+                }
+            ],
+        )
+
+    def test_viewset_for_provider(self):
+        User = get_user_model()
+        request = RequestFactory().get("/unveil/api/example-site/")
+        request.user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password123"
+        )
+        viewset = UnveilReportViewSet.for_provider(ExampleSiteProvider())
+        self.assertEqual(viewset.name, "unveil_example_site_report")
+        self.assertEqual(viewset.menu_label, "Example Site")
+        with hooks.register_temporarily(
+            "register_unveil_provider", lambda: ExampleSiteProvider
+        ):
+            response = viewset.as_json_view(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.content)["results"]), 2)
+
+    def test_dependent_slugs(self):
+        self.assertEqual(get_dependent_slugs(Redirect), ("redirect",))
+        self.assertEqual(get_dependent_slugs(ExamplePageModelBasic), ("form", "page"))
+
+    def test_dependencies_are_computed_once(self):
+        get_dependent_slugs(Redirect)
+        with mock.patch.object(
+            UnveilProvider, "get_dependencies"
+        ) as get_dependencies_mock:
+            self.assertEqual(get_dependent_slugs(Redirect), ("redirect",))
+            # Models that aren't in any report
+            self.assertEqual(get_dependent_slugs(Session), ())
+        get_dependencies_mock.assert_not_called()
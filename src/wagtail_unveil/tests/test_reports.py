@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import get_script_prefix, set_script_prefix
+
+from wagtail_unveil.providers import get_providers
+from wagtail_unveil.reports import build_reports, get_all_reports
+
+
+class AllReportsTest(TestCase):
+    def test_every_report_is_included(self):
+        reports = get_all_reports()
+        self.assertEqual(list(reports), list(get_providers()))
+        self.assertEqual(
+            [
+                (entry.id, entry.model_name, entry.url_type, entry.url)
+                for entry in reports["site"]
+            ],
+            [
+                (counter, *url)
+                for counter, url in enumerate(
+                    get_providers()["site"].get_urls(), start=1
+                )
+            ],
+        )
+
+    def test_filtering(self):
+        self.assertEqual(
+            list(get_all_reports(slugs=["user", "page"])), ["page", "user"]
+        )
+        reports = get_all_reports(exclude=["admin", "page"])
+        self.assertNotIn("admin", reports)
+        self.assertNotIn("page", reports)
+        self.assertIn("user", reports)
+
+    def test_unknown_reports(self):
+        with self.assertRaisesMessage(ValueError, "Unknown reports: nope"):
+            get_all_reports(slugs=["page", "nope"])
+
+    def test_concurrent_reports_match(self):
+        reports = build_reports(workers=4)
+        self.assertEqual(list(reports), list(get_providers()))
+        for slug, entries in get_all_reports(workers=1).items():
+            with self.subTest(slug=slug):
+                self.assertEqual(reports[slug].entries, entries)
+                self.assertGreaterEqual(reports[slug].duration, 0)
+
+    @override_settings(WAGTAIL_UNVEIL_WORKERS=3)
+    def test_workers_use_the_callers_script_prefix(self):
+        script_prefix = get_script_prefix()
+        set_script_prefix("/prefix/")
+        try:
+            reports = build_reports(slugs=["site", "user", "admin"])
+        finally:
+            set_script_prefix(script_prefix)
+        self.assertIn(
+            "http://localhost:8000/prefix/admin/sites/",
+            [entry.url for entry in reports["site"].entries],
+        )
+
+
+@override_settings(WAGTAIL_UNVEIL_JSON_TOKEN="test_token_123")
+class AllReportsAPITest(TestCase):
+    url = "/unveil/api/all/"
+
+    def test_token_is_required(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_results_match_the_report_endpoints(self):
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password123"
+        )
+        self.client.login(username="admin", password="password123")
+        response = self.client.get(self.url)
+        self.assertEqual(list(response.json()["timings"]), list(get_providers()))
+        self.assertIn("page;dur=", response["Server-Timing"])
+        results = response.json()["results"]
+        self.assertEqual(list(results), list(get_providers()))
+        for slug in ["admin", "site", "page"]:
+            with self.subTest(slug=slug):
+                self.assertEqual(
+                    results[slug],
+                    self.client.get(f"/unveil/api/{slug}/").json()["results"],
+                )
+
+    def test_filtering(self):
+        response = self.client.get(
+            self.url, {"token": "test_token_123", "reports": "site,admin"}
+        )
+        self.assertEqual(list(response.json()["results"]), ["site", "admin"])
+        response = self.client.get(
+            self.url, {"token": "test_token_123", "exclude": "page"}
+        )
+        self.assertNotIn("page", response.json()["results"])
+
+    def test_unknown_reports(self):
+        response = self.client.get(
+            self.url, {"token": "test_token_123", "reports": "nope"}
+        )
+        self.assertEqual(response.status_code, 400)
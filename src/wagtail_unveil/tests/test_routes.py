@@ -0,0 +1,155 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import clear_url_caches, path, register_converter, reverse
+
+from example_project.core.models import ExampleWagtailModeladminModel
+from wagtail_unveil import routes
+from wagtail_unveil.routes import (
+    MISSING,
+    UNCACHEABLE,
+    Route,
+    clear_route_templates,
+    get_route_index,
+    get_route_template,
+    get_routes,
+    reverse_url,
+    route_exists,
+)
+from wagtail_unveil.viewsets.modeladmin_report import get_modeladmin_url_patterns
+
+
+def example_view(request):
+    pass
+
+
+class ZeroPaddedConverter:
+    regex = "[0-9]{4}"
+
+    def to_python(self, value):
+        return int(value)
+
+    def to_url(self, value):
+        return f"{value:04d}"
+
+
+register_converter(ZeroPaddedConverter, "unveil_zero_padded")
+
+urlpatterns = [
+    path("example/<int:pk>/edit/", example_view, name="example_edit"),
+    path("example/<slug:app>/<slug:model>/<int:pk>/", example_view, name="example"),
+    path("padded/<unveil_zero_padded:pk>/", example_view, name="example_padded"),
+]
+
+
+class RouteTemplateTest(SimpleTestCase):
+    def setUp(self):
+        clear_route_templates()
+
+    def test_matches_reverse(self):
+        for url_name, args in [
+            ("wagtailadmin_home", []),
+            ("wagtailadmin_pages:edit", [3]),
+            ("wagtailadmin_pages:add", ["home", "homepage", 1]),
+            ("wagtailsettings:edit", ["for_snippets", "examplesetting", 2]),
+        ]:
+            with self.subTest(url_name=url_name):
+                self.assertEqual(
+                    reverse_url(url_name, args), reverse(url_name, args=args)
+                )
+
+    def test_template_is_reused(self):
+        with mock.patch.object(routes, "reverse", wraps=reverse) as reverse_mock:
+            self.assertEqual(
+                reverse_url("wagtailadmin_pages:edit", [1]), "/admin/pages/1/edit/"
+            )
+            self.assertEqual(
+                reverse_url("wagtailadmin_pages:edit", [2]), "/admin/pages/2/edit/"
+            )
+        self.assertEqual(reverse_mock.call_count, 1)
+
+    def test_missing_url_name_is_cached(self):
+        with mock.patch.object(routes, "reverse", wraps=reverse) as reverse_mock:
+            self.assertIsNone(reverse_url("unveil_does_not_exist", [1]))
+            self.assertIsNone(reverse_url("unveil_does_not_exist", [2]))
+        self.assertIs(get_route_template("unveil_does_not_exist", [1]), MISSING)
+        # The route index already knows the URL name doesn't exist
+        self.assertEqual(reverse_mock.call_count, 0)
+
+    def test_arg_shape_is_part_of_the_key(self):
+        self.assertIsNone(reverse_url("wagtailadmin_pages:edit", []))
+        self.assertEqual(
+            reverse_url("wagtailadmin_pages:edit", [1]), "/admin/pages/1/edit/"
+        )
+
+    def test_clear_url_caches_rebuilds_templates(self):
+        template = get_route_template("wagtailadmin_pages:edit", [1])
+        self.assertIs(get_route_template("wagtailadmin_pages:edit", [1]), template)
+        clear_url_caches()
+        with mock.patch.object(routes, "reverse", wraps=reverse) as reverse_mock:
+            get_route_template("wagtailadmin_pages:edit", [1])
+        self.assertEqual(reverse_mock.call_count, 1)
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_urlconf_change(self):
+        self.assertIsNone(reverse_url("wagtailadmin_pages:edit", [1]))
+        self.assertEqual(reverse_url("example_edit", [5]), "/example/5/edit/")
+        self.assertEqual(
+            reverse_url("example", ["home", "home-page", 5]),
+            "/example/home/home-page/5/",
+        )
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_custom_converter(self):
+        # The converter changes the argument, so the URL is always reversed
+        self.assertIs(get_route_template("example_padded", [5]), UNCACHEABLE)
+        self.assertEqual(reverse_url("example_padded", [5]), "/padded/0005/")
+
+
+class RouteIndexTest(SimpleTestCase):
+    def setUp(self):
+        clear_route_templates()
+
+    def test_routes(self):
+        self.assertEqual(
+            get_routes("wagtailadmin_pages:add"),
+            (
+                Route(
+                    "wagtailadmin_pages:add",
+                    "wagtailadmin_pages",
+                    3,
+                    ("slug", "slug", "int"),
+                ),
+            ),
+        )
+        # Patterns defined with regular expressions
+        self.assertEqual(
+            get_routes("wagtail_serve"), (Route("wagtail_serve", "", 1, (None,)),)
+        )
+        self.assertEqual(get_routes("unveil_does_not_exist"), ())
+
+    def test_route_exists(self):
+        self.assertTrue(route_exists("wagtailadmin_home"))
+        self.assertTrue(route_exists("wagtailadmin_pages:edit", 1))
+        self.assertFalse(route_exists("wagtailadmin_pages:edit", 2))
+        self.assertFalse(route_exists("edit"))
+
+    def test_index_is_built_once(self):
+        index = get_route_index()
+        self.assertIs(get_route_index(), index)
+        clear_url_caches()
+        self.assertIsNot(get_route_index(), index)
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_urlconf_change(self):
+        self.assertEqual(
+            list(get_route_index()), ["example_edit", "example", "example_padded"]
+        )
+
+    def test_modeladmin_url_patterns(self):
+        with mock.patch.object(routes, "reverse") as reverse_mock:
+            self.assertEqual(
+                get_modeladmin_url_patterns(ExampleWagtailModeladminModel),
+                "example-models_modeladmin",
+            )
+        reverse_mock.assert_not_called()
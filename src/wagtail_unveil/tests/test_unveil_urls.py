@@ -0,0 +1,123 @@
+import json
+import os
+import tempfile
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import LiveServerTestCase, TestCase, override_settings
+from wagtail.contrib.redirects.models import Redirect
+
+from wagtail_unveil.checks import create_session
+from wagtail_unveil.reports import get_all_reports
+
+
+@override_settings(WAGTAIL_UNVEIL_JSON_TOKEN="test_token_123")
+class UnveilUrlsCommandTest(LiveServerTestCase):
+    def setUp(self):
+        Redirect.objects.create(old_path="/old", redirect_link="/new")
+
+    def call(self, **options):
+        stdout = StringIO()
+        call_command(
+            "unveil_urls",
+            api_root=f"{self.live_server_url}/unveil/api/",
+            stdout=stdout,
+            **options,
+        )
+        return stdout.getvalue()
+
+    def test_output(self):
+        output = json.loads(
+            self.call(token="test_token_123", reports="site,redirect", workers=2)
+        )
+        self.assertEqual(set(output), {"site", "redirect"})
+        self.assertIn(
+            "http://localhost:8000/admin/redirects/",
+            [entry["url"] for entry in output["redirect"]["results"]],
+        )
+
+    def test_one_session_per_worker(self):
+        threads = []
+
+        def create(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return create_session(*args, **kwargs)
+
+        with mock.patch(
+            "wagtail_unveil.checks.create_session",
+            side_effect=create,
+        ):
+            output = json.loads(
+                self.call(
+                    token="test_token_123", reports="site,redirect,user", workers=2
+                )
+            )
+        self.assertEqual(set(output), {"site", "redirect", "user"})
+        self.assertTrue(threads)
+        self.assertEqual(len(threads), len(set(threads)))
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_output_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "urls.json")
+            stdout = self.call(token="test_token_123", reports="site", output=path)
+            with open(path, encoding="utf-8") as f:
+                output = json.load(f)
+        self.assertEqual(stdout, "")
+        self.assertEqual(list(output), ["site"])
+
+    def test_errors(self):
+        output = json.loads(self.call(token="wrong", reports="site", retries=0))
+        self.assertEqual(output, {"site": {"error": "HTTP 403"}})
+
+    def test_unknown_reports(self):
+        with self.assertRaisesMessage(CommandError, "Unknown reports: nope"):
+            self.call(token="test_token_123", reports="nope")
+
+
+class UnveilUrlsInProcessTest(TestCase):
+    def setUp(self):
+        Redirect.objects.create(old_path="/old", redirect_link="/new")
+
+    def test_output_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "urls.json")
+            stdout = StringIO()
+            call_command(
+                "unveil_urls",
+                in_process=True,
+                reports="site,redirect",
+                output=path,
+                stdout=stdout,
+            )
+            with open(path, encoding="utf-8") as f:
+                output = json.load(f)
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(set(output), {"site", "redirect"})
+        reports = get_all_reports(slugs=["site", "redirect"])
+        for slug, entries in reports.items():
+            self.assertEqual(
+                [entry["url"] for entry in output[slug]["results"]],
+                [entry.url for entry in entries],
+            )
+
+    def test_base_url(self):
+        stdout = StringIO()
+        call_command(
+            "unveil_urls",
+            in_process=True,
+            reports="redirect",
+            base_url="https://example.com",
+            stdout=stdout,
+        )
+        output = json.loads(stdout.getvalue())
+        self.assertIn(
+            "https://example.com/admin/redirects/",
+            [entry["url"] for entry in output["redirect"]["results"]],
+        )
+
+    def test_token_required(self):
+        with self.assertRaisesMessage(CommandError, "--token is required"):
+            call_command("unveil_urls", reports="site")
@@ -1,6 +1,11 @@
+import csv
+import io
+import json
+
 from django.contrib.auth import get_user_model
 from django.test import TestCase, override_settings
 from django.urls import reverse
+from wagtail.contrib.redirects.models import Redirect
 
 
 class UnveilReportsIndexViewTest(TestCase):
@@ -228,3 +233,140 @@ class UnveilReportsJSONAPITest(TestCase):
                 self.assertIsNotNone(
                     entry[field], f"Field '{field}' should not be None"
                 )
+
+    def test_streaming_json_matches_json_response(self):
+        """Test that the streamed JSON document is identical to the default one"""
+        url = "/unveil/api/admin/"
+        response = self.client.get(url, {"token": "test_token_123"})
+        streamed = self.client.get(url, {"token": "test_token_123", "stream": "1"})
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(streamed["Content-Type"], "application/json")
+        self.assertEqual(b"".join(streamed.streaming_content), response.content)
+
+    @override_settings(WAGTAIL_UNVEIL_STREAM_JSON=True)
+    def test_streaming_json_setting(self):
+        """Test that JSON responses can be streamed by default"""
+        response = self.client.get("/unveil/api/admin/", {"token": "test_token_123"})
+        self.assertTrue(response.streaming)
+
+    def test_ndjson_format(self):
+        """Test that NDJSON responses have one result per line"""
+        url = "/unveil/api/admin/"
+        results = self.client.get(url, {"token": "test_token_123"}).json()["results"]
+        response = self.client.get(url, {"token": "test_token_123", "format": "ndjson"})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], results)
+
+    def test_columns_format(self):
+        """Test that the columnar format decodes to the same results"""
+        url = "/unveil/api/page/"
+        results = self.client.get(url, {"token": "test_token_123"}).json()["results"]
+        response = self.client.get(
+            url, {"token": "test_token_123", "format": "columns"}
+        )
+        data = response.json()
+        self.assertEqual(data["base_url"], "http://localhost:8000")
+        self.assertEqual(len(data["url_types"]), len(set(data["url_types"])))
+        columns = data["columns"]
+        decoded = [
+            {
+                "id": entry_id,
+                "model_name": data["model_names"][model_name],
+                "url_type": data["url_types"][url_type],
+                "url": url if "://" in url else data["base_url"] + url,
+            }
+            for entry_id, model_name, url_type, url in zip(
+                columns["id"],
+                columns["model_name"],
+                columns["url_type"],
+                columns["url"],
+            )
+        ]
+        self.assertEqual(decoded, results)
+        self.assertLess(len(response.content), len(json.dumps(results)))
+
+    def test_paginated_columns_format(self):
+        """Test that the columnar format can be paginated"""
+        url = "/unveil/api/admin/"
+        columns = self.client.get(url, {"format": "columns"}).json()["columns"]
+        response = self.client.get(url, {"format": "columns", "limit": 2})
+        self.assertEqual(response.json()["columns"]["id"], columns["id"][:2])
+        self.assertIsNotNone(response.json()["next"])
+
+    def test_unsupported_format(self):
+        """Test that unknown formats are rejected"""
+        response = self.client.get(
+            "/unveil/api/admin/", {"token": "test_token_123", "format": "yaml"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class UnveilReportExportTest(TestCase):
+    """Test the CSV and XLSX exports of the admin reports"""
+
+    url = "/admin/unveil/redirect-report/"
+
+    def setUp(self):
+        User = get_user_model()
+        User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="password123"
+        )
+        self.client.login(username="admin", password="password123")
+        Redirect.objects.create(old_path="/old", redirect_link="/new")
+        self.results = self.client.get("/unveil/api/redirect/").json()["results"]
+
+    def test_export_buttons(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, "export=csv")
+        self.assertContains(response, "export=xlsx")
+
+    def test_csv_export(self):
+        response = self.client.get(self.url, {"export": "csv"})
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            response["Content-Disposition"],
+            'attachment; filename="unveil-redirect-report.csv"',
+        )
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(
+            rows[0], ["ID", "App.Model", "View Type", "Admin / Frontend URL"]
+        )
+        self.assertEqual(
+            rows[1:],
+            [
+                [
+                    str(result["id"]),
+                    result["model_name"],
+                    result["url_type"],
+                    result["url"],
+                ]
+                for result in self.results
+            ],
+        )
+
+    @override_settings(WAGTAIL_UNVEIL_PAGE_SIZE=1)
+    def test_export_isnt_paginated(self):
+        response = self.client.get(self.url, {"export": "csv"})
+        content = b"".join(response.streaming_content).decode()
+        self.assertEqual(len(content.splitlines()), len(self.results) + 1)
+
+    def test_xlsx_export(self):
+        from openpyxl import load_workbook
+
+        response = self.client.get(self.url, {"export": "xlsx"})
+        self.assertIn("unveil-redirect-report.xlsx", response["Content-Disposition"])
+        workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)))
+        rows = list(workbook.active.values)
+        self.assertEqual(
+            rows[0], ("ID", "App.Model", "View Type", "Admin / Frontend URL")
+        )
+        self.assertEqual(
+            rows[1:],
+            [
+                (result["id"], result["model_name"], result["url_type"], result["url"])
+                for result in self.results
+            ],
+        )
@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+# A cache every process sees, which the JSON API's ETags need
+SHARED_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(tempfile.gettempdir(), "wagtail-unveil-tests"),
+    }
+}
@@ -1,14 +1,109 @@
+import csv
+import re
+import tempfile
+from itertools import chain
+from urllib.parse import urlsplit
+
 from django.conf import settings
-from django.http import HttpResponseForbidden, JsonResponse
+from django.http import (
+    FileResponse,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.urls import path
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.text import compress_string
+from wagtail.admin.views.mixins import Echo
 from wagtail.admin.views.reports import ReportView
 from wagtail.admin.viewsets.base import ViewSet
 from wagtail.admin.widgets.button import HeaderButton
 
+from wagtail_unveil.cache import (
+    get_cache,
+    get_report_urls,
+    get_report_version,
+    get_response_cache_key,
+    get_response_cache_timeout,
+    is_cache_enabled,
+    is_cache_shared,
+    is_response_cache_enabled,
+)
+from wagtail_unveil.checks import (
+    RUN_CHECKS_TIMEOUT,
+    check_urls,
+    check_urls_in_process,
+    get_check_in_process,
+    get_check_timeout,
+)
+from wagtail_unveil.conditional import get_report_validators
+from wagtail_unveil.filters import UnveilReportFilterSet, UrlFilter
+from wagtail_unveil.formats import (
+    entries_to_columns,
+    entry_to_dict,
+    iter_json,
+    iter_ndjson,
+)
+from wagtail_unveil.inventory import (
+    InventoryEntryList,
+    is_inventory_enabled,
+    paginate_inventory,
+)
+from wagtail_unveil.models import UnveilUrlRecord
+from wagtail_unveil.pagination import UrlEntryList, paginate_urls
+from wagtail_unveil.providers import get_base_url, get_max_instances, get_provider
+from wagtail_unveil.reports import iter_report_entries
+
+# Same as GZipMiddleware
+re_accepts_gzip = re.compile(r"\bgzip\b")
+
+
+def has_api_access(request):
+    """
+    Return whether request may use the JSON API: superusers always can, other
+    requests need the WAGTAIL_UNVEIL_JSON_TOKEN token.
+    """
+    required_token = getattr(settings, "WAGTAIL_UNVEIL_JSON_TOKEN", None)
+    # Best practice: check Authorization header for Bearer token
+    auth_header = request.headers.get("Authorization")
+    token = None
+    if auth_header and auth_header.startswith("Bearer "):
+        token = auth_header.split(" ", 1)[1]
+    # Fallbacks for compatibility
+    if not token:
+        token = request.GET.get("token") or request.headers.get("X-API-TOKEN")
+    # Bypass token check if user is authenticated and is superuser
+    if (
+        hasattr(request, "user")
+        and request.user.is_authenticated
+        and request.user.is_superuser
+    ):
+        return True
+    return bool(required_token) and token == required_token
+
 
 class UnveilReportView(ReportView):
     """Base view class for Unveil reports"""
 
+    api_slug = None
+    template_name = "wagtail_unveil/unveil_url_report.html"
+    results_template_name = "wagtail_unveil/unveil_url_report_results.html"
+    paginate_by = 100
+    # Set by get_queryset() to the cache status of the report, if cached
+    cache_status = None
+    list_export = ["id", "model_name", "url_type", "url"]
+    export_headings = {
+        "id": "ID",
+        "model_name": "App.Model",
+        "url_type": "View Type",
+        "url": "Admin / Frontend URL",
+    }
+    # Number of CSV rows sent per chunk
+    export_chunk_size = 500
+    filterset_class = UnveilReportFilterSet
+
     def get_header_buttons(self):
         """Get header buttons for the report, using the explicit api_slug attribute."""
         api_slug = getattr(self, "api_slug", "collection")
@@ -25,48 +120,341 @@ class UnveilReportView(ReportView):
                 icon_name="link",
                 attrs={"data-action": "check-urls"},
             ),
+            # The export buttons
+            *super().get_header_buttons(),
+        ]
+
+    def get_url_filter(self):
+        """Return the UrlFilter of the request's query parameters, if any."""
+        try:
+            return UrlFilter.from_params(self.request.GET)
+        except ValueError:
+            # The filter form shows the error
+            return None
+
+    def get_provider(self):
+        """
+        Return the registered URL provider for this report, narrowed to the
+        URLs the request filters on.
+        """
+        provider = get_provider(self.api_slug)
+        if provider is None:
+            return None
+        url_filter = self.get_url_filter()
+        return provider.with_filter(url_filter) if url_filter else provider
+
+    def get_filterset_kwargs(self):
+        return {
+            **super().get_filterset_kwargs(),
+            "queryset": UnveilUrlRecord.objects.none(),
+            "provider": get_provider(self.api_slug),
+        }
+
+    def filter_queryset(self, queryset):
+        # The provider already applied the filters, see get_provider()
+        return queryset
+
+    def iter_entries(self):
+        """Yield the URL entries for this report from its provider."""
+        provider = self.get_provider()
+        if provider is None:
+            return
+        yield from iter_report_entries(provider, get_base_url(), get_max_instances())
+
+    def get_queryset(self):
+        """
+        Return a lazy sequence of the URL entries for this report, so only
+        the entries on the current page are built.
+        """
+        provider = self.get_provider()
+        if provider is None:
+            return []
+        if is_inventory_enabled():
+            return InventoryEntryList(provider.slug, provider.url_filter)
+        base_url, max_instances = get_base_url(), get_max_instances()
+        if is_cache_enabled():
+            urls, self.cache_status = get_report_urls(provider, base_url, max_instances)
+            return UrlEntryList(provider, base_url, max_instances, urls)
+        return UrlEntryList(provider, base_url, max_instances)
+
+    def get_validators(self, request):
+        """
+        Return the ETag and Last-Modified values of this report's JSON
+        response to request, computed without building the report.
+
+        There are none unless the cache is shared, since the report version
+        in the ETag only changes in the processes that see the new version.
+        """
+        provider = self.get_provider()
+        if provider is None or not is_cache_shared():
+            return None, None
+        params = [
+            (key, value) for key, values in request.GET.lists() for value in values
         ]
+        return get_report_validators(
+            provider, get_base_url(), get_max_instances(), params
+        )
+
+    def get(self, request, *args, **kwargs):
+        # Exports stream every entry from the provider, without counting or
+        # paginating them first
+        if self.is_export:
+            return self.as_spreadsheet(self.iter_entries(), request.GET.get("export"))
+        return super().get(request, *args, **kwargs)
+
+    def post(self, request, *args, **kwargs):
+        """
+        Check the URLs on the requested page of the report and return their
+        results as JSON, for the Run Checks button.
+
+        By default, the URLs are run through Django's request handler with the
+        request's session, which also counts their queries. With
+        WAGTAIL_UNVEIL_CHECK_IN_PROCESS disabled, requests are sent to the site
+        while this request holds a web worker, so they aren't retried and time
+        out after RUN_CHECKS_TIMEOUT seconds at most.
+        """
+        queryset = self.get_queryset()
+        entries = queryset
+        page_size = self.get_paginate_by(queryset)
+        if page_size:
+            _paginator, _page, entries, _is_paginated = self.paginate_queryset(
+                queryset, page_size
+            )
+        urls = list(dict.fromkeys(entry.url for entry in entries))
+        if get_check_in_process():
+            results = check_urls_in_process(urls, cookies=request.COOKIES)
+            return JsonResponse({"results": [result.to_dict() for result in results]})
+        # The user's session is only sent back to this site
+        host = request.get_host()
+        site_urls = [url for url in urls if urlsplit(url).netloc == host]
+        other_urls = [url for url in urls if urlsplit(url).netloc != host]
+        cookie = request.headers.get("Cookie")
+        timeout = min(get_check_timeout(), RUN_CHECKS_TIMEOUT)
+        results = chain(
+            check_urls(
+                site_urls,
+                timeout=timeout,
+                retries=0,
+                headers={"Cookie": cookie} if cookie else None,
+            ),
+            check_urls(other_urls, timeout=timeout, retries=0),
+        )
+        return JsonResponse({"results": [result.to_dict() for result in results]})
+
+    def get_filename(self):
+        return f"unveil-{self.api_slug}-report"
+
+    def get_export_row(self, entry):
+        return [getattr(entry, field) for field in self.list_export]
+
+    def stream_csv(self, queryset):
+        """Yield the CSV export in chunks of rows, holding one chunk at a time."""
+        writer = csv.writer(Echo())
+        yield writer.writerow(
+            [self.export_headings[field] for field in self.list_export]
+        )
+        rows = []
+        for entry in queryset:
+            rows.append(writer.writerow(self.get_export_row(entry)))
+            if len(rows) == self.export_chunk_size:
+                yield b"".join(rows)
+                rows = []
+        if rows:
+            yield b"".join(rows)
+
+    def write_xlsx(self, queryset, output):
+        """Write the XLSX export with a write-only workbook, one row at a time."""
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(title="URLs")
+        worksheet.append([self.export_headings[field] for field in self.list_export])
+        for entry in queryset:
+            worksheet.append(self.get_export_row(entry))
+        workbook.save(output)
+
+    def write_xlsx_response(self, queryset):
+        # Spool the workbook to disk rather than building it in memory
+        output = tempfile.TemporaryFile()
+        self.write_xlsx(queryset, output)
+        output.seek(0)
+        return FileResponse(
+            output,
+            as_attachment=True,
+            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            filename=f"{self.get_filename()}.xlsx",
+        )
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        if self.cache_status:
+            response["X-Unveil-Cache"] = self.cache_status
+        return response
+
+    def get_paginate_by(self, queryset):
+        """Return the page size, set WAGTAIL_UNVEIL_PAGE_SIZE to 0 to show every URL."""
+        return getattr(settings, "WAGTAIL_UNVEIL_PAGE_SIZE", self.paginate_by) or None
+
+    def paginate_entries(self, limit, cursor=None):
+        """
+        Return up to limit URL entries starting at cursor, and the cursor of the
+        next page or None.
+        """
+        provider = self.get_provider()
+        if provider is None:
+            return [], None
+        if is_inventory_enabled():
+            return paginate_inventory(provider.slug, limit, cursor, provider.url_filter)
+        return paginate_urls(
+            provider, get_base_url(), get_max_instances(), limit, cursor
+        )
 
 
 class UnveilReportViewSet(ViewSet):
     """Base ViewSet class for Unveil reports with JSON API support"""
 
+    @classmethod
+    def for_provider(cls, provider):
+        """
+        Build a report ViewSet for a provider registered by another app.
+        """
+        name = f"unveil_{provider.slug.replace('-', '_')}_report"
+        label = provider.label or provider.slug.replace("-", " ").title()
+        index_view_class = type(
+            "UnveilProviderReportIndexView",
+            (UnveilReportView,),
+            {
+                "api_slug": provider.slug,
+                "page_title": f"Unveil {label}",
+                "header_icon": provider.icon,
+            },
+        )
+        return cls(
+            name,
+            icon=provider.icon,
+            menu_label=label,
+            menu_name=name,
+            url_namespace=name,
+            url_prefix=f"unveil/{provider.slug}-report",
+            index_view_class=index_view_class,
+        )
+
     def as_json_view(self, request):
         """Return the report data as JSON with token authentication, unless user is superuser."""
-        required_token = getattr(settings, "WAGTAIL_UNVEIL_JSON_TOKEN", None)
-        # Best practice: check Authorization header for Bearer token
-        auth_header = request.headers.get("Authorization")
-        token = None
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ", 1)[1]
-        # Fallbacks for compatibility
-        if not token:
-            token = request.GET.get("token") or request.headers.get("X-API-TOKEN")
-        # Bypass token check if user is authenticated and is superuser
-        if not (
-            hasattr(request, "user")
-            and request.user.is_authenticated
-            and request.user.is_superuser
-        ):
-            if not required_token or token != required_token:
-                return HttpResponseForbidden("Invalid or missing token.")
-        # Return the report data as JSON
+        if not has_api_access(request):
+            return HttpResponseForbidden("Invalid or missing token.")
+        try:
+            UrlFilter.from_params(request.GET)
+        except ValueError:
+            return HttpResponseBadRequest("Invalid filter.")
+        # Return the report data as JSON, unless the client's copy is current
         view = self.index_view_class()
-        queryset = view.get_queryset()
-        data = [
-            {
-                "id": entry.id,
-                "model_name": entry.model_name,
-                "url_type": entry.url_type,
-                "url": entry.url,
-            }
-            for entry in queryset
-        ]
-        return JsonResponse({"results": data})
+        view.setup(request)
+        etag, last_modified = view.get_validators(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = self.get_json_response(request, view, etag)
+        if etag and response.status_code in (200, 304):
+            # Compressed responses aren't byte for byte identical
+            if response.get("Content-Encoding") == "gzip":
+                etag = f"W/{etag}"
+            response["ETag"] = etag
+            if last_modified:
+                response["Last-Modified"] = last_modified
+        return response
+
+    def get_json_response(self, request, view, etag=None):
+        """Return the report data in the requested format."""
+        response_format = request.GET.get("format", "json")
+        if response_format == "ndjson":
+            return StreamingHttpResponse(
+                iter_ndjson(view.iter_entries()), content_type="application/x-ndjson"
+            )
+        if response_format not in ("json", "columns"):
+            return HttpResponseBadRequest("Unsupported format.")
+        if "limit" in request.GET or "cursor" in request.GET:
+            return self.paginated_json_response(request, view, response_format)
+        # Stream the same document when asked to, so large reports aren't
+        # built in memory
+        if response_format == "json" and (
+            request.GET.get("stream")
+            or getattr(settings, "WAGTAIL_UNVEIL_STREAM_JSON", False)
+        ):
+            return StreamingHttpResponse(
+                iter_json(view.iter_entries()), content_type="application/json"
+            )
+        if etag and is_response_cache_enabled():
+            return self.cached_json_response(request, view, response_format, etag)
+        response = JsonResponse(
+            self.get_json_data(view.get_queryset(), response_format)
+        )
+        if view.cache_status:
+            response["X-Unveil-Cache"] = view.cache_status
+        return response
+
+    def cached_json_response(self, request, view, response_format, etag):
+        """
+        Return the report data from the response cache, gzip compressed if the
+        client accepts it, building and caching it first on a miss.
+        """
+        cache = get_cache()
+        key = get_response_cache_key(
+            view.api_slug, get_report_version(view.api_slug), etag
+        )
+        bodies = cache.get(key)
+        if bodies is None:
+            content = JsonResponse(
+                self.get_json_data(view.get_queryset(), response_format)
+            ).content
+            bodies = (content, compress_string(content))
+            cache.set(key, bodies, get_response_cache_timeout())
+        content, compressed_content = bodies
+        if re_accepts_gzip.search(request.headers.get("Accept-Encoding", "")):
+            response = HttpResponse(compressed_content, content_type="application/json")
+            response["Content-Encoding"] = "gzip"
+        else:
+            response = HttpResponse(content, content_type="application/json")
+        response["Content-Length"] = str(len(response.content))
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return response
+
+    def get_json_data(self, entries, response_format):
+        """Return the JSON document for entries in the requested format."""
+        if response_format == "columns":
+            return entries_to_columns(entries, get_base_url())
+        return {"results": [entry_to_dict(entry) for entry in entries]}
+
+    def paginated_json_response(self, request, view, response_format="json"):
+        """Return a page of the report data with a link to the next page."""
+        try:
+            limit = int(request.GET.get("limit", ""))
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            return HttpResponseBadRequest("Invalid limit.")
+        try:
+            entries, cursor = view.paginate_entries(limit, request.GET.get("cursor"))
+        except ValueError:
+            return HttpResponseBadRequest("Invalid cursor.")
+        next_url = None
+        if cursor:
+            params = request.GET.copy()
+            params["cursor"] = cursor
+            next_url = request.build_absolute_uri(f"?{params.urlencode()}")
+        data = self.get_json_data(entries, response_format)
+        return JsonResponse({**data, "next": next_url})
 
     def get_urlpatterns(self):
         """Return the URL patterns for this ViewSet including JSON endpoint"""
+        view_kwargs = {
+            "index_url_name": self.get_url_name("index"),
+            "index_results_url_name": self.get_url_name("results"),
+        }
         return [
-            path("", self.index_view_class.as_view(), name="index"),
-            path("results/", self.index_view_class.as_view(), name="results"),
+            path("", self.index_view_class.as_view(**view_kwargs), name="index"),
+            path(
+                "results/",
+                self.index_view_class.as_view(results_only=True, **view_kwargs),
+                name="results",
+            ),
         ]
@@ -1,131 +1,115 @@
-from django.conf import settings
-from django.urls import NoReverseMatch, reverse
+from django.db.models import Count
 from wagtail.contrib.forms.models import FormSubmission
-from wagtail.models import Page
+from wagtail.models import Page, Site
 
-from wagtail_unveil.models import UrlEntry
+from wagtail_unveil.providers import INSTANCE_CHUNK_SIZE, UnveilProvider
 from wagtail_unveil.viewsets.base import UnveilReportView, UnveilReportViewSet
+from wagtail_unveil.viewsets.page_report import iter_with_frontend_urls
+
+
+def get_form_pages_queryset(max_instances=0, pks=None, url_filter=None, after=None):
+    """
+    Return a queryset of the pages that have form submissions, annotated with
+    their ``submission_count``, in primary key order.
+
+    Only the page columns the report needs are loaded, and max_instances is
+    applied in SQL before any pages are fetched. Pass pks to only return the
+    pages with those primary keys, url_filter to only return the pages in
+    its primary key range, or after to only return the pages after that
+    primary key.
+    """
+    pages = (
+        Page.objects.only("id", "title", "content_type_id", "url_path")
+        .annotate(submission_count=Count("formsubmission"))
+        .filter(submission_count__gt=0)
+        .order_by("pk")
+    )
+    if pks is not None:
+        pages = pages.filter(pk__in=pks)
+    if url_filter:
+        pages = url_filter.filter_queryset(pages)
+    if after is not None:
+        pages = pages.filter(pk__gt=after)
+    if max_instances:
+        pages = pages[:max_instances]
+    return pages
 
 
-def get_form_pages_with_submissions():
-    # Get all pages that have form submissions
-    form_pages = []
-
-    # Get unique page IDs that have form submissions
-    try:
-        page_ids_with_submissions = FormSubmission.objects.values_list(
-            "page_id", flat=True
-        ).distinct()
-    except (FormSubmission.DoesNotExist, AttributeError, ValueError, TypeError):
+class UnveilFormProvider(UnveilProvider):
+    # URLs for form pages that have submissions
+    slug = "form"
+    label = "Form"
+    icon = "form"
+    model = FormSubmission
+    list_actions = [
+        ("forms_index", "wagtailforms:index"),
+    ]
+    instance_actions = [
+        ("list_submissions", "wagtailforms:list_submissions"),
+        ("delete_submissions", "wagtailforms:delete_submissions"),
+    ]
+
+    def get_dependencies(self):
+        return [FormSubmission, Page, Site]
+
+    def get_url_types(self):
+        return [*super().get_url_types(), "frontend_form"]
+
+    def get_last_modified_fields(self, model):
+        if model is FormSubmission:
+            return ["submit_time"]
+        if model is Page:
+            return ["last_published_at"]
+        return super().get_last_modified_fields(model)
+
+    def get_context(self, base_url, max_instances):
+        return {"base_url": base_url}
+
+    def get_instances(self, model, max_instances, context, after=None, offset=0):
+        # Resume after the last form page reported
+        if max_instances and offset >= max_instances:
+            return []
+        form_pages = get_form_pages_queryset(
+            max_instances and max_instances - offset,
+            url_filter=self.url_filter,
+            after=after,
+        ).iterator(chunk_size=INSTANCE_CHUNK_SIZE)
+        # Frontend URLs are only resolved if they're included
+        if self.url_filter is None or self.url_filter.matches_url_type("frontend_form"):
+            form_pages = iter_with_frontend_urls(form_pages, context["base_url"])
         return form_pages
 
-    for page_id in page_ids_with_submissions:
-        try:
-            page = Page.objects.get(id=page_id)
-            specific_page = page.specific
-            submission_count = FormSubmission.objects.filter(page_id=page_id).count()
-            form_pages.append(
-                (
-                    page_id,
-                    page.title,
-                    specific_page.__class__.__name__,
-                    submission_count,
-                )
-            )
-        except Page.DoesNotExist:
-            continue
-        except (AttributeError, ValueError, TypeError):
-            continue
-
-    return form_pages
-
-
-def get_forms_urls(base_url, max_instances):
-    # Return a list of tuples (model_name, url_type, url) for forms
-    urls = []
-
-    # Get the FormSubmission model name
-    form_submission_model_name = (
-        f"{FormSubmission._meta.app_label}.{FormSubmission.__name__}"
-    )
+    def get_indexed_objects(self, instance):
+        # The report lists form pages, which submissions add and remove
+        if isinstance(instance, FormSubmission):
+            return [(FormSubmission, instance.page_id)]
+        if isinstance(instance, Page):
+            return [(FormSubmission, instance.pk)]
+        return []
 
-    # Get forms index URL
-    try:
-        forms_index_url = reverse("wagtailforms:index")
-        urls.append(
-            (form_submission_model_name, "forms_index", f"{base_url}{forms_index_url}")
-        )
-    except NoReverseMatch:
-        pass
+    def get_index_context(self, base_url, model, pks):
+        return {"base_url": base_url}
 
-    # Get form pages with submissions
-    form_pages = get_form_pages_with_submissions()
+    def get_index_instances(self, model, pks, context):
+        return iter_with_frontend_urls(
+            get_form_pages_queryset(pks=pks), context["base_url"]
+        )
 
-    # Limit the number of form pages processed
-    if max_instances:
-        limited_form_pages = form_pages[:max_instances]
-    else:
-        limited_form_pages = form_pages
-
-    for page_id, page_title, page_class_name, submission_count in limited_form_pages:
-        # Create a model identifier that includes the page info
-        form_page_model_name = f"{form_submission_model_name} ({page_title})"
-
-        # Get submissions list URL
-        try:
-            list_url = reverse("wagtailforms:list_submissions", args=[page_id])
-            urls.append(
-                (form_page_model_name, "list_submissions", f"{base_url}{list_url}")
-            )
-        except NoReverseMatch:
-            pass
-
-        # Get submissions delete URL
-        try:
-            delete_url = reverse("wagtailforms:delete_submissions", args=[page_id])
-            urls.append(
-                (form_page_model_name, "delete_submissions", f"{base_url}{delete_url}")
-            )
-        except NoReverseMatch:
-            pass
-
-        # Also add the frontend form URL if available
-        try:
-            page = Page.objects.get(id=page_id)
-            frontend_url = page.url
-            if frontend_url:
-                urls.append(
-                    (
-                        form_page_model_name,
-                        "frontend_form",
-                        f"{base_url.rstrip('/')}" + frontend_url,
-                    )
-                )
-        except (Page.DoesNotExist, AttributeError, ValueError, TypeError):
-            pass
-
-    return urls
+    def get_extra_instance_urls(
+        self, base_url, model, instance, instance_name, context
+    ):
+        # Also add the frontend form URL if available, see get_instances()
+        frontend_url = getattr(instance, "frontend_url", None)
+        if not frontend_url:
+            return []
+        return [(instance_name, "frontend_form", frontend_url)]
 
 
 class UnveilFormReportIndexView(UnveilReportView):
     # Index view for the Form Report
     api_slug = "form"
-    template_name = "wagtail_unveil/unveil_url_report.html"
-    results_template_name = "wagtail_unveil/unveil_url_report_results.html"
     page_title = "Unveil Form "
     header_icon = "form"
-    paginate_by = None
-
-    def get_queryset(self):
-        all_urls = []
-        counter = 1
-        max_instances = getattr(settings, "WAGTAIL_UNVEIL_MAX_INSTANCES", 1)
-        base_url = getattr(settings, "WAGTAIL_UNVEIL_BASE_URL", "http://localhost:8000")
-        form_urls = get_forms_urls(base_url, max_instances)
-        for model_name, url_type, url in form_urls:
-            all_urls.append(UrlEntry(counter, model_name, url_type, url))
-            counter += 1
-        return all_urls
 
 
 class UnveilFormReportViewSet(UnveilReportViewSet):
@@ -1,8 +1,7 @@
 from django.apps import apps
 from django.conf import settings
-from django.urls import NoReverseMatch, reverse
 
-from wagtail_unveil.models import UrlEntry
+from wagtail_unveil.providers import UnveilProvider
 from wagtail_unveil.viewsets.base import UnveilReportView, UnveilReportViewSet
 
 
@@ -23,90 +22,35 @@ def get_generic_models():
     return models
 
 
-def get_generic_urls(base_url, max_instances):
-    # Return a list of tuples (model_name, url_type, url) for generic models
-    urls = []
-    generic_models = get_generic_models()
-    for model in generic_models:
-        model_name = f"{model._meta.app_label}.{model.__name__}"
-        # Add URL
-        try:
-            add_url = reverse(f"{model._meta.model_name}:add")
-            urls.append((model_name, "add", f"{base_url}{add_url}"))
-        except NoReverseMatch:
-            pass
-        # List URL
-        try:
-            list_url = reverse(f"{model._meta.model_name}:index")
-            urls.append((model_name, "list", f"{base_url}{list_url}"))
-        except NoReverseMatch:
-            pass
-        # Instances
-        try:
-            instances = model.objects.all()
-            if max_instances:
-                instances = instances[:max_instances]
-        except (model.DoesNotExist, AttributeError, ValueError, TypeError):
-            continue
-        for instance in instances:
-            # Edit URL
-            try:
-                edit_url = reverse(f"{model._meta.model_name}:edit", args=[instance.pk])
-                urls.append((model_name, "edit", f"{base_url}{edit_url}"))
-            except NoReverseMatch:
-                pass
-            # Delete URL
-            try:
-                delete_url = reverse(
-                    f"{model._meta.model_name}:delete", args=[instance.pk]
-                )
-                urls.append((model_name, "delete", f"{base_url}{delete_url}"))
-            except NoReverseMatch:
-                pass
-            # Copy URL
-            try:
-                copy_url = reverse(f"{model._meta.model_name}:copy", args=[instance.pk])
-                urls.append((model_name, "copy", f"{base_url}{copy_url}"))
-            except NoReverseMatch:
-                pass
-            # History URL
-            try:
-                history_url = reverse(
-                    f"{model._meta.model_name}:history", args=[instance.pk]
-                )
-                urls.append((model_name, "history", f"{base_url}{history_url}"))
-            except NoReverseMatch:
-                pass
-            # Usage URL
-            try:
-                usage_url = reverse(
-                    f"{model._meta.model_name}:usage", args=[instance.pk]
-                )
-                urls.append((model_name, "usage", f"{base_url}{usage_url}"))
-            except NoReverseMatch:
-                pass
-    return urls
+class UnveilGenericProvider(UnveilProvider):
+    # URLs for models managed by a ModelViewSet
+    slug = "generic"
+    label = "Generic Model"
+    icon = "table"
+    list_actions = [
+        ("add", "{model_name}:add"),
+        ("list", "{model_name}:index"),
+    ]
+    instance_actions = [
+        ("edit", "{model_name}:edit"),
+        ("delete", "{model_name}:delete"),
+        ("copy", "{model_name}:copy"),
+        ("history", "{model_name}:history"),
+        ("usage", "{model_name}:usage"),
+    ]
+
+    def get_models(self):
+        return get_generic_models()
+
+    def get_instance_name(self, model, instance):
+        return self.get_model_name(model)
 
 
 class UnveilGenericReportIndexView(UnveilReportView):
     # Index view for the Generic Model Report
     api_slug = "generic"
-    template_name = "wagtail_unveil/unveil_url_report.html"
-    results_template_name = "wagtail_unveil/unveil_url_report_results.html"
     page_title = "Unveil Generic Model "
     header_icon = "table"
-    paginate_by = None
-
-    def get_queryset(self):
-        all_urls = []
-        counter = 1
-        max_instances = getattr(settings, "WAGTAIL_UNVEIL_MAX_INSTANCES", 1)
-        base_url = getattr(settings, "WAGTAIL_UNVEIL_BASE_URL", "http://localhost:8000")
-        generic_urls = get_generic_urls(base_url, max_instances)
-        for model_name, url_type, url in generic_urls:
-            all_urls.append(UrlEntry(counter, model_name, url_type, url))
-            counter += 1
-        return all_urls
 
 
 class UnveilGenericReportViewSet(UnveilReportViewSet):
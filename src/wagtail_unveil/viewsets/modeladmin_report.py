@@ -1,8 +1,8 @@
 from django.apps import apps
 from django.conf import settings
-from django.urls import NoReverseMatch, reverse
 
-from wagtail_unveil.models import UrlEntry
+from wagtail_unveil.providers import UnveilProvider
+from wagtail_unveil.routes import get_route_index, route_exists
 from wagtail_unveil.viewsets.base import UnveilReportView, UnveilReportViewSet
 
 
@@ -33,135 +33,61 @@ def get_modeladmin_url_patterns(model):
     1. Default pattern: {app_label}_{model_name}_modeladmin_{action}
     2. Custom pattern: {base_url_path}_modeladmin_{action} (when base_url_path is set)
 
-    Since we can't easily access the ModelAdmin registry, we'll try to detect
-    which pattern is used by attempting to reverse a known URL.
+    Since we can't easily access the ModelAdmin registry, we detect which
+    pattern is used by looking the index URL names up in the route index.
     """
     app_label = model._meta.app_label
     model_name_lower = model._meta.model_name
 
     # Try the default pattern first
-    default_pattern = f"{app_label}_{model_name_lower}_modeladmin_index"
-    try:
-        reverse(default_pattern)
-        return f"{app_label}_{model_name_lower}_modeladmin"
-    except NoReverseMatch:
-        pass
-
-    # If default pattern fails, try to find a custom base_url_path pattern
-    # We'll look for any pattern that ends with "_modeladmin_index" for this model
-    from django.urls import get_resolver
-
-    resolver = get_resolver()
-
-    def find_modeladmin_patterns(patterns, namespace=""):
-        found_patterns = []
-        for pattern in patterns:
-            if hasattr(pattern, "url_patterns"):
-                found_patterns.extend(
-                    find_modeladmin_patterns(pattern.url_patterns, namespace)
-                )
-            else:
-                if hasattr(pattern, "name") and pattern.name:
-                    if pattern.name.endswith("_modeladmin_index"):
-                        # Check if this pattern works by trying to reverse it
-                        try:
-                            reverse(pattern.name)
-                            # Extract the base pattern (remove _index)
-                            base_pattern = pattern.name.replace("_index", "")
-                            found_patterns.append(base_pattern)
-                        except NoReverseMatch:
-                            pass
-        return found_patterns
-
-    modeladmin_patterns = find_modeladmin_patterns(resolver.url_patterns)
-
-    # Return the first pattern that works, or None if none found
-    if modeladmin_patterns:
-        return modeladmin_patterns[0]
+    default_prefix = f"{app_label}_{model_name_lower}_modeladmin"
+    if route_exists(f"{default_prefix}_index", 0):
+        return default_prefix
 
-    return None
+    # If default pattern fails, use the first custom base_url_path pattern
+    for url_name in get_route_index():
+        if url_name.endswith("_modeladmin_index") and route_exists(url_name, 0):
+            return url_name[: -len("_index")]
 
+    return None
 
-def get_modeladmin_urls(base_url, max_instances):
-    # Return a list of tuples (model_name, url_type, url) for modeladmin models
-    urls = []
-    modeladmin_models = get_modeladmin_models()
-    for model in modeladmin_models:
-        model_name = f"{model._meta.app_label}.{model.__name__}"
 
-        # Get the URL pattern prefix for this model
+class UnveilModelAdminProvider(UnveilProvider):
+    # URLs for Wagtail ModelAdmin models
+    slug = "modeladmin"
+    label = "Wagtail ModelAdmin"
+    icon = "code"
+    list_actions = [
+        ("add", "{prefix}_create"),
+        ("list", "{prefix}_index"),
+    ]
+    instance_actions = [
+        ("edit", "{prefix}_edit"),
+        ("delete", "{prefix}_delete"),
+        ("history", "{prefix}_history"),
+    ]
+
+    def get_models(self):
+        return get_modeladmin_models()
+
+    def get_url_context(self, model, context):
+        # Skip the model if we can't find the URL pattern
         url_pattern_prefix = get_modeladmin_url_patterns(model)
         if not url_pattern_prefix:
-            continue  # Skip if we can't find the URL pattern
-
-        # Add URL
-        try:
-            add_url = reverse(f"{url_pattern_prefix}_create")
-            urls.append((model_name, "add", f"{base_url}{add_url}"))
-        except NoReverseMatch:
-            pass
-
-        # List URL
-        try:
-            list_url = reverse(f"{url_pattern_prefix}_index")
-            urls.append((model_name, "list", f"{base_url}{list_url}"))
-        except NoReverseMatch:
-            pass
-
-        # Instances
-        try:
-            instances = model.objects.all()
-            if max_instances:
-                instances = instances[:max_instances]
-        except (model.DoesNotExist, AttributeError, ValueError, TypeError):
-            continue
+            return None
+        context = super().get_url_context(model, context)
+        context["prefix"] = url_pattern_prefix
+        return context
 
-        for instance in instances:
-            # Edit URL
-            try:
-                edit_url = reverse(f"{url_pattern_prefix}_edit", args=[instance.pk])
-                urls.append((model_name, "edit", f"{base_url}{edit_url}"))
-            except NoReverseMatch:
-                pass
-
-            # Delete URL
-            try:
-                delete_url = reverse(f"{url_pattern_prefix}_delete", args=[instance.pk])
-                urls.append((model_name, "delete", f"{base_url}{delete_url}"))
-            except NoReverseMatch:
-                pass
-
-            # History URL
-            try:
-                history_url = reverse(
-                    f"{url_pattern_prefix}_history", args=[instance.pk]
-                )
-                urls.append((model_name, "history", f"{base_url}{history_url}"))
-            except NoReverseMatch:
-                pass
-
-    return urls
+    def get_instance_name(self, model, instance):
+        return self.get_model_name(model)
 
 
 class UnveilModelAdminReportIndexView(UnveilReportView):
     # Index view for the ModelAdmin Report
     api_slug = "modeladmin"
-    template_name = "wagtail_unveil/unveil_url_report.html"
-    results_template_name = "wagtail_unveil/unveil_url_report_results.html"
     page_title = "Unveil Wagtail ModelAdmin "
     header_icon = "code"
-    paginate_by = None
-
-    def get_queryset(self):
-        all_urls = []
-        counter = 1
-        max_instances = getattr(settings, "WAGTAIL_UNVEIL_MAX_INSTANCES", 1)
-        base_url = getattr(settings, "WAGTAIL_UNVEIL_BASE_URL", "http://localhost:8000")
-        modeladmin_urls = get_modeladmin_urls(base_url, max_instances)
-        for model_name, url_type, url in modeladmin_urls:
-            all_urls.append(UrlEntry(counter, model_name, url_type, url))
-            counter += 1
-        return all_urls
 
 
 class UnveilModelAdminReportViewSet(UnveilReportViewSet):
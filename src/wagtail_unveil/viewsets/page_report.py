@@ -1,110 +1,326 @@
+from itertools import islice
+from urllib.parse import quote
+
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections
+from django.db.models import Case, F, IntegerField, OuterRef, Value, When, Window
+from django.db.models.functions import RowNumber
 from django.urls import NoReverseMatch, reverse
-from wagtail.models import Page, get_page_models
+from django.utils import translation
+from wagtail.coreutils import get_supported_content_language_variant
+from wagtail.models import Page, Site, get_page_models
 
-from wagtail_unveil.models import UrlEntry
+from wagtail_unveil.providers import INSTANCE_CHUNK_SIZE, UnveilProvider
+from wagtail_unveil.routes import SAFE_CHARACTERS, route_exists
 from wagtail_unveil.viewsets.base import UnveilReportView, UnveilReportViewSet
 
+# The only page columns the report needs
+PAGE_SAMPLE_FIELDS = ["id", "title", "content_type_id", "path", "url_path"]
 
-def get_page_urls(base_url, max_instances):
-    """Return a list of tuples (model_name, url_type, full_url) for pages."""
-    urls = []
-    page_models = get_page_models()
-    try:
-        root_page = Page.objects.filter(depth=1).first()
-    except Page.DoesNotExist:
-        root_page = None
-    for model in page_models:
-        if model._meta.label_lower == "wagtailcore.page":
-            continue
-        model_name = f"{model._meta.app_label}.{model.__name__}"
-        # Add URL (if we have a root page)
-        if root_page:
-            try:
-                add_url = reverse(
-                    "wagtailadmin_pages:add",
-                    args=[model._meta.app_label, model._meta.model_name, root_page.pk],
+# Number of pages whose frontend URLs are resolved at a time
+FRONTEND_URL_CHUNK_SIZE = 100
+
+
+def get_page_sample_queryset(models, max_instances, url_filter=None, after=None):
+    """
+    Return a queryset of up to max_instances live pages of each of the page
+    models, in a single query rather than one query per page type.
+
+    The pages are plain ``Page`` instances with only the fields the report
+    needs, ordered by page type in the order of models and then by path, and
+    annotated with the index of their type in models as ``model_index``. Pass
+    url_filter to only sample pages in its primary key range, and after to
+    only sample the pages whose path comes after it.
+    """
+    content_types = ContentType.objects.get_for_models(
+        *models, for_concrete_models=False
+    )
+    pages = (
+        Page.objects.live()
+        .filter(content_type__in=content_types.values())
+        .only(*PAGE_SAMPLE_FIELDS)
+        .annotate(
+            model_index=Case(
+                *[
+                    When(content_type_id=content_types[model].pk, then=Value(index))
+                    for index, model in enumerate(models)
+                ],
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("model_index", "path")
+    )
+    if url_filter:
+        pages = url_filter.filter_queryset(pages)
+    if after is not None:
+        pages = pages.filter(path__gt=after)
+    if max_instances:
+        if connections[pages.db].features.supports_over_clause:
+            # Number the pages of each type and keep the first max_instances
+            pages = pages.annotate(
+                row_number=Window(
+                    RowNumber(),
+                    partition_by=F("content_type_id"),
+                    order_by=F("path").asc(),
                 )
-                urls.append((model_name, "add", f"{base_url}{add_url}"))
-            except NoReverseMatch:
-                pass
+            ).filter(row_number__lte=max_instances)
+        else:
+            # Databases without window functions use a correlated subquery
+            type_pages = Page.objects.live().filter(
+                content_type_id=OuterRef("content_type_id")
+            )
+            if url_filter:
+                type_pages = url_filter.filter_queryset(type_pages)
+            if after is not None:
+                type_pages = type_pages.filter(path__gt=after)
+            pages = pages.filter(
+                pk__in=type_pages.order_by("path").values("pk")[:max_instances]
+            )
+    return pages
+
+
+class PageSampleStream:
+    """
+    The live pages of several page types, handed out one page type at a time
+    in the order of models.
+
+    The pages are fetched by a single query as they're needed, from the first
+    page type they're requested for.
+    """
+
+    def __init__(self, models, max_instances, url_filter=None):
+        self.models = models
+        self.max_instances = max_instances
+        self.url_filter = url_filter
+        self.pages = None
+        self.next_page = None
+        # The index of the first page type requested
+        self.start = 0
+
+    def iter_pages(self, model):
+        """Yield the pages of model, skipping the pages of the types before it."""
+        model_index = self.models.index(model)
+        if self.pages is None:
+            self.start = model_index
+            self.pages = get_page_sample_queryset(
+                self.models[model_index:], self.max_instances, self.url_filter
+            ).iterator(chunk_size=INSTANCE_CHUNK_SIZE)
+        # The query numbers the page types from the first one requested
+        model_index -= self.start
+        while True:
+            if self.next_page is None:
+                self.next_page = next(self.pages, None)
+                if self.next_page is None:
+                    return
+            if self.next_page.model_index > model_index:
+                # Keep the page for its own type
+                return
+            page, self.next_page = self.next_page, None
+            if page.model_index == model_index:
+                yield page
+
+
+def iter_with_frontend_urls(pages, base_url):
+    """
+    Yield pages with their absolute frontend URL, or None if they aren't
+    routable, set as ``frontend_url``.
+
+    The URLs are resolved FRONTEND_URL_CHUNK_SIZE pages at a time, so only the
+    pages that are reported are resolved.
+    """
+    pages = iter(pages)
+    while True:
+        chunk = list(islice(pages, FRONTEND_URL_CHUNK_SIZE))
+        if not chunk:
+            return
+        frontend_urls = get_frontend_urls(chunk, base_url)
+        for page in chunk:
+            page.frontend_url = frontend_urls.get(page.pk)
+            yield page
+
+
+def get_serve_path(language_code=None):
+    """Return the path pages are served from, or None if they aren't routable."""
+    if not route_exists("wagtail_serve"):
+        return None
+    try:
+        if language_code:
+            with translation.override(language_code):
+                return reverse("wagtail_serve", args=("",))
+        return reverse("wagtail_serve", args=("",))
+    except NoReverseMatch:
+        return None
+
+
+def get_frontend_urls(pages, base_url):
+    """
+    Return a dict of page id to the absolute frontend URL of each page.
+
+    This follows ``Page.url``, but the site root paths are loaded once and
+    matched against each page's ``url_path`` in memory instead of resolving
+    the sites and reversing the serve view for every page. Pages that belong
+    to the only site get base_url as their host, pages of a multi-site install
+    use the root URL of their site. Pages that aren't routable are left out.
+
+    Custom ``get_url_parts()`` overrides on specific page models aren't used.
+    """
+    site_root_paths = Site.get_site_root_paths()
+    single_site = len({site_root.site_id for site_root in site_root_paths}) == 1
+    use_wagtail_i18n = getattr(settings, "WAGTAIL_I18N_ENABLED", False)
+    append_slash = getattr(settings, "WAGTAIL_APPEND_SLASH", True)
+    active_language_code = None
+    if use_wagtail_i18n:
         try:
-            if hasattr(model.objects, "live"):
-                instances = (
-                    model.objects.live()[:max_instances]
-                    if max_instances
-                    else model.objects.live()
-                )
-            else:
-                instances = (
-                    model.objects.all()[:max_instances]
-                    if max_instances
-                    else model.objects.all()
-                )
-            for instance in instances:
-                page_model_name = (
-                    f"{model._meta.app_label}.{model.__name__} ({instance.title})"
-                )
-                # Admin URLs
-                for url_type, url_name in [
-                    ("edit", "wagtailadmin_pages:edit"),
-                    ("delete", "wagtailadmin_pages:delete"),
-                    ("copy", "wagtailadmin_pages:copy"),
-                    ("move", "wagtailadmin_pages:move"),
-                    ("history", "wagtailadmin_pages:history"),
-                    ("workflow_history", "wagtailadmin_pages:workflow_history"),
-                ]:
-                    try:
-                        admin_url = reverse(url_name, args=[instance.id])
-                        urls.append(
-                            (page_model_name, url_type, f"{base_url}{admin_url}")
-                        )
-                    except NoReverseMatch:
-                        pass
-                # Index URL
-                try:
-                    index_url = reverse("wagtailadmin_explore", args=[instance.id])
-                    urls.append((page_model_name, "index", f"{base_url}{index_url}"))
-                except NoReverseMatch:
-                    pass
-                # Frontend view URL
-                if hasattr(instance, "url") and instance.url:
-                    view_url = instance.url
-                    if not view_url.startswith("http"):
-                        if view_url.startswith("/"):
-                            view_url = f"{base_url}{view_url}"
-                        else:
-                            view_url = f"{base_url}/{view_url}"
-                    urls.append((page_model_name, "view", view_url))
-        except (model.DoesNotExist, AttributeError, ValueError, TypeError):
+            active_language_code = get_supported_content_language_variant(
+                translation.get_language()
+            )
+        except LookupError:
             pass
+
+    serve_paths = {}
+    urls = {}
+    for page in pages:
+        site_root = next(
+            (
+                site_root
+                for site_root in site_root_paths
+                if page.url_path.startswith(site_root.root_path)
+            ),
+            None,
+        )
+        if site_root is None:
+            continue
+        language_code = None
+        if use_wagtail_i18n:
+            language_code = site_root.language_code
+            if active_language_code == language_code:
+                language_code = translation.get_language()
+        if language_code not in serve_paths:
+            serve_paths[language_code] = get_serve_path(language_code)
+        serve_path = serve_paths[language_code]
+        if serve_path is None:
+            continue
+        # Quoted like reverse() quotes Page.url, slugs can be Unicode
+        page_path = serve_path + quote(
+            page.url_path[len(site_root.root_path) :], safe=SAFE_CHARACTERS
+        )
+        if not append_slash and page_path != "/":
+            page_path = page_path.rstrip("/")
+        if single_site:
+            urls[page.pk] = f"{base_url.rstrip('/')}{page_path}"
+        else:
+            urls[page.pk] = f"{site_root.root_url}{page_path}"
     return urls
 
 
+class UnveilPageProvider(UnveilProvider):
+    """URLs for every page type and a sample of live pages of each type."""
+
+    slug = "page"
+    label = "Page"
+    icon = "pilcrow"
+    list_actions = [
+        ("add", "wagtailadmin_pages:add", ("app_label", "model_name", "root_page_id")),
+    ]
+    instance_actions = [
+        ("edit", "wagtailadmin_pages:edit"),
+        ("delete", "wagtailadmin_pages:delete"),
+        ("copy", "wagtailadmin_pages:copy"),
+        ("move", "wagtailadmin_pages:move"),
+        ("history", "wagtailadmin_pages:history"),
+        ("workflow_history", "wagtailadmin_pages:workflow_history"),
+        ("index", "wagtailadmin_explore"),
+    ]
+
+    def get_models(self):
+        return [
+            model
+            for model in get_page_models()
+            if model._meta.label_lower != "wagtailcore.page"
+        ]
+
+    def get_url_types(self):
+        return [*super().get_url_types(), "view"]
+
+    def get_dependencies(self):
+        # Frontend URLs also depend on the sites' root pages and hostnames
+        return [Page, Site]
+
+    def get_last_modified_fields(self, model):
+        if issubclass(model, Page):
+            return ["last_published_at", "latest_revision_created_at"]
+        return super().get_last_modified_fields(model)
+
+    def get_context(self, base_url, max_instances):
+        # The add URL is only included if we have a root page
+        root_page = Page.objects.filter(depth=1).first()
+        return {
+            "root_page_id": root_page.pk if root_page else None,
+            "base_url": base_url,
+            "pages": PageSampleStream(
+                self.get_filtered_models(), max_instances, self.url_filter
+            ),
+        }
+
+    def get_instance_cursor(self, instance):
+        # Pages are reported in path order
+        return instance.path
+
+    def get_instances(self, model, max_instances, context, after=None, offset=0):
+        if after is not None:
+            # Resume this page type after the last page reported, the types
+            # after it are then fetched together
+            if max_instances and offset >= max_instances:
+                return []
+            pages = get_page_sample_queryset(
+                [model],
+                max_instances and max_instances - offset,
+                self.url_filter,
+                after,
+            ).iterator(chunk_size=INSTANCE_CHUNK_SIZE)
+        else:
+            pages = context["pages"].iter_pages(model)
+        # Frontend URLs are only resolved if they're included
+        if self.url_filter is None or self.url_filter.matches_url_type("view"):
+            pages = iter_with_frontend_urls(pages, context["base_url"])
+        return pages
+
+    def get_indexed_objects(self, instance):
+        # Pages are often saved as plain Page instances
+        if isinstance(instance, Page) and instance.specific_class in self.get_models():
+            return [(instance.specific_class, instance.pk)]
+        return []
+
+    def get_index_context(self, base_url, model, pks):
+        root_page = Page.objects.filter(depth=1).first()
+        return {
+            "root_page_id": root_page.pk if root_page else None,
+            "base_url": base_url,
+        }
+
+    def get_index_instances(self, model, pks, context):
+        pages = Page.objects.live().filter(pk__in=pks).only(*PAGE_SAMPLE_FIELDS)
+        return iter_with_frontend_urls(pages, context["base_url"])
+
+    def get_extra_instance_urls(
+        self, base_url, model, instance, instance_name, context
+    ):
+        # Frontend view URL, see get_instances()
+        view_url = getattr(instance, "frontend_url", None)
+        if not view_url:
+            return []
+        return [(instance_name, "view", view_url)]
+
+
 class UnveilPageReportIndexView(UnveilReportView):
     """
     Custom index view for the Page Report ViewSet.
     """
 
     api_slug = "page"
-    template_name = "wagtail_unveil/unveil_url_report.html"
-    results_template_name = "wagtail_unveil/unveil_url_report_results.html"
     page_title = "Unveil Page"
     header_icon = "pilcrow"
-    paginate_by = None
-
-    def get_queryset(self):
-        """Generate the queryset for page URLs."""
-        all_urls = []
-        counter = 1
-        max_instances = getattr(settings, "WAGTAIL_UNVEIL_MAX_INSTANCES", 1)
-        base_url = getattr(settings, "WAGTAIL_UNVEIL_BASE_URL", "http://localhost:8000")
-        page_urls = get_page_urls(base_url, max_instances)
-        for model_name, url_type, url in page_urls:
-            all_urls.append(UrlEntry(counter, model_name, url_type, url))
-            counter += 1
-
-        return all_urls
 
 
 class UnveilPageReportViewSet(UnveilReportViewSet):
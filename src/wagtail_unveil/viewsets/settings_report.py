@@ -1,85 +1,51 @@
 from django.apps import apps
-from django.conf import settings
-from django.urls import NoReverseMatch, reverse
 from wagtail.contrib.settings.models import BaseGenericSetting, BaseSiteSetting
 
-from wagtail_unveil.models import UrlEntry
+from wagtail_unveil.providers import UnveilProvider
 from wagtail_unveil.viewsets.base import UnveilReportView, UnveilReportViewSet
 
 
-def get_settings_edit_url(app_label, model_name, site_pk=None):
-    """Get the edit URL for a specific settings model."""
-    try:
-        args = [app_label, model_name]
-        if site_pk:
-            args.append(site_pk)
-        return reverse("wagtailsettings:edit", args=args)
-    except NoReverseMatch:
-        return None
-
-
-def get_settings_urls(base_url, max_instances):
-    """Return a list of tuples (model_name, url_type, full_url) for settings."""
-    urls = []
-
-    try:
-        # Get all settings models
-        settings_models = []
-        for model in apps.get_models():
-            if issubclass(model, (BaseGenericSetting, BaseSiteSetting)):
-                settings_models.append(model)
-
-        # Process each settings model
-        for model_class in settings_models:
-            app_label = model_class._meta.app_label
-            model_name = model_class._meta.model_name
-
-            # Check if this is a multi-site settings model
-            is_multisite = hasattr(model_class, "site")
-
-            if is_multisite:
-                # Get instances for each site
-                try:
-                    instances = model_class.objects.select_related("site").all()
-                    if max_instances is not None:
-                        instances = instances[:max_instances]
-
-                    for instance in instances:
-                        settings_model_name = (
-                            f"{app_label}.{model_class.__name__} (Site Instance)"
-                        )
-                        edit_url = get_settings_edit_url(
-                            app_label, model_name, instance.site.id
-                        )
-                        if edit_url:
-                            urls.append(
-                                (settings_model_name, "edit", f"{base_url}{edit_url}")
-                            )
-                except model_class.DoesNotExist:
-                    pass
-            else:
-                # Single-site settings
-                try:
-                    instances = model_class.objects.all()
-                    if max_instances is not None:
-                        instances = instances[:max_instances]
-
-                    for instance in instances:
-                        settings_model_name = (
-                            f"{app_label}.{model_class.__name__} (Generic Instance)"
-                        )
-                        edit_url = get_settings_edit_url(app_label, model_name)
-                        if edit_url:
-                            urls.append(
-                                (settings_model_name, "edit", f"{base_url}{edit_url}")
-                            )
-                except model_class.DoesNotExist:
-                    pass
-
-    except (AttributeError, ValueError, TypeError):
-        pass
-
-    return urls
+class UnveilSettingsProvider(UnveilProvider):
+    """
+    URLs for generic and site-specific settings models.
+
+    Settings aren't limited by WAGTAIL_UNVEIL_MAX_INSTANCES since there are
+    typically very few of them and we want to include all of them.
+    """
+
+    slug = "settings"
+    label = "Settings"
+    icon = "cogs"
+    limit_instances = False
+
+    def get_models(self):
+        return [
+            model
+            for model in apps.get_models()
+            if issubclass(model, (BaseGenericSetting, BaseSiteSetting))
+        ]
+
+    def is_multisite(self, model):
+        return hasattr(model, "site")
+
+    def get_instance_actions(self, model):
+        if self.is_multisite(model):
+            return [
+                ("edit", "wagtailsettings:edit", ("app_label", "model_name", "site_id"))
+            ]
+        return [("edit", "wagtailsettings:edit", ("app_label", "model_name"))]
+
+    def get_instance_url_context(self, model, instance, context):
+        context = super().get_instance_url_context(model, instance, context)
+        if self.is_multisite(model):
+            # Site settings are edited per site rather than per instance
+            context["site_id"] = instance.site_id
+        return context
+
+    def get_instance_name(self, model, instance):
+        if self.is_multisite(model):
+            return f"{self.get_model_name(model)} (Site Instance)"
+        return f"{self.get_model_name(model)} (Generic Instance)"
 
 
 class UnveilSettingsReportIndexView(UnveilReportView):
@@ -88,27 +54,8 @@ class UnveilSettingsReportIndexView(UnveilReportView):
     """
 
     api_slug = "settings"
-    template_name = "wagtail_unveil/unveil_url_report.html"
-    results_template_name = "wagtail_unveil/unveil_url_report_results.html"
     page_title = "Unveil Settings"
     header_icon = "cog"
-    paginate_by = None
-
-    def get_queryset(self):
-        """Generate the queryset for settings URLs."""
-        all_urls = []
-        counter = 1
-
-        # For settings, we don't limit max_instances since there are typically very few
-        # settings models and we want to include all of them (both generic and site-specific)
-        max_instances = None  # No limit for settings
-        base_url = getattr(settings, "WAGTAIL_UNVEIL_BASE_URL", "http://localhost:8000")
-        settings_urls = get_settings_urls(base_url, max_instances)
-        for model_name, url_type, url in settings_urls:
-            all_urls.append(UrlEntry(counter, model_name, url_type, url))
-            counter += 1
-
-        return all_urls
 
 
 class UnveilSettingsReportViewSet(UnveilReportViewSet):
@@ -1,79 +1,32 @@
-from django.conf import settings
-from django.urls import NoReverseMatch, reverse
 from wagtail.models import Task
 
-from wagtail_unveil.models import UrlEntry
+from wagtail_unveil.providers import UnveilProvider
 from wagtail_unveil.viewsets.base import UnveilReportView, UnveilReportViewSet
 
 
-def get_workflow_task_urls(base_url, max_instances):
-    # Return a list of tuples (model_name, url_type, full_url) for workflow tasks
-    urls = []
-
-    # Add index and add URLs for tasks
-    try:
-        index_url = reverse("wagtailadmin_workflows:task_index")
-        urls.append(("wagtail.Task", "index", f"{base_url}{index_url}"))
-    except NoReverseMatch:
-        pass
-    try:
-        add_url = reverse("wagtailadmin_workflows:select_task_type")
-        urls.append(("wagtail.Task", "add", f"{base_url}{add_url}"))
-    except NoReverseMatch:
-        pass
-
-    try:
-        tasks = (
-            Task.objects.all()[:max_instances] if max_instances else Task.objects.all()
-        )
-        for task in tasks:
-            task_model_name = f"wagtail.Task ({task.name})"
-            # Admin URLs
-            try:
-                edit_url = reverse("wagtailadmin_workflows:edit_task", args=[task.id])
-                urls.append((task_model_name, "edit", f"{base_url}{edit_url}"))
-            except NoReverseMatch:
-                pass
-            try:
-                delete_url = reverse(
-                    "wagtailadmin_workflows:delete_task", args=[task.id]
-                )
-                urls.append((task_model_name, "delete", f"{base_url}{delete_url}"))
-            except NoReverseMatch:
-                pass
-            try:
-                usage_url = reverse("wagtailadmin_workflows:task_usage", args=[task.id])
-                urls.append((task_model_name, "usage", f"{base_url}{usage_url}"))
-            except NoReverseMatch:
-                pass
-    except Task.DoesNotExist:
-        pass
-    except (AttributeError, ValueError, TypeError):
-        pass
-    return urls
+class UnveilWorkflowTaskProvider(UnveilProvider):
+    # URLs for workflow tasks
+    slug = "workflow-task"
+    label = "Workflow Task"
+    icon = "thumbtack"
+    model = Task
+    model_label = "wagtail.Task"
+    list_actions = [
+        ("index", "wagtailadmin_workflows:task_index"),
+        ("add", "wagtailadmin_workflows:select_task_type"),
+    ]
+    instance_actions = [
+        ("edit", "wagtailadmin_workflows:edit_task"),
+        ("delete", "wagtailadmin_workflows:delete_task"),
+        ("usage", "wagtailadmin_workflows:task_usage"),
+    ]
 
 
 class UnveilWorkflowTaskReportIndexView(UnveilReportView):
     # Index view for the Workflow Task Report
     api_slug = "workflow-task"
-    template_name = "wagtail_unveil/unveil_url_report.html"
-    results_template_name = "wagtail_unveil/unveil_url_report_results.html"
     page_title = "Unveil Workflow Task"
     header_icon = "thumbtack"
-    paginate_by = None
-
-    def get_queryset(self):
-        # Get the queryset for workflow task URLs
-        all_urls = []
-        counter = 1
-        max_instances = getattr(settings, "WAGTAIL_UNVEIL_MAX_INSTANCES", 1)
-        base_url = getattr(settings, "WAGTAIL_UNVEIL_BASE_URL", "http://localhost:8000")
-        task_urls = get_workflow_task_urls(base_url, max_instances)
-        for model_name, url_type, url in task_urls:
-            all_urls.append(UrlEntry(counter, model_name, url_type, url))
-            counter += 1
-
-        return all_urls
 
 
 class UnveilWorkflowTaskReportViewSet(UnveilReportViewSet):
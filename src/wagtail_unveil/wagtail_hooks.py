@@ -2,23 +2,37 @@ from django.conf import settings
 from wagtail import hooks
 from wagtail.admin.viewsets.base import ViewSetGroup
 
-from .viewsets.admin_report import unveil_admin_viewset
-from .viewsets.collection_report import unveil_collection_viewset
-from .viewsets.document_report import unveil_document_viewset
-from .viewsets.form_report import unveil_form_viewset
-from .viewsets.generic_report import unveil_generic_viewset
-from .viewsets.image_report import unveil_image_viewset
-from .viewsets.locale_report import unveil_locale_viewset
-from .viewsets.modeladmin_report import unveil_modeladmin_viewset
-from .viewsets.page_report import unveil_page_viewset
-from .viewsets.redirect_report import unveil_redirect_viewset
-from .viewsets.search_promotion_report import unveil_search_promotion_viewset
-from .viewsets.settings_report import unveil_settings_viewset
-from .viewsets.site_report import unveil_site_viewset
-from .viewsets.snippet_report import unveil_snippet_viewset
-from .viewsets.user_report import unveil_user_viewset
-from .viewsets.workflow_report import unveil_workflow_viewset
-from .viewsets.workflow_task_report import unveil_workflow_task_viewset
+from .providers import get_providers
+from .viewsets.admin_report import UnveilAdminProvider, unveil_admin_viewset
+from .viewsets.base import UnveilReportViewSet
+from .viewsets.collection_report import (
+    UnveilCollectionProvider,
+    unveil_collection_viewset,
+)
+from .viewsets.document_report import UnveilDocumentProvider, unveil_document_viewset
+from .viewsets.form_report import UnveilFormProvider, unveil_form_viewset
+from .viewsets.generic_report import UnveilGenericProvider, unveil_generic_viewset
+from .viewsets.image_report import UnveilImageProvider, unveil_image_viewset
+from .viewsets.locale_report import UnveilLocaleProvider, unveil_locale_viewset
+from .viewsets.modeladmin_report import (
+    UnveilModelAdminProvider,
+    unveil_modeladmin_viewset,
+)
+from .viewsets.page_report import UnveilPageProvider, unveil_page_viewset
+from .viewsets.redirect_report import UnveilRedirectProvider, unveil_redirect_viewset
+from .viewsets.search_promotion_report import (
+    UnveilSearchPromotionProvider,
+    unveil_search_promotion_viewset,
+)
+from .viewsets.settings_report import UnveilSettingsProvider, unveil_settings_viewset
+from .viewsets.site_report import UnveilSiteProvider, unveil_site_viewset
+from .viewsets.snippet_report import UnveilSnippetProvider, unveil_snippet_viewset
+from .viewsets.user_report import UnveilUserProvider, unveil_user_viewset
+from .viewsets.workflow_report import UnveilWorkflowProvider, unveil_workflow_viewset
+from .viewsets.workflow_task_report import (
+    UnveilWorkflowTaskProvider,
+    unveil_workflow_task_viewset,
+)
 
 
 class UnveilReportsViewSetGroup(ViewSetGroup):
@@ -52,6 +66,16 @@ class UnveilReportsViewSetGroup(ViewSetGroup):
         unveil_workflow_task_viewset,
     )
 
+    def __init__(self):
+        super().__init__()
+        # Add a report for each provider registered by another app
+        report_slugs = {
+            viewset.index_view_class.api_slug for viewset in self.registerables
+        }
+        for slug, provider in get_providers().items():
+            if slug not in report_slugs:
+                self.registerables.append(UnveilReportViewSet.for_provider(provider))
+
 
 # ViewSet Group for Unveil Reports
 @hooks.register("register_admin_viewset")
@@ -61,3 +85,29 @@ def register_unveil_reports_viewset_group():
     This creates a grouped menu structure for all Unveil reports.
     """
     return UnveilReportsViewSetGroup()
+
+
+@hooks.register("register_unveil_provider")
+def register_unveil_providers():
+    """
+    Register the URL providers that drive the built-in Unveil reports.
+    """
+    return [
+        UnveilCollectionProvider,
+        UnveilDocumentProvider,
+        UnveilFormProvider,
+        UnveilGenericProvider,
+        UnveilImageProvider,
+        UnveilLocaleProvider,
+        UnveilModelAdminProvider,
+        UnveilPageProvider,
+        UnveilRedirectProvider,
+        UnveilSearchPromotionProvider,
+        UnveilSettingsProvider,
+        UnveilSiteProvider,
+        UnveilSnippetProvider,
+        UnveilUserProvider,
+        UnveilAdminProvider,
+        UnveilWorkflowProvider,
+        UnveilWorkflowTaskProvider,
+    ]